@@ -1,175 +1,214 @@
 # pages/page1.py (Home - menangani long & wide)
 import streamlit as st
-import pandas as pd
-import os
+
+from utils.datasets import matrix, memory_report, needs_build, prepare, schema, source_path, view_year, years
+from utils.export import export_panel
+from utils.grid import data_grid
+from utils import fragments, uploads
+from utils.ingest import TAHUN_DEFAULT, SchemaError, file_hash
+from utils.raster import bar_image, low_bandwidth_toggle
 
 st.set_page_config(page_title="Ulfa App - Home", page_icon="📊", layout="wide")
+fragments.start_run()
 
 # Sidebar sederhana
 with st.sidebar:
     st.title("Menu")
-    st.write("📊 Visualisasi Data Kekerasan Terhadap Perempuan Tahun 2024")
+    st.write("📊 Visualisasi Data Kekerasan Terhadap Perempuan")
     st.write("📰 Berita")
     st.write("⚠️ Tentang Kekerasan Seksual")
     st.markdown("---")
     st.write("Made by Ulfa 🎓")
 
-# Header
-st.title("⚠️ Kekerasan terhadap Perempuan — Tahun 2024")
-st.write("Halaman ini menampilkan ringkasan data untuk **tahun 2024** berdasarkan file CSV yang kamu upload/simpan.")
-st.markdown("---")
+# ---------- upload data ----------
+# parsing file upload berjalan di thread pool proses (utils/uploads.py); file
+# yang sama (hash sama) hanya di-parse sekali walau di-upload banyak orang.
+# session_state hanya menyimpan hash file milik sesi ini.
+with st.sidebar.expander("📤 Upload data sendiri"):
+    berkas = st.file_uploader(
+        f"CSV / Excel (maks. {uploads.MAX_UPLOAD_MB} MB)", type=["csv", "xlsx", "xls"], key="berkas"
+    )
+    if berkas is None:
+        st.session_state.pop("upload_digest", None)
+        st.session_state.pop("upload_file_id", None)
+    elif st.session_state.get("upload_file_id") != berkas.file_id:
+        try:
+            job = uploads.submit(berkas.name, berkas.getvalue())
+        except uploads.UploadTooLarge as e:
+            st.error(str(e))
+        else:
+            st.session_state["upload_digest"] = job.digest
+            st.session_state["upload_file_id"] = berkas.file_id
+
+
+@st.fragment(run_every=0.5)
+def status_upload(digest):
+    # hanya fragment ini yang rerun selama file diproses; setelah selesai
+    # seluruh halaman di-rerun sekali untuk memakai data baru
+    job = uploads.get(digest)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"Memproses {job.name}… {job.progress:.0%} {job.info}")
+
+
+job = uploads.get(st.session_state["upload_digest"]) if "upload_digest" in st.session_state else None
+if job is None and "upload_digest" in st.session_state:
+    # job lama sudah dibuang server (lihat uploads.JOB_TTL / MAX_JOBS): kalau
+    # file masih ada di uploader, rerun mengirimnya ulang
+    st.session_state.pop("upload_digest")
+    st.session_state.pop("upload_file_id", None)
+    st.rerun()
+elif job is not None and not job.done:
+    status_upload(job.digest)
+elif job is not None and job.status == "gagal":
+    st.error(f"Gagal memproses {job.name}: {job.error}")
 
 # ---------- ambil data ----------
-df = None
-if "data" in st.session_state:
-    df = st.session_state["data"]
+# dataset dipartisi per tahun dan dimuat sekali per proses server (lihat
+# utils/datasets.py & utils/partitions.py); memilih tahun hanya membaca
+# partisi tahun itu, halaman ini hanya memegang view read-only.
+if job is not None and job.status == "selesai":
+    path, label_sumber = job.path, f"file upload '{job.name}'"
 else:
-    for f in ["data_kekerasan_perempuan.csv", "pages/data_kekerasan_perempuan.csv"]:
-        if os.path.exists(f):
-            try:
-                df = pd.read_csv(f)
-                st.session_state["data"] = df
-                st.info(f"Membaca data dari {f}")
-                break
-            except Exception:
-                try:
-                    df = pd.read_excel(f)
-                    st.session_state["data"] = df
-                    st.info(f"Membaca excel dari {f}")
-                    break
-                except Exception:
-                    df = None
-
-if df is None:
-    st.warning("Data belum tersedia. Silakan upload CSV di halaman Visualisasi Data atau simpan file 'data_kekerasan_perempuan.csv' di folder project.")
-    st.stop()
+    path = source_path("kekerasan")
+    label_sumber = path
+daftar_tahun, error_schema = [], None
+if path is not None:
+    try:
+        if needs_build(path):
+            # file besar dibaca bertahap; tampilkan progres selama store dibangun
+            bar = st.progress(0.0, text="Memproses data…")
+
+            def _lapor(fraksi, agg):
+                info = f" — {agg.summary()}" if agg is not None else ""
+                bar.progress(fraksi, text=f"Memproses data… {fraksi:.0%}{info}")
+
+            prepare(progress=_lapor, path=path)
+            bar.empty()
+        daftar_tahun = years(path)
+    except SchemaError as e:
+        error_schema = str(e)
+
+# pilihan tahun = filter per pengguna (disimpan di session_state)
+if st.session_state.get("tahun") not in (daftar_tahun or [TAHUN_DEFAULT]):
+    st.session_state.pop("tahun", None)
+tahun = st.sidebar.selectbox(
+    "Tahun",
+    daftar_tahun or [TAHUN_DEFAULT],
+    index=len(daftar_tahun or [TAHUN_DEFAULT]) - 1,
+    key="tahun",
+)
+# mode hemat data: grafik dikirim sebagai gambar statis yang dirender & di-cache di server
+hemat = low_bandwidth_toggle()
+debug = fragments.debug_toggle()
 
-# ---------- normalize header ----------
-df.columns = df.columns.str.strip()
-cols = [c for c in df.columns]
-st.write("Kolom yang tersedia:", cols)  # bantu debugging di layar
-
-# ---------- deteksi format ----------
-cols_lower = [c.lower() for c in df.columns]
-is_long = ("jenis" in cols_lower and "jumlah" in cols_lower) or ("jenis" in cols_lower and any(k in cols_lower for k in ["kasus","jumlah","total"]))
-# if long form present (Provinsi, Jenis, Jumlah)
-if is_long:
-    # cari nama kolom yang cocok
-    def find_col(keywords):
-        for k in keywords:
-            for c in df.columns:
-                if k.lower() in c.lower():
-                    return c
-        return None
-
-    col_prov = find_col(["provinsi", "cakupan", "wilayah", "nama provinsi"])
-    col_jenis = find_col(["jenis", "kekerasan", "kategori", "type"])
-    col_jumlah = find_col(["jumlah", "kasus", "total", "count", "nilai"])
-    col_tahun = find_col(["tahun", "year"])
-
-    # pastikan semua ada
-    if col_prov is None or col_jenis is None or col_jumlah is None:
-        st.error("Format long terdeteksi tetapi tidak semua kolom penting ditemukan. Periksa header CSV (Provinsi, Jenis, Jumlah).")
-        st.stop()
-
-    # cast jumlah numeric
-    df[col_jumlah] = pd.to_numeric(df[col_jumlah].astype(str).str.replace(",","").str.strip(), errors="coerce")
-
-    # kalau tahun tidak ada, tambahkan default 2024
-    if col_tahun is None:
-        df["Tahun"] = 2024
-        col_tahun = "Tahun"
-
-    # gunakan df_long variable
-    df_long = df[[col_prov, col_jenis, col_jumlah, col_tahun]].rename(columns={col_prov:"Provinsi", col_jenis:"Jenis", col_jumlah:"Jumlah", col_tahun:"Tahun"}).copy()
+# Header
+st.title(f"⚠️ Kekerasan terhadap Perempuan — Tahun {tahun}")
+st.write(f"Halaman ini menampilkan ringkasan data untuk **tahun {tahun}** berdasarkan file CSV yang kamu upload/simpan.")
+st.markdown("---")
 
-else:
-    # asumsi wide: 1 baris = 1 provinsi, kolom jenis seperti Fisik, Psikis, Seksual, ...
-    # deteksi provinsi kolom
-    prov_candidates = ["cakupan","provinsi","prov","nama provinsi","wilayah"]
-    prov_col = None
-    for p in prov_candidates:
-        if p in cols_lower:
-            prov_col = df.columns[cols_lower.index(p)]
-            break
-    if prov_col is None:
-        # fallback: first non-numeric column
-        nonnum = df.select_dtypes(exclude="number").columns.tolist()
-        prov_col = nonnum[0] if nonnum else None
-
-    # numeric columns candidates (jenis)
-    exclude = {prov_col, "no", "satuan"} if prov_col else {"no","satuan"}
-    jenis_cols = []
-    for c in df.columns:
-        if c in exclude:
-            continue
-        try:
-            pd.to_numeric(df[c].dropna().astype(str).str.replace(",","").str.strip(), errors="raise")
-            jenis_cols.append(c)
-        except Exception:
-            pass
-
-    if not jenis_cols:
-        st.error("Format wide terdeteksi tetapi tidak ditemukan kolom jenis numeric. Pastikan kolom jenis seperti Fisik/Psikis/Seksual exist.")
-        st.stop()
-
-    # drop possible total row 'INDONESIA'
-    if prov_col:
-        df = df[~df[prov_col].astype(str).str.strip().str.upper().eq("INDONESIA")]
-
-    # melt menjadi long
-    id_vars = [prov_col] if prov_col else []
-    df_long = df.melt(id_vars=id_vars, value_vars=jenis_cols, var_name="Jenis", value_name="Jumlah")
-    if prov_col:
-        df_long = df_long.rename(columns={prov_col:"Provinsi"})
-    # tambah Tahun default jika tidak ada
-    if not any(k in cols_lower for k in ["tahun","year"]):
-        df_long["Tahun"] = 2024
+if path is None:
+    st.warning("Data belum tersedia. Silakan upload CSV lewat menu 'Upload data sendiri' di sidebar atau simpan file 'data_kekerasan_perempuan.csv' di folder project.")
+    st.stop()
+if error_schema:
+    st.error(error_schema)
+    st.stop()
+
+# ---------- fragment ----------
+# tiap blok di bawah adalah st.fragment (utils/fragments.py): kontrol di dalam
+# satu blok hanya me-rerun blok itu. Memilih tahun / mode hemat di sidebar
+# tetap me-rerun seluruh halaman karena semua blok bergantung padanya.
+# Semua data diambil dari cache proses, jadi rerun fragment hanya membaca cache.
+
+@fragments.fragment("Data")
+def blok_data(path, label_sumber, digest):
+    st.info(f"Membaca data dari {label_sumber}")
+    with st.expander("Kolom yang tersedia"):
+        st.write(schema(path)["kolom"])  # bantu debugging di layar
+    if st.button("🔄 Cek perubahan file", key="cek_file"):
+        if file_hash(path) != digest:
+            # file berubah: semua blok harus dihitung ulang
+            st.rerun(scope="app")
+        st.toast("File data tidak berubah.")
+
+
+@fragments.fragment("Ringkasan")
+def blok_ringkasan(mtx, tahun, daftar_tahun, path):
+    st.subheader(f"📋 Ringkasan Utama ({tahun})")
+    sebelumnya = [t for t in daftar_tahun if t < tahun]
+    banding = st.toggle(
+        "Bandingkan dengan tahun sebelumnya", key="banding_tahun", disabled=not sebelumnya
+    )
+    delta = None
+    if banding and sebelumnya:
+        lalu = matrix(sebelumnya[-1], path)
+        delta = f"{mtx.grand_total - lalu.grand_total:+,} dari {sebelumnya[-1]}"
+    st.metric(f"Total kasus ({tahun}, jumlah terlapor)", f"{mtx.grand_total:,}", delta=delta)
+    st.write(f"Jumlah baris (entri): **{mtx.n_entri}**")
+
+
+@fragments.fragment("Top provinsi")
+def blok_top_provinsi(mtx, tahun, hemat, digest):
+    n_prov = len(mtx.rows)
+    n = st.slider("Jumlah provinsi", 1, n_prov, min(10, n_prov), key="n_top_provinsi") if n_prov > 1 else n_prov
+    topprov = mtx.top_rows(n)
+    st.markdown(f"**Provinsi dengan jumlah kasus terbanyak ({tahun})**")
+    if hemat:
+        st.image(bar_image(digest, f"top_provinsi_{n}", tahun, topprov, "Jumlah kasus", horizontal=True))
+    else:
+        st.bar_chart(topprov)
+    st.table(topprov.reset_index().rename(columns={"Provinsi":"Provinsi","Jumlah":"Jumlah Kasus"}))
+
+
+@fragments.fragment("Jenis")
+def blok_jenis(mtx, tahun, hemat, digest):
+    distjenis = mtx.top_cols()
+    persen = st.toggle("Tampilkan persentase", key="persen_jenis")
+    label = "Jumlah kasus"
+    if persen and mtx.grand_total:
+        distjenis = (distjenis / mtx.grand_total * 100).round(1).rename("Persen")
+        label = "Persen kasus (%)"
+    st.markdown(f"**Distribusi menurut jenis kekerasan ({tahun})**")
+    if hemat:
+        st.image(bar_image(digest, f"jenis_{'persen' if persen else 'jumlah'}", tahun, distjenis, label, color="#e68aa3"))
     else:
-        # jika ada kolom tahun, cari dan gunakan
-        for k in ["tahun","year"]:
-            if k in cols_lower:
-                df_long["Tahun"] = df[k] if k in df.columns else 2024
-                break
-    # bersihkan jumlah
-    df_long["Jumlah"] = pd.to_numeric(df_long["Jumlah"].astype(str).str.replace(",","").str.strip(), errors="coerce")
-
-# simpan ke session
-st.session_state["data"] = df_long
-
-# ---------- filter 2024 ----------
-df_long = df_long.copy()
-df_long["Tahun"] = pd.to_numeric(df_long["Tahun"], errors="coerce")
-data2024 = df_long[df_long["Tahun"] == 2024]
-
-if data2024.empty:
-    st.warning("Tidak ditemukan data untuk tahun 2024 dalam dataset.")
-    st.write("Preview beberapa baris:")
-    st.dataframe(df_long.head(10))
+        st.bar_chart(distjenis)
+    st.table(distjenis.reset_index().rename(columns={"Jenis":"Jenis Kekerasan","Jumlah":"Jumlah Kasus","Persen":"Persen (%)"}))
+
+
+@fragments.fragment("Preview")
+def blok_preview(tahun, path):
+    # hanya partisi tahun terpilih yang dibaca
+    data_tahun = view_year(tahun, path)
+    st.subheader(f"Data ({tahun})")
+    # sort, pencarian & paginasi di server; hanya halaman aktif yang dikirim (utils/grid.py)
+    data_grid(f"kekerasan_{tahun}", file_hash(path), data_tahun, key="grid_kekerasan", page_size=20)
+
+
+def blok_export(tahun, path, digest):
+    st.markdown(f"**Download data long-form ({tahun})**")
+    # dibuat hanya saat diminta, di-cache per (versi file, format); lihat utils/export.py
+    export_panel(f"kekerasan_perempuan_{tahun}", digest, view_year(tahun, path), key="export_kekerasan")
+
+
+digest = file_hash(path)
+blok_data(path, label_sumber, digest)
+
+# ---------- filter tahun ----------
+# ringkasan di bawah dihitung dari matriks int32 Provinsi x Jenis (total baris,
+# kolom & urutan top-N sudah dihitung sekali per versi data), bukan groupby per rerun
+mtx = matrix(tahun, path)
+
+if mtx.n_entri == 0:
+    st.warning(f"Tidak ditemukan data untuk tahun {tahun} dalam dataset.")
     st.stop()
 
-# ---------- ringkasan ----------
-st.subheader("📋 Ringkasan Utama (2024)")
-total = int(data2024["Jumlah"].sum(skipna=True))
-st.metric("Total kasus (2024, jumlah terlapor)", f"{total:,}")
-st.write(f"Jumlah baris (entri): **{len(data2024)}**")
-
-# Top provinsi
-topprov = data2024.groupby("Provinsi")["Jumlah"].sum().sort_values(ascending=False).head(10)
-st.markdown("**Provinsi dengan jumlah kasus terbanyak (2024)**")
-st.bar_chart(topprov)
-st.table(topprov.reset_index().rename(columns={"Provinsi":"Provinsi","Jumlah":"Jumlah Kasus"}))
-
-# Distribusi jenis
-distjenis = data2024.groupby("Jenis")["Jumlah"].sum().sort_values(ascending=False)
-st.markdown("**Distribusi menurut jenis kekerasan (2024)**")
-st.bar_chart(distjenis)
-st.table(distjenis.reset_index().rename(columns={"Jenis":"Jenis Kekerasan","Jumlah":"Jumlah Kasus"}))
-
-# Preview
+blok_ringkasan(mtx, tahun, daftar_tahun, path)
+blok_top_provinsi(mtx, tahun, hemat, digest)
+blok_jenis(mtx, tahun, hemat, digest)
 st.markdown("---")
-st.subheader("Contoh baris data (2024)")
-st.dataframe(data2024.head(12), use_container_width=True)
+blok_preview(tahun, path)
+blok_export(tahun, path, digest)
 
 st.markdown("---")
 st.subheader("✍️ Mengapa isu ini penting untuk dibahas?")
@@ -179,3 +218,16 @@ st.write(
     "3. Banyak kasus tidak dilaporkan — angka yang terlihat kemungkinan lebih rendah dari kenyataan.\n"
 )
 st.info("Catatan: angka yang ditampilkan adalah angka terlapor pada dataset. Hormati privasi korban saat membagikan data ini.")
+
+# ---------- laporan memori ----------
+with st.expander("🧠 Laporan memori (debug)"):
+    laporan = memory_report({f"kekerasan {tahun}": view_year(tahun, path)})
+    st.caption(f"Matriks Provinsi × Jenis {mtx.values.shape[0]}×{mtx.values.shape[1]} int32: {mtx.nbytes:,} bytes")
+    st.dataframe(laporan["dataset"], hide_index=True)
+    c1, c2 = st.columns(2)
+    c1.metric("Bytes per sesi — sebelum (salinan penuh per sesi)", f"{laporan['per_sesi_sebelum']:,}")
+    c2.metric("Bytes per sesi — sesudah (hanya session_state)", f"{laporan['per_sesi_sesudah']:,}")
+    st.caption("Dataset dimuat sekali per proses server; tiap sesi hanya menyimpan filter miliknya sendiri.")
+
+if debug:
+    fragments.debug_panel()
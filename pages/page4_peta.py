@@ -1,6 +1,25 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
+import streamlit.components.v1 as components
+from streamlit_folium import st_folium
+
+from utils.charts import sebaran_spec
+from utils.datasets import KOLOM_KASUS, KOLOM_KORBAN, KOLOM_PROV_SEBARAN, cube_sebaran, version, view
+from utils.export import export_panel
+from utils.fragments import debug_panel, debug_toggle, fragment, start_run
+from utils.grid import data_grid
+from utils.geo import (
+    ZOOM_AWAL,
+    choropleth_html,
+    choropleth_map,
+    choropleth_tiles_html,
+    level_report,
+    provinces,
+    unmatched,
+)
+from utils.raster import bar_image, choropleth_image, low_bandwidth_toggle, pie_image
+from utils.regions import KODE_TIDAK_DIKENAL
+from utils.spatial import index as spatial_index
+from utils.topology import level_for_zoom
 
 # ============================
 # PAGE CONFIG
@@ -9,6 +28,7 @@ st.set_page_config(
     page_title="Sebaran Kasus Kekerasan Perempuan",
     layout="wide"
 )
+start_run()
 
 # ============================
 # JUDUL UTAMA
@@ -19,99 +39,189 @@ st.caption("Data berdasarkan jumlah kasus & jumlah korban per provinsi di Indone
 # ============================
 # 1. LOAD DATA
 # ============================
-df = pd.read_csv("data_sebaran_kasus.csv", sep=None, engine="python")
-
-# Hapus baris total nasional
-df = df[df["Cakupan"] != "INDONESIA"]
-
-prov_col = "Cakupan"
-kasus = "Jumlah Kasus (Kasus)"
-korban = "Jumlah Korban (Orang)"
-
-# Cleaning angka
-for col in [kasus, korban]:
-    df[col] = (
-        df[col].astype(str)
-        .str.replace(",", "")
-        .str.extract(r"(\d+)")
-        .astype(float)
-    )
+# dimuat sekali per proses server (sudah dibersihkan), dipakai bersama semua sesi
+df = view("sebaran")
+versi = version("sebaran")
+
+# mode hemat data: peta & grafik dikirim sebagai gambar statis yang dirender & di-cache di server
+hemat = low_bandwidth_toggle()
+debug = debug_toggle()
+
+prov_col = KOLOM_PROV_SEBARAN
+kasus = KOLOM_KASUS
+korban = KOLOM_KORBAN
 
 # ============================
 # 2. SUMMARY STATISTICS
 # ============================
-total_kasus = int(df[kasus].sum())
-total_korban = int(df[korban].sum())
-prov_tertinggi_kasus = df.sort_values(kasus, ascending=False).iloc[0]
-prov_tertinggi_korban = df.sort_values(korban, ascending=False).iloc[0]
+# total, provinsi tertinggi & urutan top-N sudah dihitung sekali di rollup cube
+kubus = cube_sebaran()
+total_kasus = int(kubus.total(kasus))
+total_korban = int(kubus.total(korban))
+prov_tertinggi_kasus, kasus_tertinggi = kubus.argmax(prov_col, kasus)
+prov_tertinggi_korban, korban_tertinggi = kubus.argmax(prov_col, korban)
+
+# tabel per provinsi, urut menurun menurut jumlah kasus; kolom Kode (kode wilayah
+# kanonik untuk join ke peta) sudah dicocokkan sekali saat data dimuat
+tabel = kubus.table(prov_col, kasus).reset_index()
 
 col1, col2, col3, col4 = st.columns(4)
 
 col1.metric("Total Kasus", f"{total_kasus:,}")
 col2.metric("Total Korban", f"{total_korban:,}")
-col3.metric("Provinsi dengan Kasus Tertinggi", prov_tertinggi_kasus[prov_col])
-col4.metric("Jumlah Kasus Tertinggi", f"{int(prov_tertinggi_kasus[kasus]):,}")
+col3.metric("Provinsi dengan Kasus Tertinggi", prov_tertinggi_kasus)
+col4.metric("Jumlah Kasus Tertinggi", f"{int(kasus_tertinggi):,}")
 
 st.markdown("---")
 
 # ============================
-# 3. BAR CHART — KASUS PER PROVINSI
-# ============================
-st.subheader("📈 Jumlah Kasus per Provinsi")
+# PETA CHOROPLETH
+# ============================
+st.subheader("🗺️ Peta Sebaran per Provinsi")
+
+# kontrol peta (metrik, zoom, geometri, klik) hanya me-rerun fragment ini
+@fragment("Peta")
+def blok_peta(tabel, versi, hemat):
+    geo = provinces()
+    col_m, col_z, col_s = st.columns([2, 3, 2])
+    metrik = col_m.radio("Tampilkan", ["Kasus", "Korban"], horizontal=True, key="metrik_peta")
+    kolom_metrik = kasus if metrik == "Kasus" else korban
+
+    if hemat:
+        # gambar statis dari server (cache LRU per versi data, metrik & ukuran)
+        gambar_peta = choropleth_image(geo, versi, metrik, None, tabel["Kode"], tabel[kolom_metrik], f"Jumlah {metrik}")
+        st.image(gambar_peta, width="stretch")
+        st.caption(f"Mode hemat data · gambar peta {len(gambar_peta) / 1024:,.0f} KB")
+    else:
+        zoom = col_z.select_slider("Zoom awal", options=list(range(4, 11)), value=ZOOM_AWAL, key="zoom_peta")
+        sumber_geo = col_s.radio(
+            "Geometri",
+            ["TopoJSON", "Vector tile"],
+            horizontal=True,
+            key="sumber_geo_peta",
+            help="Vector tile: batas wilayah diambil per tile dari server aplikasi, hanya yang terlihat.",
+        )
+        klik_peta = st.toggle(
+            "🖱️ Klik peta untuk memilih provinsi",
+            key="klik_peta",
+            help="Peta interaktif: klik satu provinsi untuk melihat ringkasannya. Sedikit lebih lambat dimuat.",
+        )
+
+        if klik_peta:
+            # peta dirakit ulang tiap rerun (st_folium butuh objek Map); rerun hanya saat peta diklik
+            peta = choropleth_map(
+                geo,
+                tabel["Kode"],
+                tabel[kolom_metrik],
+                metrik,
+                f"Jumlah {metrik}",
+                zoom,
+                vector_tiles=sumber_geo == "Vector tile",
+            )
+            hasil_klik = st_folium(peta, height=520, width=1100, returned_objects=["last_clicked"], key="peta_klik")
+            titik = (hasil_klik or {}).get("last_clicked")
+
+            # klik -> feature lewat STR-tree + uji titik-dalam-polygon (sub-milidetik)
+            idx_spasial = spatial_index(geo)
+            if titik:
+                pos = idx_spasial.lookup(titik["lng"], titik["lat"])
+                if pos >= 0:
+                    st.session_state["provinsi_peta"] = pos
+            pos = st.session_state.get("provinsi_peta", -1)
+            if pos >= 0:
+                props = idx_spasial.properties[pos]
+                kode = int(idx_spasial.keys[pos])
+                baris = tabel[tabel["Kode"] == kode]
+                st.markdown(f"#### 📍 {props['PROVINSI']} (kode {kode})")
+                if baris.empty:
+                    st.info("Tidak ada data untuk provinsi ini.")
+                else:
+                    peringkat = int(baris.index[0]) + 1
+                    p1, p2, p3 = st.columns(3)
+                    p1.metric("Jumlah Kasus", f"{int(baris[kasus].iloc[0]):,}")
+                    p2.metric("Jumlah Korban", f"{int(baris[korban].iloc[0]):,}")
+                    p3.metric("Peringkat Kasus", f"{peringkat} dari {len(tabel)}")
+            else:
+                st.caption("Klik salah satu provinsi di peta.")
+        else:
+            # GeoJSON di-parse sekali per proses; HTML peta di-cache per (versi data, metrik, zoom).
+            # TopoJSON: geometri ikut di HTML dengan level detail sesuai zoom.
+            # Vector tile: HTML hanya membawa warna; geometri diambil browser per tile.
+            buat_peta = choropleth_tiles_html if sumber_geo == "Vector tile" else choropleth_html
+            html_peta = buat_peta(
+                geo,
+                versi,
+                tabel["Kode"],
+                tabel[kolom_metrik],
+                metrik,
+                f"Jumlah {metrik}",
+                zoom,
+            )
+            components.html(html_peta, height=520)
+            if sumber_geo == "Vector tile":
+                st.caption(f"Geometri dari vector tile · HTML peta {len(html_peta.encode()) / 1024:,.0f} KB")
+            else:
+                st.caption(f"Level geometri: {level_for_zoom(zoom)} · HTML peta {len(html_peta.encode()) / 1024:,.0f} KB")
+
+        with st.expander("Ukuran & waktu render per level geometri"):
+            st.dataframe(level_report(geo), hide_index=True, width="stretch")
+
+    # nama tak dikenal registry (Kode = -1) + wilayah tanpa batas di peta
+    tidak_cocok = list(tabel.loc[tabel["Kode"] == KODE_TIDAK_DIKENAL, prov_col]) + unmatched(geo, tabel["Kode"])
+    if tidak_cocok:
+        st.caption("Provinsi tanpa batas wilayah di peta: " + ", ".join(tidak_cocok))
+
+
+blok_peta(tabel, versi, hemat)
 
-chart_kasus = alt.Chart(df).mark_bar().encode(
-    x=alt.X(prov_col, sort='-y', title="Provinsi"),
-    y=alt.Y(kasus, title="Jumlah Kasus"),
-    tooltip=[prov_col, kasus]
-).properties(height=350)
-
-st.altair_chart(chart_kasus, use_container_width=True)
+st.markdown("---")
 
 # ============================
-# 4. BAR CHART — KORBAN PER PROVINSI
+# 3. GRAFIK — KASUS, KORBAN & TOP 10 PROVINSI
 # ============================
-st.subheader("📉 Jumlah Korban per Provinsi")
-
-chart_korban = alt.Chart(df).mark_bar(color="salmon").encode(
-    x=alt.X(prov_col, sort='-y', title="Provinsi"),
-    y=alt.Y(korban, title="Jumlah Korban"),
-    tooltip=[prov_col, korban]
-).properties(height=350)
+st.subheader("📈 Kasus & Korban per Provinsi")
 
-st.altair_chart(chart_korban, use_container_width=True)
+if hemat:
+    st.image(bar_image(versi, kasus, None, tabel.set_index(prov_col)[kasus], "Jumlah Kasus"), width="stretch")
+    st.image(
+        bar_image(versi, korban, None, tabel.set_index(prov_col)[korban], "Jumlah Korban", color="salmon"),
+        width="stretch",
+    )
+    st.markdown("**🍩 10 Provinsi dengan Kasus Tertinggi**")
+    st.image(pie_image(versi, kasus, None, tabel.head(10).set_index(prov_col)[kasus]))
+else:
+    # satu spec Vega-Lite gabungan; ketiga view mengacu ke satu dataset bernama
+    # yang dikirim sekali (Arrow), spec + data di-cache per versi data
+    spec, ukuran_spec = sebaran_spec(versi, tabel, prov_col, kasus, korban)
+    st.vega_lite_chart(spec, width="stretch")
+    st.caption(
+        "Klik batang / irisan untuk menyorot provinsi di semua grafik dan memfilter tabel "
+        "(shift+klik: beberapa provinsi, klik area kosong: reset). Slider Top-N memfilter semua grafik. "
+        "Semua interaksi berjalan di browser tanpa memuat ulang halaman."
+    )
+    st.caption(
+        f"Spec {ukuran_spec['spec (KB)']:,} KB + dataset {ukuran_spec['dataset Arrow (KB)']:,} KB (dikirim sekali untuk grafik dan tabel)"
+    )
 
 st.markdown("---")
 
 # ============================
-# 5. PIE CHART — TOP 10 PROVINSI
+# 6. DATA TABLE
 # ============================
-st.subheader("🍩 10 Provinsi dengan Kasus Tertinggi")
+st.subheader("📄 Tabel Lengkap — Sebaran Kasus Kekerasan Perempuan per Provinsi")
 
-df_top10 = df.sort_values(kasus, ascending=False).head(10)
 
-pie = alt.Chart(df_top10).mark_arc().encode(
-    theta=alt.Theta(kasus, type="quantitative"),
-    color=alt.Color(prov_col, legend=None),
-    tooltip=[prov_col, kasus]
-).properties(
-    width=300,
-    height=300
-)
 
-st.altair_chart(pie, use_container_width=False)
+# sort, pencarian & paginasi di server; hanya halaman aktif yang dikirim (utils/grid.py)
+@fragment("Tabel")
+def blok_tabel(tabel, versi):
+    data_grid("tabel_sebaran", versi, tabel, key="grid_sebaran")
 
-st.markdown("---")
 
-# ============================
-# 6. DATA TABLE
-# ============================
-st.subheader("📄 Tabel Lengkap — Sebaran Kasus Kekerasan Perempuan per Provinsi")
+blok_tabel(tabel, versi)
 
-st.dataframe(
-    df.sort_values(kasus, ascending=False).reset_index(drop=True),
-    use_container_width=True
-)
+# Download: file dibuat hanya saat diminta, di-cache per versi data (utils/export.py)
+export_panel("sebaran_kekerasan_perempuan", versi, df, key="export_sebaran")
 
-# Download Button
-csv = df.to_csv(index=False)
-st.download_button("⬇ Download Data CSV", csv, "sebaran_kekerasan_perempuan.csv", "text/csv")
+if debug:
+    debug_panel()
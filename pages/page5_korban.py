@@ -1,25 +1,50 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 
-st.title("👩‍🦰 Profil Korban")
+from utils.codes import memory_report, value_counts
+from utils.crosstab import DIM_RELASI, DIM_USIA_KORBAN, crosstab_view
+from utils.histogram import BANDS_TPKS, BANDS_USIA, age_histogram
+from utils.synthetic import controls, dataset
 
-# Data contoh
-n = 300
-np.random.seed(42)
+st.title("👩‍🦰 Profil Korban")
 
-df = pd.DataFrame({
-    "Usia": np.random.randint(5, 70, n),
-    "Pendidikan": np.random.choice(["SD","SMP","SMA","D3/S1","Tidak Sekolah"], n),
-    "Pekerjaan": np.random.choice(["Pelajar","Ibu Rumah Tangga","Pekerja Formal","Buruh","Tidak Bekerja"], n),
-    "Relasi Pelaku": np.random.choice(["Keluarga","Teman","Pacar","Suami","Orang Asing"], n),
-})
+# Data contoh: kasus sintetis (korban & pelaku saling terhubung), dibangkitkan
+# sekali per (seed, jumlah) dan dipakai bersama halaman Profil Pelaku
+n, seed = controls()
+df = dataset(n, seed).korban
+st.caption(f"Data sintetis: {len(df):,} korban · seed {seed}")
 
 st.subheader("Distribusi Usia")
-st.bar_chart(df["Usia"].value_counts().sort_index())
+# histogram usia: satu np.bincount per dataset (di-cache), kelompok umur dijumlah dari histogram itu
+hist = age_histogram(("korban", n, seed), df["Usia"])
+tampilan = st.radio(
+    "Tampilan", ["Per tahun usia", "Kelompok umur", "Anak / dewasa (UU TPKS)"], horizontal=True, key="usia_korban"
+)
+if tampilan == "Per tahun usia":
+    st.bar_chart(hist.by_year())
+elif tampilan == "Kelompok umur":
+    st.bar_chart(hist.by_band(BANDS_USIA), sort=False)
+    st.caption("Kelompok umur deskriptif; batas 18 tahun mengikuti UU No. 12/2022 (TPKS).")
+else:
+    st.bar_chart(hist.by_band(BANDS_TPKS), sort=False)
+    st.caption("UU No. 12/2022 (TPKS): anak = belum berusia 18 tahun.")
 
 st.subheader("Pendidikan")
-st.dataframe(df["Pendidikan"].value_counts())
+st.dataframe(value_counts(df["Pendidikan"]))
 
 st.subheader("Relasi Pelaku terhadap Korban")
-st.dataframe(df["Relasi Pelaku"].value_counts())
+st.dataframe(value_counts(df["Relasi Pelaku"]))
+
+st.subheader("🔗 Korban × Pelaku (kasus terhubung)")
+# tabulasi silang dari array hitungan yang dibangun sekali per dataset (utils/crosstab.py);
+# ganti baris / kolom / filter = slicing array kecil, tanpa groupby
+st.caption("Default: Kelompok umur korban × relasi pelaku. Pilih dimensi lain atau filter provinsi / kelompok umur di bawah.")
+crosstab_view(n, seed, key="silang_korban", rows=DIM_USIA_KORBAN, cols=DIM_RELASI)
+
+# atribut = Categorical (kode int8, kamus bersama), usia = uint8; hitungan lewat np.bincount
+with st.expander("🧠 Memori data (debug)"):
+    laporan = memory_report(df)
+    st.dataframe(laporan, hide_index=True, width="stretch")
+    st.caption(
+        f"Total {laporan['Bytes'].sum():,} bytes; sebagai string object / int64 "
+        f"kira-kira {laporan['Bytes (object / int64)'].sum():,} bytes."
+    )
@@ -1,24 +1,49 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 
-st.title("🧑‍⚖️ Profil Pelaku")
+from utils.codes import memory_report, value_counts
+from utils.crosstab import DIM_JK_PELAKU, DIM_RELASI, crosstab_view
+from utils.histogram import BANDS_TPKS, BANDS_USIA, age_histogram
+from utils.synthetic import controls, dataset
 
-n = 200
-np.random.seed(12)
+st.title("🧑‍⚖️ Profil Pelaku")
 
-df = pd.DataFrame({
-    "Usia": np.random.randint(15, 70, n),
-    "Jenis Kelamin": np.random.choice(["Laki-laki","Perempuan"], n, p=[0.9, 0.1]),
-    "Status": np.random.choice(["Teman","Pacar","Suami","Keluarga","Tetangga","Orang Asing"], n),
-    "Pekerjaan": np.random.choice(["Pengangguran","Buruh","Pegawai","Wiraswasta","Pelajar"], n)
-})
+# Data contoh: pelaku dari kasus sintetis yang sama dengan halaman Profil Korban
+n, seed = controls()
+df = dataset(n, seed).pelaku
+st.caption(f"Data sintetis: {len(df):,} pelaku · seed {seed}")
 
 st.subheader("Distribusi Usia Pelaku")
-st.bar_chart(df["Usia"].value_counts().sort_index())
+# histogram usia: satu np.bincount per dataset (di-cache), kelompok umur dijumlah dari histogram itu
+hist = age_histogram(("pelaku", n, seed), df["Usia"])
+tampilan = st.radio(
+    "Tampilan", ["Per tahun usia", "Kelompok umur", "Anak / dewasa (UU TPKS)"], horizontal=True, key="usia_pelaku"
+)
+if tampilan == "Per tahun usia":
+    st.bar_chart(hist.by_year())
+elif tampilan == "Kelompok umur":
+    st.bar_chart(hist.by_band(BANDS_USIA), sort=False)
+    st.caption("Kelompok umur deskriptif; batas 18 tahun mengikuti UU No. 12/2022 (TPKS).")
+else:
+    st.bar_chart(hist.by_band(BANDS_TPKS), sort=False)
+    st.caption("UU No. 12/2022 (TPKS): anak = belum berusia 18 tahun.")
 
 st.subheader("Jenis Kelamin Pelaku")
-st.dataframe(df["Jenis Kelamin"].value_counts())
+st.dataframe(value_counts(df["Jenis Kelamin"]))
 
 st.subheader("Hubungan Pelaku dengan Korban")
-st.dataframe(df["Status"].value_counts())
+st.dataframe(value_counts(df["Status"]))
+
+st.subheader("🔗 Korban × Pelaku (kasus terhubung)")
+# tabulasi silang dari array hitungan yang dibangun sekali per dataset (utils/crosstab.py);
+# ganti baris / kolom / filter = slicing array kecil, tanpa groupby
+st.caption("Default: Relasi × jenis kelamin pelaku. Pilih dimensi lain atau filter provinsi / kelompok umur di bawah.")
+crosstab_view(n, seed, key="silang_pelaku", rows=DIM_RELASI, cols=DIM_JK_PELAKU)
+
+# atribut = Categorical (kode int8, kamus bersama), usia = uint8; hitungan lewat np.bincount
+with st.expander("🧠 Memori data (debug)"):
+    laporan = memory_report(df)
+    st.dataframe(laporan, hide_index=True, width="stretch")
+    st.caption(
+        f"Total {laporan['Bytes'].sum():,} bytes; sebagai string object / int64 "
+        f"kira-kira {laporan['Bytes (object / int64)'].sum():,} bytes."
+    )
@@ -0,0 +1,43 @@
+# tests/conftest.py
+# GeoJSON kecil untuk uji build step peta (topologi, tile, indeks spasial).
+import json
+
+import numpy as np
+import pytest
+
+
+def _perbatasan(n=200, seed=0):
+    # garis batas berkelok dari (110, -6) ke (110, -2): banyak titik, cocok untuk disederhanakan
+    rng = np.random.default_rng(seed)
+    lat = np.linspace(-6.0, -2.0, n)
+    lon = 110.0 + 0.05 * np.sin(lat * 7) + rng.normal(0, 0.002, n)
+    lon[[0, -1]] = 110.0
+    return np.column_stack([lon, lat]).round(6).tolist()
+
+
+def dua_provinsi():
+    """Dua polygon bertetangga (A barat, B timur) yang berbagi satu batas berkelok."""
+    batas = _perbatasan()
+    a = [[106.0, -6.0]] + batas + [[106.0, -2.0], [106.0, -6.0]]
+    b = [[110.0, -6.0], [114.0, -6.0], [114.0, -2.0]] + batas[::-1]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": {"KODE_PROV": "31", "PROVINSI": "A"},
+             "geometry": {"type": "Polygon", "coordinates": [a]}},
+            {"type": "Feature", "properties": {"KODE_PROV": "32", "PROVINSI": "B"},
+             "geometry": {"type": "Polygon", "coordinates": [b]}},
+        ],
+    }
+
+
+@pytest.fixture
+def geojson_dua():
+    return dua_provinsi()
+
+
+@pytest.fixture
+def geojson_path(tmp_path):
+    path = tmp_path / "uji.json"
+    path.write_text(json.dumps(dua_provinsi()), encoding="utf-8")
+    return str(path)
@@ -0,0 +1,52 @@
+# tests/test_codes.py
+# Hitungan dari kode harus sama dengan Series.value_counts(), apa pun lebar kodenya.
+import numpy as np
+import pandas as pd
+
+from utils import codes
+from utils.synthetic import _pilih, generate
+
+
+def _kategori(k, n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    kode = rng.integers(-1, k, n)  # -1 = NaN
+    kode[0] = k - 1
+    return pd.Series(pd.Categorical.from_codes(kode, categories=[f"K{i}" for i in range(k)]), name="Atribut")
+
+
+def test_value_counts_kode_int8_dan_int16():
+    for k, lebar in [(5, np.int8), (300, np.int16)]:
+        s = _kategori(k)
+        assert s.cat.codes.dtype == lebar
+        acuan = s.value_counts()
+        hasil = codes.value_counts(s)
+        assert hasil.sum() == s.notna().sum()
+        pd.testing.assert_series_equal(hasil.sort_index(), acuan.sort_index(), check_index_type=False)
+        assert (np.diff(hasil.to_numpy()) <= 0).all()
+        assert list(codes.value_counts(s, sort=False).index) == list(s.cat.categories)
+
+
+def test_value_counts_usia_uint8():
+    s = pd.Series(np.array([0, 17, 17, 18, 255, 17], dtype=np.uint8), name="Usia")
+    hasil = codes.value_counts(s)
+    assert hasil.to_dict() == {17: 3, 0: 1, 18: 1, 255: 1}
+    assert hasil.index.dtype == np.uint8
+
+
+def test_ukuran_kode_mengikuti_jumlah_kategori():
+    rng = np.random.default_rng(0)
+    assert _pilih(rng, 256, 10).dtype == np.uint8
+    assert _pilih(rng, 257, 10).dtype == np.uint16
+    assert _pilih(rng, 514, 10, p=np.ones(514)).max() < 514
+
+
+def test_memory_report_lebih_hemat_dari_object():
+    korban, _ = generate(5_000, seed=3, provinsi=(["ACEH", "BALI"], np.array([0.5, 0.5])))
+    laporan = codes.memory_report(korban).set_index("Kolom")
+    kategori = [c for c in korban.columns if isinstance(korban[c].dtype, pd.CategoricalDtype)]
+    assert kategori and (laporan.loc[kategori, "dtype"] == "int8 + kamus").all()
+    assert (laporan["Bytes"] < laporan["Bytes (object / int64)"]).all()
+    # estimasi "object" mendekati memori nyata kolom yang sama sebagai string object
+    c = kategori[0]
+    nyata = korban[c].astype(object).memory_usage(deep=True, index=False)
+    assert abs(laporan.loc[c, "Bytes (object / int64)"] - nyata) / nyata < 0.05
@@ -0,0 +1,43 @@
+# tests/test_crosstab.py
+import numpy as np
+import pandas as pd
+
+from utils import crosstab
+from utils.crosstab import CrossTab, Dimension, band_codes
+from utils.histogram import BANDS_USIA
+
+
+def _dims():
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 3, 500)
+    b = rng.integers(0, 4, 500)
+    return a, b, [Dimension("A", a, ["a0", "a1", "a2"]), Dimension("B", b, ["b0", "b1", "b2", "b3"])]
+
+
+def test_sama_dengan_pd_crosstab():
+    a, b, dims = _dims()
+    hasil = CrossTab.build(dims).table("A", "B")
+    harapan = pd.crosstab(a, b).reindex(index=range(3), columns=range(4), fill_value=0)
+    np.testing.assert_array_equal(hasil.to_numpy(), harapan.to_numpy())
+    # urutan dimensi dibalik = transpos
+    np.testing.assert_array_equal(CrossTab.build(dims).table("B", "A").to_numpy(), harapan.to_numpy().T)
+
+
+def test_filter_dan_kode_tidak_valid():
+    a, b, dims = _dims()
+    dims[1] = Dimension("B", np.where(b == 3, -1, b), dims[1].labels)  # kode -1 (NaN) tidak dihitung
+    kubus = CrossTab.build(dims)
+    assert kubus.counts.sum() == int((b != 3).sum())
+    s = kubus.select({"B": ["b1", "b2"]}).table("A")
+    np.testing.assert_array_equal(s.to_numpy(), np.bincount(a[(b == 1) | (b == 2)], minlength=3))
+
+
+def test_band_codes():
+    usia = np.array([0, 11, 12, 17, 18, 59, 60, 255], dtype=np.uint8)
+    np.testing.assert_array_equal(band_codes(usia, BANDS_USIA), [0, 0, 1, 1, 2, 2, 3, 3])
+
+
+def test_cache_per_versi_data():
+    # versi data kekerasan ikut kunci cache, sama dengan synthetic._dataset
+    assert crosstab.cube(300, 1, digest="a") is crosstab.cube(300, 1, digest="a")
+    assert crosstab.cube(300, 1, digest="a") is not crosstab.cube(300, 1, digest="b")
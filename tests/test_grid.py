@@ -0,0 +1,43 @@
+# tests/test_grid.py
+# Satu halaman grid = urutan kolom sort, disaring pencarian, lalu dipotong per halaman.
+import numpy as np
+import pandas as pd
+
+from utils.grid import NAIK, TURUN, page
+
+
+def _df():
+    return pd.DataFrame({
+        "Provinsi": ["BALI", "ACEH", None, "PAPUA", "ACEH BARAT", "JAMBI", "RIAU"],
+        "Jenis": pd.Categorical(["Fisik", "Psikis", "Fisik", "Seksual", "Fisik", "Psikis", "Seksual"]),
+        "Jumlah": [5, 2, 9, np.nan, 2, 7, 1],
+    })
+
+
+def test_sort_stabil_dan_nan_di_akhir():
+    df = _df()
+    naik, _ = page("uji-grid-sort", 1, df, "Jumlah", NAIK, ukuran=10)
+    turun, _ = page("uji-grid-sort", 1, df, "Jumlah", TURUN, ukuran=10)
+    assert naik["Jumlah"].tolist()[:-1] == [1, 2, 2, 5, 7, 9]
+    assert naik["Provinsi"].tolist()[1:3] == ["ACEH", "ACEH BARAT"]  # sama besar: urutan asli
+    assert turun["Jumlah"].tolist()[:-1] == [9, 7, 5, 2, 2, 1]
+    assert np.isnan(naik["Jumlah"].iloc[-1]) and np.isnan(turun["Jumlah"].iloc[-1])
+    assert naik["Provinsi"].tolist()[-1] == turun["Provinsi"].tolist()[-1] == "PAPUA"
+
+
+def test_cari_teks_dan_kategori():
+    df = _df()
+    potong, n = page("uji-grid-cari", 1, df, cari=" aceh ")
+    assert n == 2 and potong["Provinsi"].tolist() == ["ACEH", "ACEH BARAT"]
+    potong, n = page("uji-grid-cari", 1, df, "Jumlah", TURUN, cari="PSIKIS")
+    assert n == 2 and potong["Provinsi"].tolist() == ["JAMBI", "ACEH"]
+    # kolom angka tidak ikut dicari
+    assert page("uji-grid-cari", 1, df, cari="5")[1] == 0
+
+
+def test_batas_halaman():
+    df = _df()
+    assert page("uji-grid-hal", 1, df, halaman=1, ukuran=3)[0].index.tolist() == [0, 1, 2]
+    assert page("uji-grid-hal", 1, df, halaman=3, ukuran=3)[0].index.tolist() == [6]
+    potong, n = page("uji-grid-hal", 1, df, halaman=4, ukuran=3)
+    assert potong.empty and n == 7
@@ -0,0 +1,44 @@
+# tests/test_histogram.py
+import numpy as np
+import pytest
+
+from utils.histogram import BANDS_TPKS, BANDS_USIA, AgeHistogram, Bands, make_bands
+
+
+def test_by_band_sama_dengan_hitung_manual():
+    usia = np.random.default_rng(0).integers(0, 90, 5_000).astype(np.uint8)
+    hist = AgeHistogram.from_values(usia)
+    assert hist.total == len(usia)
+    assert hist.by_band(BANDS_TPKS).tolist() == [int((usia < 18).sum()), int((usia >= 18).sum())]
+    batas = np.searchsorted(BANDS_USIA.edges, usia, side="right") - 1
+    assert hist.by_band(BANDS_USIA).tolist() == np.bincount(batas, minlength=4).tolist()
+    assert hist.by_band().sum() == len(usia)
+
+
+def test_from_values_float_dan_di_luar_rentang():
+    hist = AgeHistogram.from_values(np.array([1.5, np.nan, 17.9, 18.0, -3, 300]))
+    assert hist.by_band(BANDS_TPKS).tolist() == [2, 1]
+    assert AgeHistogram.from_values(np.array([-1, 5, 999])).total == 1
+
+
+def test_jumlah_tidak_mengubah_operand():
+    a = AgeHistogram.from_values(np.array([1, 2], dtype=np.uint8))
+    b = AgeHistogram.from_values(np.array([2, 3], dtype=np.uint8))
+    c = a + b
+    assert (a.total, b.total, c.total) == (2, 2, 4)
+
+
+def test_make_bands_label_otomatis():
+    assert make_bands((0, 18, 60)).labels == ("0–17", "18–59", "≥60")
+
+
+@pytest.mark.parametrize("edges", [(5, 18), (0, 18, 12), (0, 18, 18), (), (0, 300)])
+def test_make_bands_menolak_batas_tidak_valid(edges):
+    with pytest.raises(ValueError):
+        make_bands(edges)
+
+
+def test_by_band_menolak_bands_tanpa_validasi():
+    # usia di bawah batas pertama akan hilang diam-diam di np.add.reduceat
+    with pytest.raises(ValueError):
+        AgeHistogram.from_values(np.array([1, 30])).by_band(Bands((10, 18), ("a", "b")))
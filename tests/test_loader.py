@@ -0,0 +1,37 @@
+# tests/test_loader.py
+# Format dan dialek file tabel ditebak dari byte awal, bukan dengan coba-coba parse.
+import pandas as pd
+
+from utils import loader
+from utils.loader import Dialect, sniff_bytes
+
+
+def test_magic_bytes_excel():
+    assert sniff_bytes(b"PK\x03\x04" + b"\0" * 16) == Dialect("xlsx", None, None)
+    assert sniff_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 16).format == "xls"
+
+
+def test_delimiter_dan_encoding_csv():
+    assert sniff_bytes(b"\xef\xbb\xbfProvinsi;Jumlah\nACEH;2\n") == Dialect("csv", ";", "utf-8-sig")
+    assert sniff_bytes(b"Provinsi\tJumlah\nACEH\t2\n").sep == "\t"
+    assert sniff_bytes("Provinsi,Jumlah\nKÖLN,2\nACEH,3\n".encode("latin-1")).encoding == "latin-1"
+    # satu kolom tanpa delimiter: jatuh ke koma
+    assert sniff_bytes(b"Provinsi\nACEH\n").sep == ","
+
+
+def test_read_table_bom_dan_titik_koma(tmp_path):
+    path = tmp_path / "kasus.csv"
+    path.write_bytes(b"\xef\xbb\xbf Provinsi ;Jumlah\nACEH;2\nBALI;3\n")
+    df = loader.read_table(str(path))
+    assert list(df.columns) == ["Provinsi", "Jumlah"]
+    assert df["Jumlah"].sum() == 5
+
+
+def test_dialek_di_cache_per_digest(tmp_path):
+    path = tmp_path / "kasus.csv"
+    path.write_text("a;b\n1;2\n", encoding="utf-8")
+    assert loader.sniff(str(path), digest="uji-loader").sep == ";"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    assert loader.sniff(str(path), digest="uji-loader").sep == ";"
+    assert loader.sniff(str(path)).sep == ","
+    loader._dialects.pop("uji-loader")
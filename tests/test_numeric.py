@@ -0,0 +1,36 @@
+# tests/test_numeric.py
+# to_number harus membaca format angka Indonesia dan Inggris dari teks.
+import numpy as np
+import pandas as pd
+
+from utils.numeric import is_numeric_like, to_number
+
+
+def test_pemisah_ribuan_dan_desimal_koma():
+    s = pd.Series(["1.234", "1,234", "1.234.567", "12,5", "1.234,5", "1,234.5", "-3"])
+    assert to_number(s).tolist() == [1234, 1234, 1234567, 12.5, 1234.5, 1234.5, -3]
+
+
+def test_bilangan_bulat_tetap_int64():
+    assert to_number(pd.Series(["1.234", " 7 "])).tolist() == [1234, 7]
+    assert to_number(pd.Series(["1.234", " 7 "])).dtype == np.int64
+    assert to_number(pd.Series(["12,5", "2"])).dtype == np.float64
+
+
+def test_kosong_jadi_nan():
+    out = to_number(pd.Series(["5", "", "   ", None], index=[3, 4, 5, 6], name="Jumlah"))
+    assert out.iloc[0] == 5 and out.iloc[1:].isna().all()
+    assert list(out.index) == [3, 4, 5, 6] and out.name == "Jumlah"
+
+
+def test_teks_campuran():
+    s = pd.Series(["12 kasus", "1.234"])
+    assert to_number(s).tolist() == [12, 1234]
+    assert np.isnan(to_number(s, ambil_angka=False).iloc[0])
+    assert is_numeric_like(pd.Series(["1.234", None, "5"]))
+    assert not is_numeric_like(s)
+
+
+def test_kolom_numerik_dikembalikan_apa_adanya():
+    s = pd.Series([1, 2, 3])
+    assert to_number(s) is s
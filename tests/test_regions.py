@@ -0,0 +1,44 @@
+# tests/test_regions.py
+# Nama wilayah dicocokkan ke kode BPS lewat nama baku dan alias; sisanya dicatat sekali.
+import logging
+
+import numpy as np
+import pandas as pd
+
+from utils.regions import KODE_NASIONAL, KODE_TIDAK_DIKENAL, REGISTRY, report_unmatched, with_codes
+
+
+def test_alias_dan_penulisan_berbeda():
+    s = pd.Series(["Jawa Barat", "JABAR", "dki  Jakarta", "  nanggroe  aceh darussalam ", "Kep. Riau", "NASIONAL"])
+    assert REGISTRY.encode(s).tolist() == [32, 32, 31, 11, 21, KODE_NASIONAL]
+    assert REGISTRY.encode(s).dtype == np.int16
+
+
+def test_nama_tidak_dikenal_dan_kosong(caplog):
+    s = pd.Series(["ATLANTIS", "BALI", None, "ATLANTIS"])
+    with caplog.at_level(logging.WARNING, logger="utils.regions"):
+        kode = REGISTRY.encode(s, sumber="uji-regions")
+        REGISTRY.encode(s, sumber="uji-regions")
+    assert kode.tolist() == [KODE_TIDAK_DIKENAL, 51, KODE_TIDAK_DIKENAL, KODE_TIDAK_DIKENAL]
+    assert REGISTRY.unmatched("uji-regions") == ["ATLANTIS"]
+    # dicatat sekali per (sumber, nama), bukan per baris atau per panggilan
+    assert sum("ATLANTIS" in r.getMessage() for r in caplog.records) == 1
+
+
+def test_kategori_sama_dengan_object():
+    s = pd.Series(["BALI", "SUMUT", "BALI", None, "ATLANTIS"])
+    assert REGISTRY.encode(s.astype("category")).tolist() == REGISTRY.encode(s).tolist()
+
+
+def test_with_codes_membuang_baris_nasional():
+    df = pd.DataFrame({"Provinsi": ["INDONESIA", "BALI", "Papua Selatan"], "Jumlah": [10, 4, 6]})
+    out = with_codes(df, "Provinsi")
+    assert out["Kode"].tolist() == [51, 93]
+    assert REGISTRY.names(out["Kode"]).tolist() == ["BALI", "PAPUA SELATAN"]
+    assert len(with_codes(df, "Provinsi", drop_nasional=False)) == 3
+
+
+def test_report_unmatched_dari_artefak():
+    df = pd.DataFrame({"Provinsi": ["BALI", "LEMURIA"], "Kode": [51, KODE_TIDAK_DIKENAL]})
+    report_unmatched(df, "Provinsi", sumber="uji-artefak")
+    assert REGISTRY.unmatched("uji-artefak") == ["LEMURIA"]
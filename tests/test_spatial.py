@@ -0,0 +1,63 @@
+# tests/test_spatial.py
+# SpatialIndex (STR-tree + ray casting) dibandingkan dengan uji semua polygon satu per satu.
+import json
+import os
+
+import numpy as np
+import pytest
+from matplotlib.path import Path
+
+from utils.spatial import SpatialIndex
+
+GEOJSON = "indonesia-provinsi.json"
+
+
+def _brute_force(geojson, lon, lat):
+    """Himpunan posisi feature yang memuat titik (tanpa indeks, matplotlib Path)."""
+    kena = set()
+    for i, f in enumerate(geojson["features"]):
+        g = f["geometry"]
+        for poly in g["coordinates"] if g["type"] == "MultiPolygon" else [g["coordinates"]]:
+            luar, *lubang = [np.asarray(r)[:, :2] for r in poly]
+            if Path(luar).contains_point((lon, lat)) and not any(Path(h).contains_point((lon, lat)) for h in lubang):
+                kena.add(i)
+    return kena
+
+
+def _cek(geojson, titik):
+    idx = SpatialIndex(geojson)
+    for lon, lat in titik:
+        harapan = _brute_force(geojson, lon, lat)
+        hasil = idx.lookup(lon, lat)
+        if harapan:
+            assert hasil in harapan, (lon, lat)
+        else:
+            assert hasil == -1, (lon, lat)
+
+
+def test_lookup_dua_provinsi(geojson_dua):
+    geojson = geojson_dua
+    rng = np.random.default_rng(1)
+    _cek(geojson, np.column_stack([rng.uniform(105, 115, 500), rng.uniform(-7, -1, 500)]))
+    idx = SpatialIndex(geojson)
+    assert idx.key_at(107.0, -4.0) == 31 and idx.key_at(113.0, -4.0) == 32
+    assert idx.key_at(120.0, -4.0) is None
+
+
+@pytest.mark.skipif(not os.path.exists(GEOJSON), reason="file batas provinsi tidak ada")
+def test_lookup_provinsi_indonesia():
+    with open(GEOJSON, encoding="utf-8") as fh:
+        geojson = json.load(fh)
+    rng = np.random.default_rng(0)
+    _cek(geojson, np.column_stack([rng.uniform(95, 141, 400), rng.uniform(-11, 6, 400)]))
+
+
+@pytest.mark.skipif(not os.path.exists(GEOJSON), reason="file batas provinsi tidak ada")
+def test_in_view_sama_dengan_bbox():
+    with open(GEOJSON, encoding="utf-8") as fh:
+        geojson = json.load(fh)
+    idx = SpatialIndex(geojson)
+    west, south, east, north = 105.0, -8.0, 112.0, -5.0
+    b = idx.part_boxes
+    kena = (b[:, 0] <= east) & (b[:, 2] >= west) & (b[:, 1] <= north) & (b[:, 3] >= south)
+    np.testing.assert_array_equal(idx.in_view(west, south, east, north), np.unique(idx.part_feature[kena]))
@@ -0,0 +1,40 @@
+# tests/test_streaming.py
+# Store partisi dari CSV yang dibaca bertahap harus sama dengan yang dibaca sekaligus.
+import pandas as pd
+
+from utils import partitions, streaming
+from utils.ingest import file_hash
+from utils.matrix import CaseMatrix
+
+
+def _matrix(folder, monkeypatch, threshold):
+    # data level kasus: banyak baris mentah jatuh ke sel Provinsi x Jenis yang sama
+    folder.mkdir()
+    path = str(folder / "kasus.csv")
+    pd.DataFrame({
+        "Tahun": 2024,
+        "Provinsi": ["ACEH", "BALI", "ACEH", "PAPUA", "BALI", "ACEH"] * 5,
+        "Fisik": 1,
+        "Psikis": 2,
+    }).to_csv(path, index=False)
+
+    monkeypatch.setattr(streaming, "STREAM_THRESHOLD", threshold)
+    monkeypatch.setattr(streaming, "CHUNK_ROWS", 7)
+    digest = file_hash(path)
+    partitions.build(path, digest)
+    cells = partitions.load_cells(path, digest)
+    return CaseMatrix.from_long(cells[cells["Tahun"] == 2024], count_col="Baris")
+
+
+def test_jumlah_baris_sama_saat_streaming(tmp_path, monkeypatch):
+    biasa = _matrix(tmp_path / "biasa", monkeypatch, 1 << 40)
+    bertahap = _matrix(tmp_path / "bertahap", monkeypatch, 0)
+    assert bertahap.grand_total == biasa.grand_total == 90
+    assert bertahap.n_entri == biasa.n_entri == 60
+
+
+def test_ringkasan_progres_memuat_provinsi_teratas():
+    agg = streaming.RunningAggregate()
+    agg.update(pd.DataFrame({"Provinsi": ["ACEH", "BALI", "ACEH"], "Jenis": "Fisik", "Jumlah": [5, 2, 4], "Tahun": 2024}))
+    agg.update(pd.DataFrame({"Provinsi": ["BALI"], "Jenis": "Psikis", "Jumlah": [1], "Tahun": 2024}))
+    assert agg.summary(n=2) == "12 kasus dari 4 baris · teratas: ACEH (9), BALI (3)"
@@ -0,0 +1,23 @@
+# tests/test_synthetic.py
+import numpy as np
+
+from utils.synthetic import generate
+
+
+def test_lebih_dari_256_wilayah():
+    # mis. data level kabupaten/kota (514 wilayah): kode tidak boleh terpotong ke uint8
+    nama = [f"WILAYAH {i}" for i in range(514)]
+    bobot = np.zeros(len(nama))
+    bobot[[0, 300, 513]] = [0.2, 0.3, 0.5]
+    korban, _ = generate(20_000, seed=1, provinsi=(nama, bobot))
+    hitung = korban["Provinsi"].value_counts()
+    assert set(hitung[hitung > 0].index) == {"WILAYAH 0", "WILAYAH 300", "WILAYAH 513"}
+    assert abs(hitung["WILAYAH 513"] / len(korban) - 0.5) < 0.02
+
+
+def test_hasil_sama_per_seed():
+    provinsi = (["ACEH", "BALI"], np.array([0.5, 0.5]))
+    a = generate(1_000, seed=7, provinsi=provinsi)
+    b = generate(1_000, seed=7, provinsi=provinsi)
+    for x, y in zip(a, b):
+        assert x.equals(y)
@@ -0,0 +1,132 @@
+# tests/test_tiles.py
+# Tile hasil build di-decode ulang dengan decoder protobuf kecil (tanpa dependensi).
+import os
+
+import numpy as np
+
+from utils import tiles
+from utils.ingest import file_hash
+
+
+def _varint(buf, i):
+    n = shift = 0
+    while True:
+        b = buf[i]
+        n |= (b & 0x7F) << shift
+        i += 1
+        if not b & 0x80:
+            return n, i
+        shift += 7
+
+
+def _fields(buf):
+    i = 0
+    while i < len(buf):
+        kunci, i = _varint(buf, i)
+        nomor, wire = kunci >> 3, kunci & 7
+        if wire == 0:
+            isi, i = _varint(buf, i)
+        else:
+            n, i = _varint(buf, i)
+            isi, i = buf[i:i + n], i + n
+        yield nomor, isi
+
+
+def _packed(buf):
+    i, out = 0, []
+    while i < len(buf):
+        v, i = _varint(buf, i)
+        out.append(v)
+    return out
+
+
+def _unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+
+def _rings(cmd):
+    rings, x, y, i = [], 0, 0, 0
+    while i < len(cmd):
+        op, n = cmd[i] & 7, cmd[i] >> 3
+        i += 1
+        if op == 7:
+            continue
+        for _ in range(n):
+            x += _unzigzag(cmd[i])
+            y += _unzigzag(cmd[i + 1])
+            i += 2
+            if op == 1:
+                rings.append([])
+            rings[-1].append((x, y))
+    return [np.array(r) for r in rings]
+
+
+def decode(data):
+    """{layer: {"extent": int, "features": [(id, props, rings), ...]}} dari bytes MVT."""
+    hasil = {}
+    for nomor, layer in _fields(data):
+        assert nomor == 3
+        nama, extent, keys, values, raw = None, None, [], [], []
+        for f, isi in _fields(layer):
+            if f == 1:
+                nama = isi.decode()
+            elif f == 2:
+                raw.append(isi)
+            elif f == 3:
+                keys.append(isi.decode())
+            elif f == 4:
+                (vf, v), = _fields(isi)
+                values.append(v.decode() if vf == 1 else v)
+            elif f == 5:
+                extent = isi
+        fitur = []
+        for isi in raw:
+            d = dict(_fields(isi))
+            tags = _packed(d.get(2, b""))
+            props = {keys[k]: values[v] for k, v in zip(tags[::2], tags[1::2])}
+            assert d[3] == 3  # POLYGON
+            fitur.append((d[1], props, _rings(_packed(d[4]))))
+        hasil[nama] = {"extent": extent, "features": fitur}
+    return hasil
+
+
+def test_encode_decode():
+    ring = np.array([[0, 0], [10, 0], [10, 10], [0, 10]])
+    data = tiles.encode_tile("uji", [(7, {"KODE_PROV": "31", "n": 5}, [ring])])
+    layer = decode(data)["uji"]
+    assert layer["extent"] == tiles.EXTENT
+    (fid, props, rings), = layer["features"]
+    assert fid == 7 and props == {"KODE_PROV": "31", "n": 5}
+    np.testing.assert_array_equal(rings[0], ring)
+
+
+def test_tile_hasil_build(geojson_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, "STATIC_DIR", str(tmp_path / "static"))
+    monkeypatch.setattr(tiles, "TILES_DIR", str(tmp_path / "static" / "tiles"))
+    ringkasan = tiles.build(geojson_path, minzoom=4, maxzoom=6)
+    assert [r["zoom"] for r in ringkasan] == [4, 5, 6]
+    folder = tiles.tile_dir(tiles.LAYER_PROVINSI, file_hash(geojson_path))
+
+    # z6: lon 110 / lat -4 jatuh di tile (51, 32); kedua provinsi ada di sana
+    layer = decode(tiles.read_tile(folder, 6, 51, 32))[tiles.LAYER_PROVINSI]
+    props = sorted(p["PROVINSI"] for _, p, _ in layer["features"])
+    assert props == ["A", "B"]
+    for _, _, rings in layer["features"]:
+        for r in rings:
+            assert len(r) >= 3
+            assert r.min() >= -tiles.BUFFER and r.max() <= tiles.EXTENT + tiles.BUFFER
+            assert tiles._area(r) > 0  # ring luar, orientasi MVT
+
+    # tile di luar data tidak disimpan
+    assert tiles.read_tile(folder, 6, 0, 0) is None
+
+
+def test_url_dari_origin_streamlit(geojson_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, "STATIC_DIR", str(tmp_path / "static"))
+    monkeypatch.setattr(tiles, "TILES_DIR", str(tmp_path / "static" / "tiles"))
+    digest = file_hash(geojson_path)
+    url = tiles.url(tiles.LAYER_PROVINSI, geojson_path)
+    versi = os.path.basename(tiles.tile_dir(tiles.LAYER_PROVINSI, digest))
+    assert url == f"/app/static/tiles/{tiles.LAYER_PROVINSI}/{versi}/{{z}}/{{x}}/{{y}}.pbf?v={digest[:12]}"
+    # folder build sementara tidak tertinggal
+    assert os.listdir(tmp_path / "static" / "tiles" / tiles.LAYER_PROVINSI) == [versi]
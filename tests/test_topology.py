@@ -0,0 +1,58 @@
+# tests/test_topology.py
+import os
+
+import numpy as np
+
+from utils import topology
+
+
+def _titik(rings):
+    return {tuple(p) for r in rings for p in np.round(r, 9).tolist()}
+
+
+def test_batas_bersama_disimpan_sekali(geojson_path):
+    topology.build(geojson_path)
+    for nama, _ in topology.LEVELS:
+        topo = topology.load_level(geojson_path, nama)
+        a, b = (g["arcs"] for g in topo["objects"][topology.OBJEK]["geometries"])
+        arc_a = {i if i >= 0 else ~i for poly in a for ring in poly for i in ring}
+        arc_b = {i if i >= 0 else ~i for poly in b for ring in poly for i in ring}
+        # batas bersama = satu arc yang dipakai kedua provinsi (arah berlawanan)
+        assert len(arc_a & arc_b) == 1
+
+
+def test_penyederhanaan_tidak_membuat_celah(geojson_path):
+    topology.build(geojson_path)
+    penuh = topology.load_level(geojson_path, "penuh")
+    kasar = topology.load_level(geojson_path, "kasar")
+    assert sum(map(len, kasar["arcs"])) < sum(map(len, penuh["arcs"]))
+
+    (_, poly_a), (_, poly_b) = topology.features(kasar)
+    bersama = _titik(poly_a[0]) & _titik(poly_b[0])
+    # titik batas di kedua sisi identik: ujung batas + titik yang tersisa setelah penyederhanaan
+    assert len(bersama) > 2
+    tol = dict(topology.LEVELS)["kasar"]
+    pts = np.array(sorted(bersama))
+    assert np.all(np.abs(pts[:, 0] - 110.0) < 0.05 + tol)
+    # ujung batas (junction) tetap ada, hanya bergeser ke grid level
+    for ujung in [(110.0, -6.0), (110.0, -2.0)]:
+        assert np.hypot(*(pts - ujung).T).min() < tol
+
+
+def test_level_ditulis_atomik_tanpa_sisa(geojson_path):
+    topology.build(geojson_path)
+    isi = sorted(os.listdir(topology.store_dir(geojson_path)))
+    assert isi == sorted(f"{nama}.topo.json" for nama, _ in topology.LEVELS)
+
+
+def test_disk_read_only_dibangun_di_memori(geojson_path, monkeypatch):
+    def gagal(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(topology.artifacts, "temp_path", gagal)
+    topo = topology.load_level(geojson_path, "kasar")
+    assert topo["type"] == "Topology"
+    assert not os.path.exists(topology.store_dir(geojson_path))
+    # level lain diambil dari memori, tidak dibangun ulang
+    monkeypatch.setattr(topology, "_build", None)
+    assert topology.load_level(geojson_path, "penuh")["type"] == "Topology"
@@ -0,0 +1,51 @@
+# tests/test_uploads.py
+import os
+import time
+
+import pytest
+
+from utils import artifacts, partitions, uploads
+
+
+def _csv(provinsi):
+    return f"Tahun,Provinsi,Fisik\n2024,{provinsi},3\n".encode()
+
+
+def _tunggu(job):
+    for _ in range(200):
+        if job.done:
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"job {job.name} tidak selesai")
+
+
+@pytest.fixture
+def bersih(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", str(tmp_path / ".uploads"))
+    jobs, lock = uploads._jobs()
+    with lock:
+        jobs.clear()
+    yield jobs
+
+
+def _files(job):
+    return [job.path, artifacts.artifact_path(job.path), partitions.store_dir(job.path)]
+
+
+def test_job_lama_dibuang_bersama_filenya(bersih, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_JOBS", 1)
+    lama = _tunggu(uploads.submit("a.csv", _csv("ACEH")))
+    assert lama.status == "selesai" and all(os.path.exists(f) for f in _files(lama))
+
+    baru = _tunggu(uploads.submit("b.csv", _csv("BALI")))
+    assert uploads.get(lama.digest) is None
+    assert not any(os.path.exists(f) for f in _files(lama))
+    assert uploads.get(baru.digest) is baru and os.path.exists(baru.path)
+
+
+def test_job_kedaluwarsa(bersih, monkeypatch):
+    job = _tunggu(uploads.submit("a.csv", _csv("ACEH")))
+    assert uploads.get(job.digest) is job
+    monkeypatch.setattr(uploads, "JOB_TTL", -1)
+    assert uploads.get(job.digest) is None
+    assert not os.path.exists(job.path)
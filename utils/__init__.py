@@ -0,0 +1 @@
+# utils/ — modul bantu yang dipakai bersama oleh halaman-halaman di pages/
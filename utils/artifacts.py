@@ -0,0 +1,147 @@
+# utils/artifacts.py
+# Artefak kolumnar (Arrow IPC / Feather v2, tanpa kompresi) yang disimpan di
+# sebelah file CSV sumber, mis. data_sebaran_kasus.csv -> data_sebaran_kasus.arrow.
+#
+# Artefak sudah bertipe: kolom teks berulang (Provinsi, Jenis, ...) sebagai
+# category, angka sebagai integer. File dibuka lewat memory map, jadi tidak ada
+# parse teks dan halaman OS bisa dipakai bersama antar proses. Metadata
+# menyimpan SHA-256 file sumber; kalau CSV berubah artefak dianggap basi dan
+# pemanggil kembali ke CSV (lalu menulis artefak baru).
+#
+# Konversi manual semua dataset:  python -m utils.artifacts
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+EKSTENSI = ".arrow"
+META_DIGEST = b"source_sha256"
+META_EXTRA = b"extra"
+META_VERSION = b"format_version"
+# naikkan kalau cara membangun artefak berubah, supaya artefak lama dianggap basi
+FORMAT_VERSION = "5"
+
+
+def artifact_path(source_path):
+    return os.path.splitext(source_path)[0] + EKSTENSI
+
+
+def _int_if_possible(s):
+    # int32 kalau muat (int64 kalau tidak); kalau ada NaN biarkan float
+    if s.isna().any():
+        return s
+    s = pd.to_numeric(s)
+    if len(s) == 0 or (s.min() >= np.iinfo(np.int32).min and s.max() <= np.iinfo(np.int32).max):
+        return s.astype(np.int32)
+    return s.astype(np.int64)
+
+
+def compact(df, category_cols=(), int_cols=()):
+    """Salinan df dengan kolom category / integer yang ringkas."""
+    out = df.copy()
+    for c in category_cols:
+        if c in out.columns:
+            out[c] = out[c].astype("category")
+    for c in int_cols:
+        if c in out.columns:
+            out[c] = _int_if_possible(out[c])
+    return out
+
+
+def write(df, path, digest, extra=None):
+    """Tulis df sebagai file Arrow IPC di `path`. Gagal tulis (mis. disk read-only) diabaikan."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[META_DIGEST] = digest.encode()
+    meta[META_EXTRA] = json.dumps(extra or {}).encode()
+    meta[META_VERSION] = FORMAT_VERSION.encode()
+    table = table.replace_schema_metadata(meta)
+
+    tmp = None
+    try:
+        tmp = temp_path(path)
+        with pa.OSFile(tmp, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    return path
+
+
+def temp_path(path):
+    """File sementara unik di direktori `path` (penulis bersamaan tidak saling menimpa).
+
+    Tulis ke file ini lalu os.replace(tmp, path): pembaca hanya melihat file lama
+    atau file baru yang lengkap.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp
+
+
+def write_json(obj, path):
+    """Tulis obj sebagai JSON di `path` secara atomik; gagal tulis diabaikan (None)."""
+    tmp = None
+    try:
+        tmp = temp_path(path)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(obj, fh)
+        os.replace(tmp, path)
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    return path
+
+
+def read(path, digest):
+    """(DataFrame, extra) dari file Arrow di `path` kalau digest cocok, atau None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            reader = ipc.open_file(source)
+            meta = reader.schema.metadata or {}
+            if meta.get(META_DIGEST) != digest.encode() or meta.get(META_VERSION) != FORMAT_VERSION.encode():
+                return None
+            table = reader.read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    # split_blocks: kolom numerik tidak digabung ke satu blok 2-D (hindari salinan)
+    df = table.to_pandas(split_blocks=True)
+    return df, json.loads(meta.get(META_EXTRA, b"{}"))
+
+
+def save(df, source_path, digest, extra=None):
+    """Tulis artefak untuk file sumber `source_path`."""
+    return write(df, artifact_path(source_path), digest, extra)
+
+
+def load(source_path, digest):
+    """(DataFrame, extra) dari artefak yang masih segar, atau None kalau tidak ada / basi."""
+    return read(artifact_path(source_path), digest)
+
+
+def main():
+    from utils.datasets import SUMBER, build
+    from utils.ingest import file_hash
+
+    for name, kandidat in SUMBER.items():
+        for src in kandidat:
+            if not os.path.exists(src):
+                continue
+            build(name, src, file_hash(src))
+            print(f"{src} -> {artifact_path(src)}")
+            break
+
+
+if __name__ == "__main__":
+    main()
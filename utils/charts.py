@@ -0,0 +1,114 @@
+# utils/charts.py
+# Spec Vega-Lite gabungan untuk halaman peta (page4_peta.py).
+#
+# Dulu tiga chart Altair (bar kasus, bar korban, pie) dibuat ulang tiap rerun
+# dan masing-masing membawa salinan data sendiri. Sekarang:
+# - satu spec gabungan (vconcat) yang semua view-nya mengacu ke SATU dataset
+#   bernama ("sebaran"), jadi data dikirim sekali berapa pun jumlah chart;
+# - top-10 untuk pie dihitung di Vega-Lite (window rank) dari dataset yang sama;
+# - view saling terhubung lewat parameter Vega-Lite: klik provinsi menyorot
+#   provinsi itu di semua chart dan memfilter tabel, slider Top-N memfilter
+#   semua view. Semuanya terjadi di browser; server hanya terlibat kalau
+#   dataset berubah (versi data baru = spec baru);
+# - spec + dataset (sudah diserialisasi ke Arrow IPC) di-cache per versi data,
+#   jadi rerun tidak membangun objek Altair atau menserialisasi data lagi.
+import json
+
+import altair as alt
+import pyarrow as pa
+import streamlit as st
+
+DATASET = "sebaran"
+
+
+def arrow_bytes(df):
+    """Bytes Arrow IPC stream dari DataFrame (format dataset st.vega_lite_chart)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _sebaran_spec(tabel, prov_col, kasus, korban):
+    data = alt.NamedData(DATASET)
+    n = len(tabel)
+
+    # parameter di browser: klik provinsi (shift+klik = lebih dari satu) dan batas Top-N;
+    # sorot & filter dijalankan Vega-Lite di klien, tanpa rerun script
+    pilih = alt.selection_point(name="pilih", fields=[prov_col])
+    top_n = alt.param(
+        name="top_n",
+        value=n,
+        bind=alt.binding_range(min=1, max=max(n, 1), step=1, name="Top-N provinsi (menurut kasus) "),
+    )
+
+    def base(title):
+        return alt.Chart(data, title=title).transform_window(
+            peringkat="row_number()", sort=[alt.SortField(kasus, order="descending")]
+        ).transform_filter("datum.peringkat <= top_n")
+
+    # field ditulis eksplisit: nama kolom seperti "Jumlah Kasus (Kasus)" tidak boleh dibaca sebagai shorthand
+    sumbu_prov = alt.X(field=prov_col, type="nominal", sort=alt.EncodingSortField(field=kasus, order="descending"), title="Provinsi")
+    tip = [alt.Tooltip(field=prov_col, type="nominal"), alt.Tooltip(field=kasus, type="quantitative", format=",")]
+    sorot = alt.condition(pilih, alt.value(1.0), alt.value(0.3))
+
+    bar_kasus = base("Jumlah Kasus per Provinsi").mark_bar().encode(
+        x=sumbu_prov,
+        y=alt.Y(field=kasus, type="quantitative", title="Jumlah Kasus"),
+        opacity=sorot,
+        tooltip=tip,
+    ).add_params(pilih).properties(height=350)
+
+    bar_korban = base("Jumlah Korban per Provinsi").mark_bar(color="salmon").encode(
+        x=sumbu_prov,
+        y=alt.Y(field=korban, type="quantitative", title="Jumlah Korban"),
+        opacity=sorot,
+        tooltip=[tip[0], alt.Tooltip(field=korban, type="quantitative", format=",")],
+    ).add_params(pilih).properties(height=350)
+
+    pie = base("10 Provinsi dengan Kasus Tertinggi").transform_filter(
+        alt.datum.peringkat <= 10
+    ).mark_arc().encode(
+        theta=alt.Theta(field=kasus, type="quantitative"),
+        color=alt.Color(field=prov_col, type="nominal", legend=None),
+        opacity=sorot,
+        tooltip=tip,
+    ).add_params(pilih).properties(width=300, height=300)
+
+    # tabel (mark text): hanya provinsi terpilih, atau semua kalau belum ada yang dipilih
+    def kolom(field, judul, fmt=None):
+        teks = alt.Text(field=field, type="quantitative", format=fmt) if fmt else alt.Text(field=field, type="nominal")
+        return base(None).transform_filter(pilih).mark_text(align="left").encode(
+            y=alt.Y(field="peringkat", type="ordinal", axis=None),
+            text=teks,
+        ).properties(title=judul, width=170 if fmt is None else 90)
+
+    tabel_linked = alt.hconcat(
+        kolom("peringkat", "#", "d").properties(width=30),
+        kolom(prov_col, "Provinsi"),
+        kolom(kasus, "Kasus", ","),
+        kolom(korban, "Korban", ","),
+        spacing=4,
+    )
+
+    spec = alt.vconcat(
+        bar_kasus, bar_korban, alt.hconcat(pie, tabel_linked, spacing=40)
+    ).add_params(top_n).resolve_scale(color="independent").to_dict()
+    spec["datasets"] = {DATASET: arrow_bytes(tabel[[prov_col, kasus, korban]])}
+    return spec
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cached_spec(data_versi, prov_col, kasus, korban, _tabel):
+    spec = _sebaran_spec(_tabel, prov_col, kasus, korban)
+    ukuran = {
+        "spec (KB)": round(len(json.dumps({k: v for k, v in spec.items() if k != "datasets"})) / 1024, 1),
+        "dataset Arrow (KB)": round(len(spec["datasets"][DATASET]) / 1024, 1),
+    }
+    return spec, ukuran
+
+
+def sebaran_spec(data_versi, tabel, prov_col, kasus, korban):
+    """(spec Vega-Lite gabungan, info ukuran payload), di-cache per versi data sebaran."""
+    return _cached_spec(data_versi, prov_col, kasus, korban, tabel)
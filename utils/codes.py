@@ -0,0 +1,71 @@
+# utils/codes.py
+# Operasi atas kolom berkode: kategori (kode int8 + kamus bersama) dan
+# bilangan kecil (uint8, mis. usia).
+#
+# value_counts() menghitung langsung dari kode dengan satu np.bincount, bukan
+# hashing tiap nilai seperti Series.value_counts(); memory_report() menunjukkan
+# berapa byte yang dihemat dibanding representasi lama (string object /
+# int64), diestimasi dari hitungan kode tanpa membuat kolom lama itu.
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+def _is_kode_kecil(s):
+    return pd.api.types.is_unsigned_integer_dtype(s.dtype) and s.dtype.itemsize <= 2
+
+
+def value_counts(s, sort=True):
+    """Seperti Series.value_counts() (tanpa NaN), dihitung dengan np.bincount atas kode.
+
+    sort=False: urut menurut kategori / nilai (setara value_counts().sort_index()).
+    Kolom yang bukan kategori / unsigned int kecil memakai value_counts() biasa.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        kode = s.cat.codes.to_numpy()
+        m = len(s.cat.categories)
+        if kode.dtype.itemsize <= 2:
+            # kode int8/int16 dibaca sebagai unsigned (tanpa salinan): NaN (-1) jatuh di luar [0, m)
+            hitung = np.bincount(kode.view(kode.dtype.str.replace("i", "u")), minlength=m)[:m]
+        else:
+            hitung = np.bincount(kode[kode >= 0], minlength=m)
+        hasil = pd.Series(hitung, index=pd.CategoricalIndex(s.cat.categories, dtype=s.dtype, name=s.name), name="count")
+    elif _is_kode_kecil(s):
+        hitung = np.bincount(s.to_numpy())
+        ada = np.flatnonzero(hitung)
+        hasil = pd.Series(hitung[ada], index=pd.Index(ada.astype(s.dtype), name=s.name), name="count")
+    else:
+        hasil = s.value_counts()
+        return hasil if sort else hasil.sort_index()
+    if sort:
+        return hasil.iloc[np.argsort(-hasil.to_numpy(), kind="stable")]
+    return hasil
+
+
+def _bytes_lama(s):
+    # estimasi memori kolom sebagai object (pointer + objek str per baris) atau int64
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        hitung = value_counts(s, sort=False).to_numpy()
+        ukuran = np.array([sys.getsizeof(str(c)) for c in s.cat.categories])
+        return int(len(s) * 8 + (hitung * ukuran).sum())
+    if pd.api.types.is_integer_dtype(s.dtype):
+        return len(s) * 8
+    return int(s.memory_usage(deep=True, index=False))
+
+
+def memory_report(df):
+    """DataFrame per kolom: dtype, bytes sekarang, estimasi bytes sebagai object/int64."""
+    baris = []
+    for kolom in df.columns:
+        s = df[kolom]
+        sekarang = int(s.memory_usage(deep=True, index=False))
+        lama = _bytes_lama(s)
+        baris.append({
+            "Kolom": kolom,
+            "dtype": str(s.cat.codes.dtype) + " + kamus" if isinstance(s.dtype, pd.CategoricalDtype) else str(s.dtype),
+            "Bytes": sekarang,
+            "Bytes (object / int64)": lama,
+            "Hemat": f"{lama / sekarang:,.1f}×" if sekarang else "-",
+        })
+    return pd.DataFrame(baris)
@@ -0,0 +1,175 @@
+# utils/crosstab.py
+# Tabulasi silang kasus korban x pelaku yang saling terhubung.
+#
+# Kasus sintetis (utils/synthetic.py) digabung per "ID Kasus" jadi satu model
+# kasus, lalu tiap atribut dipetakan ke kode kecil (kategori -> kode int8,
+# usia uint8 -> kelompok umur lewat lookup table). Semua kode dirangkai jadi
+# satu indeks datar dan dihitung dengan SATU np.bincount -> array hitungan
+# padat berdimensi (mis. 4 x 6 x 38 x 2 x 4 = 7.296 sel), dibangun sekali
+# per dataset.
+#
+# Filter dan pilihan baris / kolom setelah itu hanya slicing + sum di array
+# kecil itu (tidak ada groupby / lintasan data per rerun), dan hasil tabel
+# di-memo per kombinasi (baris, kolom, filter).
+from collections import namedtuple
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.histogram import BANDS_USIA, MAX_USIA
+from utils.synthetic import data_version, dataset
+
+Dimension = namedtuple("Dimension", ["name", "codes", "labels"])
+
+DIM_USIA_KORBAN = "Kelompok umur korban"
+DIM_RELASI = "Relasi pelaku"
+DIM_PROVINSI = "Provinsi"
+DIM_JK_PELAKU = "Jenis kelamin pelaku"
+DIM_USIA_PELAKU = "Kelompok umur pelaku"
+TANPA_KOLOM = "(tanpa kolom)"
+
+
+def band_codes(usia, bands=BANDS_USIA):
+    """Kode kelompok umur (uint8) untuk array usia, lewat lookup table 0..MAX_USIA."""
+    edges = np.asarray(bands.edges)
+    lut = np.repeat(np.arange(len(edges), dtype=np.uint8), np.diff(np.append(edges, MAX_USIA + 1)))
+    lut = np.concatenate([np.zeros(edges[0], dtype=np.uint8), lut])  # usia < batas pertama ikut kelompok pertama
+    return lut[np.clip(np.asarray(usia), 0, MAX_USIA)]
+
+
+def _kategori(name, s):
+    return Dimension(name, s.cat.codes.to_numpy(), list(s.cat.categories))
+
+
+def case_dimensions(data, bands=BANDS_USIA):
+    """Dimensi model kasus dari Synthetic(korban, pelaku), digabung per ID Kasus."""
+    korban, pelaku = data
+    if np.array_equal(korban["ID Kasus"].to_numpy(), pelaku["ID Kasus"].to_numpy()):
+        pos = slice(None)
+    else:
+        # urutan berbeda: posisi baris pelaku untuk tiap ID kasus korban
+        urut = np.argsort(pelaku["ID Kasus"].to_numpy(), kind="stable")
+        pos = urut[np.searchsorted(pelaku["ID Kasus"].to_numpy(), korban["ID Kasus"].to_numpy(), sorter=urut)]
+    pelaku = pelaku.iloc[pos] if not isinstance(pos, slice) else pelaku
+    return [
+        Dimension(DIM_USIA_KORBAN, band_codes(korban["Usia"].to_numpy(), bands), list(bands.labels)),
+        _kategori(DIM_RELASI, korban["Relasi Pelaku"]),
+        _kategori(DIM_PROVINSI, korban["Provinsi"]),
+        _kategori(DIM_JK_PELAKU, pelaku["Jenis Kelamin"]),
+        Dimension(DIM_USIA_PELAKU, band_codes(pelaku["Usia"].to_numpy(), bands), list(bands.labels)),
+    ]
+
+
+class CrossTab:
+    """Array hitungan padat atas beberapa dimensi kode; dibangun dengan satu np.bincount."""
+
+    def __init__(self, counts, names, labels):
+        self.counts = counts
+        self.names = list(names)
+        self.labels = [list(x) for x in labels]
+
+    @classmethod
+    def build(cls, dims):
+        shape = tuple(len(d.labels) for d in dims)
+        flat = np.zeros(len(dims[0].codes), dtype=np.int64)
+        valid = np.ones(len(flat), dtype=bool)
+        for d, k in zip(dims, shape):
+            kode = d.codes.astype(np.int64)
+            valid &= (kode >= 0) & (kode < k)
+            flat = flat * k + kode
+        counts = np.bincount(flat[valid], minlength=int(np.prod(shape))).reshape(shape)
+        return cls(counts, [d.name for d in dims], [d.labels for d in dims])
+
+    def select(self, filters):
+        """CrossTab dengan dimensi difilter: {nama dimensi: [label, ...]} (kosong = semua)."""
+        counts = self.counts
+        labels = list(self.labels)
+        for nama, pilih in filters.items():
+            if not pilih:
+                continue
+            ax = self.names.index(nama)
+            idx = [labels[ax].index(p) for p in pilih]
+            counts = np.take(counts, idx, axis=ax)
+            labels[ax] = [labels[ax][i] for i in idx]
+        return CrossTab(counts, self.names, labels)
+
+    def table(self, rows, cols=None):
+        """DataFrame rows x cols (dimensi lain dijumlahkan); cols=None -> Series."""
+        keep = [self.names.index(rows)] + ([self.names.index(cols)] if cols else [])
+        lain = tuple(i for i in range(len(self.names)) if i not in keep)
+        sub = self.counts.sum(axis=lain)
+        if keep != sorted(keep):
+            sub = sub.T
+        index = pd.Index(self.labels[keep[0]], name=rows)
+        if cols is None:
+            return pd.Series(sub, index=index, name="Jumlah kasus")
+        return pd.DataFrame(sub, index=index, columns=pd.Index(self.labels[keep[1]], name=cols))
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cube(seed, n, bands, digest):
+    # `digest` = versi data kekerasan, sama dengan kunci synthetic._dataset
+    return CrossTab.build(case_dimensions(dataset(n, seed), bands))
+
+
+def cube(n, seed, bands=BANDS_USIA, digest=None):
+    """CrossTab semua dimensi model kasus untuk data sintetis (n, seed), dibangun sekali per versi data."""
+    return _cube(int(seed), int(n), bands, digest if digest is not None else data_version())
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _table(seed, n, bands, rows, cols, filters, digest):
+    return cube(n, seed, bands, digest).select(dict(filters)).table(rows, cols)
+
+
+def table(n, seed, rows, cols, filters=(), bands=BANDS_USIA, digest=None):
+    """Tabel rows x cols di-memo per (data, baris, kolom, filter); filters = {dimensi: [label]}."""
+    filters = tuple(sorted((k, tuple(v)) for k, v in dict(filters).items() if v))
+    digest = digest if digest is not None else data_version()
+    return _table(int(seed), int(n), bands, rows, cols, filters, digest)
+
+
+def heatmap(tabel):
+    """Heatmap Altair dari tabel rows x cols, urutan label mengikuti tabel."""
+    rows, cols = tabel.index.name, tabel.columns.name
+    long = tabel.stack().rename("Jumlah").reset_index()
+    dasar = alt.Chart(long).encode(
+        x=alt.X(field=cols, type="nominal", sort=list(tabel.columns), title=cols),
+        y=alt.Y(field=rows, type="nominal", sort=list(tabel.index), title=rows),
+    )
+    kotak = dasar.mark_rect().encode(
+        color=alt.Color(field="Jumlah", type="quantitative", scale=alt.Scale(scheme="reds"), title="Kasus"),
+        tooltip=[alt.Tooltip(field=rows, type="nominal"), alt.Tooltip(field=cols, type="nominal"), alt.Tooltip(field="Jumlah", type="quantitative", format=",")],
+    )
+    teks = dasar.mark_text(fontSize=10).encode(text=alt.Text(field="Jumlah", type="quantitative", format=","))
+    return (kotak + teks).properties(height=max(160, 22 * len(tabel.index)))
+
+
+def crosstab_view(n, seed, key, rows=DIM_USIA_KORBAN, cols=DIM_RELASI):
+    """Kontrol baris / kolom / filter + heatmap + tabel dari satu CrossTab."""
+    digest = data_version()
+    kubus = cube(n, seed, digest=digest)
+    c_baris, c_kolom = st.columns(2)
+    baris = c_baris.selectbox("Baris", kubus.names, index=kubus.names.index(rows), key=f"{key}_baris")
+    pilihan_kolom = [TANPA_KOLOM] + [d for d in kubus.names if d != baris]
+    kolom = c_kolom.selectbox(
+        "Kolom", pilihan_kolom, index=pilihan_kolom.index(cols) if cols in pilihan_kolom else 0, key=f"{key}_kolom"
+    )
+    kolom = None if kolom == TANPA_KOLOM else kolom
+
+    with st.expander("Filter"):
+        filters = {
+            d: st.multiselect(d, kubus.labels[kubus.names.index(d)], key=f"{key}_filter_{d}", placeholder="semua")
+            for d in kubus.names
+            if d not in (baris, kolom)
+        }
+
+    tabel = table(n, seed, baris, kolom, filters, digest=digest)
+    if kolom is None:
+        st.bar_chart(tabel, sort=False)
+    else:
+        st.altair_chart(heatmap(tabel), width="stretch")
+    st.dataframe(tabel, width="stretch")
+    st.caption(f"{int(tabel.to_numpy().sum()):,} kasus · dihitung dari array {' × '.join(map(str, kubus.counts.shape))} (sekali per dataset)")
@@ -0,0 +1,89 @@
+# utils/cube.py
+# Rollup cube: semua total dan urutan top-N dihitung SEKALI per versi data,
+# setelah itu metric / bar chart / tabel di halaman cukup lookup dict.
+#
+# Contoh (dims = Tahun, Provinsi, Jenis; measure = Jumlah):
+#   cube.total("Jumlah", Tahun=2024)                -> total kasus 2024
+#   cube.by("Provinsi", "Jumlah", Tahun=2024)       -> Series per provinsi, urut menurun
+#   cube.table("Provinsi", "Jumlah")                -> semua measure (+ labels), urut menurun
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+
+def _key(values):
+    # nilai numpy -> python, supaya lookup dengan int / str biasa selalu cocok
+    if not isinstance(values, tuple):
+        values = (values,)
+    return tuple(v.item() if isinstance(v, np.generic) else v for v in values)
+
+
+def _level(dims):
+    # level tunggal sebagai skalar (list 1 elemen membuat key tuple di pandas baru)
+    return dims[0] if len(dims) == 1 else list(dims)
+
+
+class RollupCube:
+    def __init__(self, cells, dims, measures, labels=None):
+        """`cells`: DataFrame dengan kolom dims + measures (boleh belum teragregasi).
+
+        `labels` = {dim: kolom}: kolom yang nilainya ditentukan oleh dim (mis. kode
+        wilayah per nama provinsi); ikut disimpan di setiap table(dim).
+        """
+        self.dims = tuple(dims)
+        self.measures = tuple(measures)
+        self.labels = dict(labels or {})
+        lookup = {dim: cells.groupby(dim, observed=True)[col].first() for dim, col in self.labels.items()}
+
+        base = cells.groupby(list(self.dims), observed=True)[list(self.measures)].sum()
+        self._totals = {}
+        self._tables = {}
+
+        # total untuk setiap kombinasi filter (termasuk tanpa filter)
+        for r in range(len(self.dims) + 1):
+            for fdims in combinations(self.dims, r):
+                if not fdims:
+                    self._totals[frozenset()] = base.sum()
+                    continue
+                for key, row in base.groupby(level=_level(fdims), observed=True).sum().iterrows():
+                    self._totals[frozenset(zip(fdims, _key(key)))] = row
+
+        # tabel terurut menurun per (dimensi, measure, filter)
+        for dim in self.dims:
+            others = [d for d in self.dims if d != dim]
+            for r in range(len(others) + 1):
+                for fdims in combinations(others, r):
+                    g = base.groupby(level=_level([dim, *fdims]), observed=True).sum()
+                    if fdims:
+                        groups = ((_key(k), sub.droplevel(list(fdims))) for k, sub in g.groupby(level=_level(fdims), observed=True))
+                    else:
+                        groups = [((), g)]
+                    for key, sub in groups:
+                        filt = frozenset(zip(fdims, key))
+                        if dim in lookup:
+                            sub = sub.assign(**{self.labels[dim]: lookup[dim].reindex(sub.index).to_numpy()})
+                        for m in self.measures:
+                            self._tables[(dim, m, filt)] = sub.sort_values(m, ascending=False, kind="stable")
+
+    def total(self, measure, **filters):
+        row = self._totals.get(frozenset(filters.items()))
+        return 0 if row is None else row[measure]
+
+    def table(self, dim, measure, **filters):
+        """DataFrame semua measure per `dim`, urut menurun menurut `measure`."""
+        t = self._tables.get((dim, measure, frozenset(filters.items())))
+        if t is None:
+            kolom = list(self.measures) + ([self.labels[dim]] if dim in self.labels else [])
+            return pd.DataFrame(columns=kolom, index=pd.Index([], name=dim))
+        return t
+
+    def by(self, dim, measure, **filters):
+        return self.table(dim, measure, **filters)[measure]
+
+    def argmax(self, dim, measure, **filters):
+        """(nilai dim, nilai measure) tertinggi, atau (None, 0) kalau kosong."""
+        s = self.by(dim, measure, **filters)
+        if s.empty:
+            return None, 0
+        return s.index[0], s.iloc[0]
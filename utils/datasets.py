@@ -0,0 +1,226 @@
+# utils/datasets.py
+# Registry dataset bersama: tiap dataset dimuat SEKALI per proses server
+# (st.cache_resource) dan dipakai bersama oleh semua sesi browser.
+#
+# Halaman mendapat view read-only lewat view(): shallow copy tanpa menyalin
+# data. Dengan copy-on-write aktif, kalau halaman mengubah view-nya pandas
+# menyalin kolom yang diubah saja; data bersama tidak pernah ikut berubah.
+# st.session_state cukup berisi filter per pengguna, bukan DataFrame.
+import os
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from utils import artifacts, partitions
+from utils.cube import RollupCube
+from utils.loader import read_table
+from utils.matrix import CaseMatrix
+from utils.numeric import to_number
+from utils.regions import report_unmatched, with_codes
+from utils.ingest import build_long, file_hash
+
+# CoW adalah default di pandas 3; di pandas 2.x harus diaktifkan manual.
+pd.set_option("mode.copy_on_write", True)
+
+FILE_KEKERASAN = "data_kekerasan_perempuan.csv"
+FILE_SEBARAN = "data_sebaran_kasus.csv"
+
+# kandidat lokasi file per dataset (urutan = prioritas)
+SUMBER = {
+    "kekerasan": [FILE_KEKERASAN, "pages/" + FILE_KEKERASAN],
+    "sebaran": [FILE_SEBARAN],
+}
+
+KOLOM_PROV_SEBARAN = "Cakupan"
+KOLOM_KASUS = "Jumlah Kasus (Kasus)"
+KOLOM_KORBAN = "Jumlah Korban (Orang)"
+
+
+def build_sebaran(path, digest):
+    cached = artifacts.load(path, digest)
+    if cached is not None:
+        report_unmatched(cached[0], KOLOM_PROV_SEBARAN, sumber=os.path.basename(path))
+        return cached[0]
+
+    df = read_table(path, digest)
+
+    # Kode wilayah (int) untuk join; baris total nasional ikut dibuang
+    df = with_codes(df, KOLOM_PROV_SEBARAN, sumber=os.path.basename(path))
+
+    # Cleaning angka (kolom yang sudah numerik tidak diubah)
+    for col in [KOLOM_KASUS, KOLOM_KORBAN]:
+        df[col] = to_number(df[col])
+    df = artifacts.compact(
+        df,
+        category_cols=[KOLOM_PROV_SEBARAN, "Satuan"],
+        int_cols=["No", KOLOM_KASUS, KOLOM_KORBAN],
+    )
+    artifacts.save(df, path, digest)
+    return df
+
+
+def build(name, path, digest):
+    """Muat dataset `name` dari `path` tanpa cache streamlit (dipakai juga oleh CLI artefak)."""
+    if name == "kekerasan":
+        return build_long(path, digest).data
+    return build_sebaran(path, digest)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _load_sebaran(digest, _path):
+    return build_sebaran(_path, digest)
+
+
+def source_path(name):
+    """Path file sumber dataset `name` yang ada di disk, atau None."""
+    if name not in SUMBER:
+        raise KeyError(f"Dataset tidak dikenal: {name!r}")
+    for f in SUMBER[name]:
+        if os.path.exists(f):
+            return f
+    return None
+
+
+def version(name):
+    """Versi data = SHA-256 file sumber `name` (kunci cache turunan: peta, chart, ekspor)."""
+    path = source_path(name)
+    if path is None:
+        raise FileNotFoundError(f"File untuk dataset {name!r} tidak ditemukan: {SUMBER[name]}")
+    return file_hash(path)
+
+
+def view(name):
+    """View read-only (zero-copy) dari dataset bersama `name`.
+
+    Hanya untuk "sebaran"; data kekerasan dibaca per tahun lewat view_year().
+    """
+    if name != "sebaran":
+        raise KeyError(f"view() hanya untuk dataset 'sebaran', bukan {name!r}; pakai view_year()")
+    path = source_path(name)
+    if path is None:
+        raise FileNotFoundError(f"File untuk dataset {name!r} tidak ditemukan: {SUMBER[name]}")
+    return _load_sebaran(file_hash(path), path).copy(deep=False)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _manifest(digest, _path):
+    return partitions.manifest(_path, digest)
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _load_year(digest, tahun, _path):
+    return partitions.load_year(_path, digest, tahun)
+
+
+def _kekerasan_path(path=None):
+    # `path` diisi kalau sesi memakai file upload (utils/uploads.py)
+    if path is not None:
+        return path
+    path = source_path("kekerasan")
+    if path is None:
+        raise FileNotFoundError(f"File untuk dataset 'kekerasan' tidak ditemukan: {SUMBER['kekerasan']}")
+    return path
+
+
+# digest yang store-nya sudah dibangun di proses ini (mis. disk read-only:
+# manifest tidak tersimpan, tapi jangan bangun ulang di setiap rerun).
+# Diubah hanya di bawah partitions.lock(digest).
+_prepared = set()
+
+
+def needs_build(path=None):
+    """True kalau store partisi data kekerasan belum ada / basi untuk file sumber saat ini.
+
+    Semua fungsi data kekerasan di bawah menerima `path` opsional (file upload);
+    default-nya file bawaan project.
+    """
+    path = _kekerasan_path(path)
+    digest = file_hash(path)
+    return digest not in _prepared and partitions.read_manifest(path, digest) is None
+
+
+def prepare(progress=None, path=None):
+    """Bangun store partisi sekarang (di luar cache) supaya progres bisa ditampilkan.
+
+    `progress(fraksi, agregat)`: agregat berjalan (utils/streaming.py) atau None.
+    """
+    path = _kekerasan_path(path)
+    digest = file_hash(path)
+    # sesi lain yang sedang membangun digest yang sama: tunggu, lalu pakai hasilnya
+    with partitions.lock(digest):
+        if digest not in _prepared:
+            partitions.manifest(path, digest, progress=progress)
+            _prepared.add(digest)
+
+
+def years(path=None):
+    """Daftar tahun yang tersedia di dataset kekerasan (dari manifest partisi)."""
+    path = _kekerasan_path(path)
+    return _manifest(file_hash(path), path)["years"]
+
+
+def schema(path=None):
+    """Hasil deteksi skema file sumber dataset kekerasan."""
+    path = _kekerasan_path(path)
+    return _manifest(file_hash(path), path)["schema"]
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _matrix(digest, tahun, _path):
+    cells = partitions.load_cells(_path, digest)
+    return CaseMatrix.from_long(cells[cells["Tahun"] == tahun], count_col="Baris")
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cube_sebaran(digest, _path):
+    return RollupCube(
+        _load_sebaran(digest, _path), [KOLOM_PROV_SEBARAN], [KOLOM_KASUS, KOLOM_KORBAN], labels={KOLOM_PROV_SEBARAN: "Kode"}
+    )
+
+
+def matrix(tahun, path=None):
+    """CaseMatrix Provinsi x Jenis (int32) data kekerasan untuk satu tahun."""
+    path = _kekerasan_path(path)
+    return _matrix(file_hash(path), int(tahun), path)
+
+
+def cube_sebaran():
+    """RollupCube per Cakupan (measure: kasus & korban, + kolom Kode) untuk data sebaran."""
+    path = source_path("sebaran")
+    if path is None:
+        raise FileNotFoundError(f"File untuk dataset 'sebaran' tidak ditemukan: {SUMBER['sebaran']}")
+    return _cube_sebaran(file_hash(path), path)
+
+
+def view_year(tahun, path=None):
+    """View read-only data kekerasan untuk satu tahun; hanya partisi itu yang dibaca."""
+    path = _kekerasan_path(path)
+    return _load_year(file_hash(path), int(tahun), path).copy(deep=False)
+
+
+def _nbytes(obj):
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    return sys.getsizeof(obj)
+
+
+def memory_report(frames):
+    """Ringkasan memori: dataset bersama vs isi session_state sesi ini.
+
+    `frames` = {nama: DataFrame} yang dipakai halaman. "sebelum" = tiap sesi
+    memegang salinan penuh frame tersebut (pola lama st.session_state["data"]
+    + read_csv per rerun); "sesudah" = yang benar-benar tersimpan di
+    session_state sesi ini.
+    """
+    shared = {name: _nbytes(df) for name, df in frames.items()}
+    per_sesi_sesudah = sum(_nbytes(v) for v in st.session_state.to_dict().values())
+    return {
+        "dataset": pd.DataFrame(
+            {"Dataset": list(shared), "Bytes (bersama, 1x per proses)": list(shared.values())}
+        ),
+        "per_sesi_sebelum": sum(shared.values()),
+        "per_sesi_sesudah": per_sesi_sesudah,
+    }
@@ -0,0 +1,144 @@
+# utils/export.py
+# Export data (CSV / Parquet / XLSX) sesuai permintaan, bukan tiap rerun.
+#
+# Dulu halaman memanggil df.to_csv() di setiap rerun hanya untuk mengisi
+# tombol download, walau tidak ada yang mengklik. Sekarang:
+# - file dibuat hanya setelah pengguna menekan "Siapkan file";
+# - file ditulis bertahap per CHUNK_ROWS baris langsung ke disk (tidak pernah
+#   ada satu string / buffer berisi seluruh data di memori) lalu di-rename
+#   atomik;
+# - nama file memuat versi data, jadi file yang sudah ada dipakai ulang oleh
+#   semua sesi (dan setelah server restart) sampai datanya berubah.
+#
+# XLSX memakai openpyxl (ada di requirements.txt); kalau tidak terpasang, format
+# itu tidak ditawarkan.
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from utils import artifacts
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+EXPORT_DIR = ".exports"
+CHUNK_ROWS = 50_000
+
+# label -> (ekstensi, MIME)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel (XLSX)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def available_formats():
+    """Label format yang bisa dibuat di server ini."""
+    return [f for f in FORMATS if f != "Excel (XLSX)" or openpyxl is not None]
+
+
+def _chunks(df):
+    for awal in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[awal:awal + CHUNK_ROWS]
+
+
+def _tulis_csv(df, path):
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        if df.empty:
+            df.to_csv(fh, index=False)
+        for i, bagian in enumerate(_chunks(df)):
+            bagian.to_csv(fh, index=False, header=i == 0)
+
+
+def _tulis_parquet(df, path):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        # satu row group per chunk
+        for bagian in _chunks(df):
+            writer.write_table(pa.Table.from_pandas(bagian, schema=schema, preserve_index=False))
+
+
+def _tulis_xlsx(df, path):
+    wb = openpyxl.Workbook(write_only=True)  # baris langsung di-flush, tidak disimpan di memori
+    ws = wb.create_sheet("data")
+    ws.append([str(c) for c in df.columns])
+    for bagian in _chunks(df):
+        bagian = bagian.astype(object).where(bagian.notna(), None)
+        for baris in bagian.itertuples(index=False, name=None):
+            ws.append([v.item() if hasattr(v, "item") else v for v in baris])
+    wb.save(path)
+
+
+_PENULIS = {"csv": _tulis_csv, "parquet": _tulis_parquet, "xlsx": _tulis_xlsx}
+
+
+def export_path(nama, versi, fmt):
+    ext, _ = FORMATS[fmt]
+    return os.path.join(EXPORT_DIR, f"{nama}_{versi[:16]}.{ext}")
+
+
+def is_ready(nama, versi, fmt):
+    return os.path.exists(export_path(nama, versi, fmt))
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _build(nama, versi, fmt, _df):
+    # cache_resource: sesi lain yang minta file yang sama menunggu build ini, tidak menulis dobel
+    path = export_path(nama, versi, fmt)
+    if not os.path.exists(path):
+        tmp = artifacts.temp_path(path)
+        try:
+            _PENULIS[FORMATS[fmt][0]](_df, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return path
+
+
+def build(nama, versi, fmt, df):
+    """Path file export `nama` untuk versi data `versi`; dibuat sekali per (versi, format)."""
+    path = _build(nama, versi, fmt, df)
+    if not os.path.exists(path):
+        # file terhapus setelah path-nya di-cache (mis. EXPORT_DIR dibersihkan): buat ulang
+        _build.clear(nama, versi, fmt, df)
+        path = _build(nama, versi, fmt, df)
+    return path
+
+
+def export_panel(nama, versi, df, key):
+    """Pilih format -> "Siapkan file" -> tombol download. Dibungkus fragment supaya tidak me-rerun halaman."""
+
+    @st.fragment
+    def panel():
+        col_f, col_b = st.columns([2, 3])
+        fmt = col_f.selectbox("Format", available_formats(), key=f"{key}_format")
+        ext, mime = FORMATS[fmt]
+        siap = is_ready(nama, versi, fmt)
+        if not siap and col_b.button("⚙️ Siapkan file", key=f"{key}_siapkan"):
+            with st.spinner(f"Menyiapkan {fmt}…"):
+                build(nama, versi, fmt, df)
+            siap = True
+        if siap:
+            path = export_path(nama, versi, fmt)
+            try:
+                with open(path, "rb") as fh:
+                    col_b.download_button(
+                        f"⬇ Download {fmt} ({os.path.getsize(path) / 1024:,.0f} KB)",
+                        fh,
+                        file_name=f"{nama}.{ext}",
+                        mime=mime,
+                        key=f"{key}_download",
+                        on_click="ignore",
+                    )
+            except FileNotFoundError:
+                # file baru saja dihapus: tampilkan lagi tombol "Siapkan file"
+                st.rerun(scope="fragment")
+        if openpyxl is None:
+            st.caption("Export XLSX butuh paket openpyxl.")
+
+    panel()
@@ -0,0 +1,87 @@
+# utils/fragments.py
+# Fragment (st.fragment) dengan pencatatan waktu rerun.
+#
+# Halaman dipecah jadi beberapa fragment; kontrol di dalam satu fragment hanya
+# me-rerun fragment itu, bukan seluruh script. Tiap fragment mencatat waktu
+# eksekusinya di session_state (milik sesi ini saja), dibedakan antara run
+# penuh (seluruh halaman) dan rerun fragment sendiri, untuk panel debug.
+import functools
+import time
+
+import pandas as pd
+import streamlit as st
+
+KEY_DEBUG = "debug_fragment"  # di session_state, bertahan antar halaman
+_KEY_RUN = "_run_penuh"
+_KEY_WAKTU = "_waktu_fragment"
+
+
+def start_run():
+    """Dipanggil sekali di awal script halaman: menandai run penuh baru."""
+    st.session_state[_KEY_RUN] = st.session_state.get(_KEY_RUN, 0) + 1
+
+
+def debug_toggle():
+    """Toggle sidebar untuk menampilkan waktu rerun tiap fragment."""
+    nilai = st.sidebar.toggle(
+        "⏱️ Waktu fragment (debug)",
+        value=st.session_state.get(KEY_DEBUG, False),
+        key="_toggle_debug_fragment",
+    )
+    st.session_state[KEY_DEBUG] = nilai
+    return nilai
+
+
+def _catat(nama, ms):
+    waktu = st.session_state.setdefault(_KEY_WAKTU, {})
+    run = st.session_state.get(_KEY_RUN, 0)
+    c = waktu.get(nama)
+    if c is None:
+        c = waktu[nama] = {"run": None, "ms": 0.0, "penuh": 0, "fragment": 0, "total_ms": 0.0}
+    jenis = "fragment" if c["run"] == run else "penuh"
+    c.update(run=run, ms=ms, jenis=jenis)
+    c[jenis] += 1
+    c["total_ms"] += ms
+    return c
+
+
+def fragment(nama):
+    """Decorator: st.fragment yang mencatat waktu tiap eksekusinya dengan label `nama`."""
+    def deco(fungsi):
+        @functools.wraps(fungsi)
+        def jalan(*args, **kwargs):
+            t0 = time.perf_counter()
+            hasil = fungsi(*args, **kwargs)
+            c = _catat(nama, (time.perf_counter() - t0) * 1000)
+            if st.session_state.get(KEY_DEBUG):
+                st.caption(f"⏱️ {nama}: {c['ms']:,.1f} ms ({c['jenis']}) · rerun fragment: {c['fragment']}×")
+            return hasil
+
+        return st.fragment(jalan)
+
+    return deco
+
+
+def timings():
+    """DataFrame waktu per fragment untuk sesi ini."""
+    baris = [
+        {
+            "Fragment": nama,
+            "Terakhir (ms)": round(c["ms"], 1),
+            "Jenis run terakhir": c["jenis"],
+            "Run penuh": c["penuh"],
+            "Rerun fragment": c["fragment"],
+            "Rata-rata (ms)": round(c["total_ms"] / (c["penuh"] + c["fragment"]), 1),
+        }
+        for nama, c in st.session_state.get(_KEY_WAKTU, {}).items()
+    ]
+    return pd.DataFrame(baris)
+
+
+@st.fragment
+def debug_panel():
+    """Panel debug waktu fragment; tombol perbarui hanya me-rerun panel ini."""
+    with st.expander("⏱️ Waktu rerun per fragment (debug)", expanded=True):
+        st.button("🔄 Perbarui", key="_perbarui_waktu_fragment")
+        st.dataframe(timings(), hide_index=True, width="stretch")
+        st.caption("Run penuh = seluruh halaman dijalankan; rerun fragment = hanya fragment itu, dipicu kontrol di dalamnya.")
@@ -0,0 +1,236 @@
+# utils/geo.py
+# Batas provinsi (indonesia-provinsi.json) + peta choropleth.
+#
+# GeoJSON (~866 KB, 38 MultiPolygon) di-parse SEKALI per proses, bersama
+# kode wilayah kanonik tiap feature (utils/regions.py) dan tabel kode ->
+# posisi feature. Join ke data memakai kolom Kode (operasi integer tervektor,
+# bukan mencocokkan string per render), dan HTML peta yang sudah jadi
+# di-cache per (versi geometri, versi data, metrik, zoom), jadi rerun tidak
+# membaca atau men-serialisasi ulang geometri.
+#
+# Geometri yang dikirim ke browser adalah TopoJSON hasil utils/topology.py
+# (arc dipakai bersama, terkuantisasi, disederhanakan); levelnya dipilih dari
+# zoom peta, jadi tampilan nasional tidak membawa detail garis pantai penuh.
+# Alternatifnya, choropleth_tiles_html() memakai vector tile statis yang
+# disajikan server Streamlit (utils/tiles.py): browser hanya mengambil tile
+# yang terlihat, dan HTML hanya membawa warna per provinsi.
+import json
+import time
+from collections import namedtuple
+
+import branca.colormap as cm
+import folium
+from folium.plugins import VectorGridProtobuf
+from jinja2 import Template
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import tiles, topology
+from utils.ingest import file_hash
+from utils.regions import REGISTRY
+
+GEOJSON = "indonesia-provinsi.json"
+PUSAT_PETA = (-2.5, 118.0)
+ZOOM_AWAL = 5
+
+ProvinceGeo = namedtuple("ProvinceGeo", ["digest", "path", "geojson", "codes", "index"])
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load(digest, _path):
+    with open(_path, encoding="utf-8") as fh:
+        geojson = json.load(fh)
+    # kode dari nama (KODE_PROV di file ini belum memisahkan provinsi pemekaran Papua)
+    nama = pd.Series([f["properties"]["PROVINSI"] for f in geojson["features"]])
+    codes = REGISTRY.encode(nama, sumber=_path)
+    index = np.full(max(int(codes.max()), 0) + 1, -1, dtype=np.int64)
+    ada = codes >= 0
+    index[codes[ada]] = np.flatnonzero(ada)
+    return ProvinceGeo(digest, _path, geojson, codes, index)
+
+
+def provinces(path=GEOJSON):
+    """ProvinceGeo (GeoJSON ter-parse + kode wilayah per feature) yang dipakai bersama semua sesi."""
+    return _load(file_hash(path), path)
+
+
+def join_codes(geo, codes):
+    """Array posisi feature untuk tiap kode wilayah (-1 kalau tidak ada di peta)."""
+    codes = np.asarray(codes, dtype=np.int64)
+    ok = (codes >= 0) & (codes < len(geo.index))
+    return np.where(ok, geo.index[np.where(ok, codes, 0)], -1)
+
+
+def _per_feature(geo, codes, values):
+    pos = join_codes(geo, codes)
+    nilai = np.full(len(geo.geojson["features"]), np.nan)
+    nilai[pos[pos >= 0]] = np.asarray(values, dtype=float)[pos >= 0]
+    return nilai
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _topology(digest, level, _path):
+    topo = topology.load_level(_path, level, digest)
+    topo.pop("digest", None)
+    return topo
+
+
+def _choropleth_map(geo, codes, values, label, caption, zoom=ZOOM_AWAL):
+    nilai = _per_feature(geo, codes, values)
+
+    # geometri TopoJSON baru dengan properti tambahan; arc dipakai bersama
+    # (folium menulis properties.style ke tiap geometri, jadi yang asli tidak disentuh)
+    topo = _topology(geo.digest, topology.level_for_zoom(zoom), geo.path)
+    geometries = []
+    for g, v in zip(topo["objects"][topology.OBJEK]["geometries"], nilai):
+        props = dict(g["properties"], **{label: None if np.isnan(v) else int(v)})
+        geometries.append({"type": g["type"], "arcs": g["arcs"], "properties": props})
+    data = dict(topo, objects={topology.OBJEK: {"type": "GeometryCollection", "geometries": geometries}})
+
+    skala = cm.LinearColormap(
+        ["#fde4ea", "#e68aa3", "#a3234a"],
+        vmin=float(np.nanmin(nilai)) if np.isfinite(nilai).any() else 0.0,
+        vmax=float(np.nanmax(nilai)) if np.isfinite(nilai).any() else 1.0,
+        caption=caption,
+    )
+
+    m = folium.Map(location=PUSAT_PETA, zoom_start=zoom, tiles="cartodbpositron")
+    folium.TopoJson(
+        data,
+        f"objects.{topology.OBJEK}",
+        style_function=lambda f: {
+            "fillColor": "#cccccc" if f["properties"][label] is None else skala(f["properties"][label]),
+            "color": "#ffffff",
+            "weight": 0.7,
+            "fillOpacity": 0.85,
+        },
+        tooltip=folium.GeoJsonTooltip(fields=["PROVINSI", label], aliases=["Provinsi", caption]),
+    ).add_to(m)
+    skala.add_to(m)
+    return m
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _choropleth_html(geo_digest, data_versi, metric, zoom, _geo, _codes, _values, caption):
+    return _choropleth_map(_geo, _codes, _values, metric, caption, zoom).get_root().render()
+
+
+def choropleth_html(geo, data_versi, codes, values, metric, caption, zoom=ZOOM_AWAL):
+    """HTML peta choropleth siap tampil (st.components.v1.html), di-cache per versi dan zoom."""
+    return _choropleth_html(geo.digest, data_versi, metric, zoom, geo, np.asarray(codes), list(values), caption)
+
+
+class _ProvinsiTiles(VectorGridProtobuf):
+    # VectorGridProtobuf + popup nama & nilai saat provinsi diklik
+    _template = Template(
+        """
+        {% macro script(this, kwargs) -%}
+        var {{ this.get_name() }}_nilai = {{ this.nilai|tojson }};
+        var {{ this.get_name() }} = L.vectorGrid.protobuf(
+            {{ this.url|tojson }}, {{ this.options }}
+        ).on("click", function (e) {
+            var nama = e.layer.properties.PROVINSI;
+            var v = {{ this.get_name() }}_nilai[nama];
+            L.popup().setLatLng(e.latlng)
+                .setContent("<b>" + nama + "</b><br>" + {{ this.caption|tojson }} + ": "
+                    + (v === undefined ? "-" : v.toLocaleString()))
+                .openOn({{ this._parent.get_name() }});
+        }).addTo({{ this._parent.get_name() }});
+        {%- endmacro %}
+        """
+    )
+
+    def __init__(self, url, layer, warna, nilai, caption, maxzoom):
+        options = (
+            "{rendererFactory: L.canvas.tile, interactive: true, maxNativeZoom: %d, vectorTileLayerStyles: {%s: "
+            "function (p) { var c = %s[p.PROVINSI]; return {fill: true, fillColor: c || '#cccccc', "
+            "fillOpacity: 0.85, color: '#ffffff', weight: 0.7}; }}}"
+        ) % (maxzoom, json.dumps(layer), json.dumps(warna))
+        super().__init__(url, layer, options)
+        self.nilai = nilai
+        self.caption = caption
+
+
+def _choropleth_tiles_map(geo, codes, values, label, caption, tile_url, zoom=ZOOM_AWAL):
+    nilai = _per_feature(geo, codes, values)
+    ada = np.isfinite(nilai)
+    skala = cm.LinearColormap(
+        ["#fde4ea", "#e68aa3", "#a3234a"],
+        vmin=float(np.nanmin(nilai)) if ada.any() else 0.0,
+        vmax=float(np.nanmax(nilai)) if ada.any() else 1.0,
+        caption=caption,
+    )
+    # kunci = nama provinsi apa adanya di tile (properti PROVINSI)
+    nama = [f["properties"]["PROVINSI"] for f in geo.geojson["features"]]
+    warna = {n: skala(v) for n, v, a in zip(nama, nilai, ada) if a}
+    angka = {n: int(v) for n, v, a in zip(nama, nilai, ada) if a}
+
+    m = folium.Map(location=PUSAT_PETA, zoom_start=zoom, tiles="cartodbpositron")
+    _ProvinsiTiles(tile_url, tiles.LAYER_PROVINSI, warna, angka, caption, tiles.MAXZOOM).add_to(m)
+    skala.add_to(m)
+    return m
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _choropleth_tiles_html(geo_digest, data_versi, metric, zoom, tile_url, _geo, _codes, _values, caption):
+    return _choropleth_tiles_map(_geo, _codes, _values, metric, caption, tile_url, zoom).get_root().render()
+
+
+def choropleth_tiles_html(geo, data_versi, codes, values, metric, caption, zoom=ZOOM_AWAL):
+    """Seperti choropleth_html, tapi geometri diambil per tile (file statis di server Streamlit)."""
+    tile_url = tiles.url(tiles.LAYER_PROVINSI, geo.path)
+    return _choropleth_tiles_html(geo.digest, data_versi, metric, zoom, tile_url, geo, np.asarray(codes), list(values), caption)
+
+
+def choropleth_map(geo, codes, values, metric, caption, zoom=ZOOM_AWAL, vector_tiles=False):
+    """Objek folium.Map baru (tidak di-cache) untuk komponen interaktif seperti st_folium.
+
+    Geometri (TopoJSON / tile) tetap dipakai bersama; hanya peta yang dirakit ulang.
+    """
+    if vector_tiles:
+        tile_url = tiles.url(tiles.LAYER_PROVINSI, geo.path)
+        return _choropleth_tiles_map(geo, np.asarray(codes), list(values), metric, caption, tile_url, zoom)
+    return _choropleth_map(geo, np.asarray(codes), list(values), metric, caption, zoom)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _level_report(digest, _path):
+    baris = []
+    for nama, tol in topology.LEVELS:
+        teks = json.dumps(_topology(digest, nama, _path), separators=(",", ":"))
+        t0 = time.perf_counter()
+        m = folium.Map(location=PUSAT_PETA, zoom_start=ZOOM_AWAL, tiles="cartodbpositron")
+        folium.TopoJson(json.loads(teks), f"objects.{topology.OBJEK}").add_to(m)
+        html = m.get_root().render()
+        baris.append({
+            "level": nama,
+            "toleransi (derajat)": tol,
+            "zoom": ", ".join(str(z) for z in range(3, 13) if topology.level_for_zoom(z) == nama) or "-",
+            "payload TopoJSON (KB)": round(len(teks.encode()) / 1024, 1),
+            "HTML peta (KB)": round(len(html.encode()) / 1024, 1),
+            "render (ms)": round((time.perf_counter() - t0) * 1000, 1),
+        })
+    with open(_path, "rb") as fh:
+        asli = len(fh.read())
+    baris.append({
+        "level": "GeoJSON asli",
+        "toleransi (derajat)": None,
+        "zoom": "-",
+        "payload TopoJSON (KB)": round(asli / 1024, 1),
+        "HTML peta (KB)": None,
+        "render (ms)": None,
+    })
+    return pd.DataFrame(baris)
+
+
+def level_report(geo):
+    """Ukuran payload dan waktu render per level penyederhanaan (dihitung sekali per proses)."""
+    return _level_report(geo.digest, geo.path)
+
+
+def unmatched(geo, codes):
+    """Nama baku wilayah di data yang tidak punya batas di peta (kode tak dikenal dilaporkan registry)."""
+    codes = np.asarray(codes)
+    hilang = codes[(codes >= 0) & (join_codes(geo, codes) < 0)]
+    return list(REGISTRY.names(np.unique(hilang)))
@@ -0,0 +1,89 @@
+# utils/grid.py
+# Data grid server-side: sort, filter & paginasi di server, yang dikirim ke
+# browser hanya baris halaman yang terlihat.
+#
+# Per (dataset, versi, kolom) dihitung SEKALI lalu di-cache di proses:
+# - urutan naik & turun (argsort stabil atas rank padat, NaN selalu di akhir);
+# - kode faktor + nilai unik kolom teks/kategori, jadi pencarian teks hanya
+#   mencocokkan nilai unik lalu memetakan hasilnya lewat kode.
+# Mask pencarian di-cache per (dataset, versi, teks). Satu halaman = ambil
+# urutan kolom sort, saring dengan mask, lalu iloc sepotong baris.
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [10, 20, 50, 100]
+NAIK, TURUN = "Naik", "Turun"
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _kolom(nama, versi, kolom, _df):
+    s = _df[kolom]
+    codes, uniques = pd.factorize(s, sort=True)  # rank padat; NaN = -1
+    kosong = codes < 0
+    naik = np.where(kosong, len(uniques), codes)
+    turun = np.where(kosong, len(uniques), len(uniques) - 1 - codes)
+    teks = s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(s.dtype)
+    return {
+        NAIK: np.argsort(naik, kind="stable").astype(np.int32),
+        TURUN: np.argsort(turun, kind="stable").astype(np.int32),
+        "codes": codes,
+        "uniques": pd.Index(uniques).astype(str).str.lower() if teks else None,
+    }
+
+
+def sort_order(nama, versi, df, kolom, arah=NAIK):
+    """Posisi baris df terurut menurut `kolom` (di-cache per versi data & kolom)."""
+    return _kolom(nama, versi, kolom, df)[arah]
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _mask(nama, versi, cari, _df):
+    cari = cari.lower()
+    mask = np.zeros(len(_df), dtype=bool)
+    for kolom in _df.columns:
+        k = _kolom(nama, versi, kolom, _df)
+        if k["uniques"] is None:
+            continue
+        cocok = np.append(np.asarray(k["uniques"].str.contains(cari, regex=False), dtype=bool), False)  # posisi -1 = NaN
+        mask |= cocok[k["codes"]]
+    return mask
+
+
+def page(nama, versi, df, sort=None, arah=NAIK, cari="", halaman=1, ukuran=20):
+    """(potongan df untuk satu halaman, jumlah baris setelah filter)."""
+    posisi = sort_order(nama, versi, df, sort, arah) if sort is not None else np.arange(len(df), dtype=np.int32)
+    cari = cari.strip()
+    if cari:
+        posisi = posisi[_mask(nama, versi, cari, df)[posisi]]
+    awal = (halaman - 1) * ukuran
+    return df.iloc[posisi[awal:awal + ukuran]], len(posisi)
+
+
+def data_grid(nama, versi, df, key, page_size=20):
+    """Tabel berhalaman dengan sort & pencarian di server; hanya halaman aktif dikirim ke browser.
+
+    Panggil dari dalam fragment supaya kontrol grid tidak me-rerun seluruh halaman.
+    """
+    c_cari, c_sort, c_arah, c_ukuran = st.columns([3, 2, 1, 1])
+    cari = c_cari.text_input("Cari", key=f"{key}_cari", placeholder="teks di kolom teks/kategori")
+    sort = c_sort.selectbox("Urutkan", ["(urutan asli)", *map(str, df.columns)], key=f"{key}_sort")
+    arah = c_arah.radio("Arah", [NAIK, TURUN], key=f"{key}_arah", horizontal=True)
+    ukuran = c_ukuran.selectbox(
+        "Baris", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1, key=f"{key}_ukuran"
+    )
+    kolom = None if sort == "(urutan asli)" else df.columns[[str(c) for c in df.columns].index(sort)]
+
+    # jumlah halaman baru diketahui setelah filter; nomor halaman dijepit ke rentang yang valid
+    _, n = page(nama, versi, df, kolom, arah, cari, 1, 0)
+    n_halaman = max(1, -(-n // ukuran))
+    kunci_hal = f"{key}_halaman"
+    if st.session_state.get(kunci_hal, 1) > n_halaman:
+        st.session_state[kunci_hal] = n_halaman
+    halaman = st.number_input(f"Halaman (dari {n_halaman})", 1, n_halaman, key=kunci_hal)
+
+    potong, n = page(nama, versi, df, kolom, arah, cari, halaman, ukuran)
+    st.dataframe(potong, width="stretch", hide_index=True)
+    awal = (halaman - 1) * ukuran
+    info = f" (difilter dari {len(df):,})" if n != len(df) else ""
+    st.caption(f"Baris {min(awal + 1, n):,}–{min(awal + ukuran, n):,} dari {n:,}{info}")
@@ -0,0 +1,97 @@
+# utils/histogram.py
+# Histogram usia berbasis np.bincount, dengan kelompok umur yang bisa diatur.
+#
+# Dulu halaman profil memakai df["Usia"].value_counts().sort_index(): hashing
+# tiap nilai lalu sort. Sekarang:
+# - satu lintasan np.bincount atas usia (uint8) -> hitungan per tahun usia
+#   (array panjang MAX_USIA + 1), np.histogram untuk usia non-integer;
+# - kelompok umur = penjumlahan rentang hitungan itu (np.add.reduceat), jadi
+#   mengganti definisi kelompok tidak menyentuh data lagi;
+# - histogram dari potongan data / proses lain bisa dijumlah (a + b, objek
+#   baru; histogram di cache dipakai bersama dan tidak pernah diubah);
+# - hasil di-cache per kunci data (mis. seed & jumlah data sintetis).
+#
+# Kelompok default (BANDS_USIA) terbelah di 18 tahun, batas anak menurut UU
+# No. 12/2022 (UU TPKS); BANDS_TPKS hanya memuat batas itu (anak / dewasa).
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+MAX_USIA = 255
+
+# edges = batas bawah tiap kelompok (naik), kelompok terakhir sampai MAX_USIA
+Bands = namedtuple("Bands", ["edges", "labels"])
+
+
+def make_bands(edges, labels=None):
+    """Bands dari batas bawah kelompok: naik tegas, mulai 0, paling besar MAX_USIA.
+
+    Label otomatis "a–b" / "≥a" kalau tidak diberikan.
+    """
+    edges = tuple(int(e) for e in edges)
+    if not edges or edges[0] != 0 or any(b <= a for a, b in zip(edges, edges[1:])) or edges[-1] > MAX_USIA:
+        raise ValueError(f"Batas kelompok umur harus naik tegas dari 0 s.d. maks. {MAX_USIA}: {edges}")
+    if labels is None:
+        labels = [f"{a}–{b - 1}" for a, b in zip(edges, edges[1:])] + [f"≥{edges[-1]}"]
+    if len(labels) != len(edges):
+        raise ValueError(f"Jumlah label ({len(labels)}) harus sama dengan jumlah kelompok ({len(edges)})")
+    return Bands(edges, tuple(labels))
+
+
+# UU No. 12/2022 (UU TPKS) hanya menetapkan satu batas: anak = belum berusia 18 tahun
+BANDS_TPKS = make_bands((0, 18), ("Anak (<18)", "Dewasa (≥18)"))
+# rincian untuk tampilan (bukan definisi UU); tetap terbelah di 18 tahun
+BANDS_USIA = make_bands((0, 12, 18, 60), ("<12", "12–17", "18–59", "≥60"))
+
+
+class AgeHistogram:
+    """Hitungan per tahun usia 0..MAX_USIA (int64); histogram potongan data bisa dijumlah (a + b)."""
+
+    def __init__(self, counts=None):
+        self.counts = np.zeros(MAX_USIA + 1, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, values):
+        """Satu lintasan atas usia; nilai kosong / di luar 0..MAX_USIA diabaikan."""
+        v = np.asarray(values)
+        if v.dtype == np.uint8:
+            return cls(np.bincount(v, minlength=MAX_USIA + 1))
+        if np.issubdtype(v.dtype, np.integer):
+            v = v[(v >= 0) & (v <= MAX_USIA)]
+            return cls(np.bincount(v, minlength=MAX_USIA + 1))
+        # usia pecahan / float dengan NaN: bin selebar 1 tahun
+        counts, _ = np.histogram(v[np.isfinite(v)], bins=np.arange(MAX_USIA + 2))
+        return cls(counts)
+
+    def __add__(self, other):
+        return AgeHistogram(self.counts + other.counts)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def by_year(self, name="Usia"):
+        """Series hitungan per tahun usia dari usia terkecil s.d. terbesar (usia tanpa kasus = 0)."""
+        ada = np.flatnonzero(self.counts)
+        if len(ada) == 0:
+            return pd.Series([], index=pd.Index([], name=name, dtype=np.int64), name="count", dtype=np.int64)
+        usia = np.arange(ada[0], ada[-1] + 1)
+        return pd.Series(self.counts[usia], index=pd.Index(usia, name=name), name="count")
+
+    def by_band(self, bands=BANDS_USIA, name="Kelompok umur"):
+        """Series hitungan per kelompok umur, urut sesuai `bands` (divalidasi lewat make_bands)."""
+        bands = make_bands(bands.edges, bands.labels)
+        hitung = np.add.reduceat(self.counts, np.asarray(bands.edges))
+        return pd.Series(hitung, index=pd.Index(bands.labels, name=name), name="count")
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached(key, _values):
+    return AgeHistogram.from_values(_values)
+
+
+def age_histogram(key, values):
+    """AgeHistogram untuk `values`, di-cache per `key` (mis. ("korban", seed, n))."""
+    return _cached(key, values)
@@ -0,0 +1,191 @@
+# utils/ingest.py
+# Ingestion data kekerasan: deteksi skema (long / wide) lalu ubah ke bentuk
+# long kanonik (Provinsi, Jenis, Jumlah, Tahun), plus kolom Kode wilayah
+# (utils/regions.py) untuk join integer.
+#
+# build_long() dipakai oleh utils/partitions.py (store partisi per tahun, kunci
+# hash SHA-256 isi file). Hash sendiri di-memo berdasarkan (path, mtime,
+# ukuran) supaya file tidak dibaca ulang selama belum berubah.
+import hashlib
+import os
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+from utils import artifacts
+from utils.loader import read_table
+from utils.numeric import is_numeric_like, to_number
+from utils.regions import KODE_NASIONAL, REGISTRY, report_unmatched, with_codes
+
+KOLOM_KANONIK = ["Provinsi", "Jenis", "Jumlah", "Tahun"]
+TAHUN_DEFAULT = 2024
+
+# kata kunci pencarian kolom (urutan = prioritas)
+KUNCI_PROVINSI = ["provinsi", "cakupan", "wilayah", "nama provinsi"]
+KUNCI_JENIS = ["jenis", "kekerasan", "kategori", "type"]
+KUNCI_JUMLAH = ["jumlah", "kasus", "total", "count", "nilai"]
+KUNCI_TAHUN = ["tahun", "year"]
+
+IngestResult = namedtuple("IngestResult", ["digest", "data", "schema"])
+
+
+class SchemaError(ValueError):
+    """Header file tidak cocok dengan format long maupun wide yang dikenali."""
+
+
+_hash_memo = {}
+_hash_lock = threading.Lock()
+
+
+def file_hash(path):
+    """SHA-256 isi file, di-memo per (path, mtime, ukuran)."""
+    st_ = os.stat(path)
+    key = (os.path.abspath(path), st_.st_mtime_ns, st_.st_size)
+    with _hash_lock:
+        digest = _hash_memo.get(key)
+    if digest is not None:
+        return digest
+
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for blok in iter(lambda: fh.read(1 << 20), b""):
+            h.update(blok)
+    digest = h.hexdigest()
+    with _hash_lock:
+        _hash_memo[key] = digest
+    return digest
+
+
+def _find_col(columns, keywords):
+    for k in keywords:
+        for c in columns:
+            if k.lower() in c.lower():
+                return c
+    return None
+
+
+def detect_schema(df):
+    """Deteksi format (long / kasus / wide) dan pemetaan kolom sumber -> kolom kanonik.
+
+    Mengembalikan dict biasa supaya mudah ditampilkan / disimpan.
+    Melempar SchemaError kalau kolom penting tidak ditemukan.
+    """
+    columns = [c.strip() for c in df.columns]
+    cols_lower = [c.lower() for c in columns]
+
+    is_long = "jenis" in cols_lower and any(k in cols_lower for k in ["kasus", "jumlah", "total"])
+    if is_long:
+        schema = {
+            "format": "long",
+            "kolom": columns,
+            "Provinsi": _find_col(columns, KUNCI_PROVINSI),
+            "Jenis": _find_col(columns, KUNCI_JENIS),
+            "Jumlah": _find_col(columns, KUNCI_JUMLAH),
+            "Tahun": _find_col(columns, KUNCI_TAHUN),
+        }
+        if schema["Provinsi"] is None or schema["Jenis"] is None or schema["Jumlah"] is None:
+            raise SchemaError(
+                "Format long terdeteksi tetapi tidak semua kolom penting ditemukan. "
+                "Periksa header CSV (Provinsi, Jenis, Jumlah)."
+            )
+        return schema
+
+    # data level kasus: 1 baris = 1 kasus (ada kolom jenis, tidak ada kolom jumlah)
+    if "jenis" in cols_lower:
+        prov_col = _find_col(columns, KUNCI_PROVINSI)
+        if prov_col is not None:
+            return {
+                "format": "kasus",
+                "kolom": columns,
+                "Provinsi": prov_col,
+                "Jenis": columns[cols_lower.index("jenis")],
+                "Jumlah": None,
+                "Tahun": _find_col(columns, KUNCI_TAHUN),
+            }
+
+    # asumsi wide: 1 baris = 1 provinsi, kolom jenis seperti Fisik, Psikis, Seksual, ...
+    prov_col = None
+    for p in ["cakupan", "provinsi", "prov", "nama provinsi", "wilayah"]:
+        if p in cols_lower:
+            prov_col = columns[cols_lower.index(p)]
+            break
+    if prov_col is None:
+        # fallback: kolom non-numeric pertama
+        nonnum = [c for c, dt in zip(columns, df.dtypes) if not pd.api.types.is_numeric_dtype(dt)]
+        prov_col = nonnum[0] if nonnum else None
+    if prov_col is None:
+        raise SchemaError(
+            "Format wide terdeteksi tetapi tidak ditemukan kolom provinsi. "
+            "Pastikan ada kolom seperti Provinsi/Cakupan/Wilayah."
+        )
+
+    tahun_col = None
+    for k in KUNCI_TAHUN:
+        if k in cols_lower:
+            tahun_col = columns[cols_lower.index(k)]
+            break
+
+    exclude = {prov_col, tahun_col, "No", "no", "Satuan", "satuan"}
+    jenis_cols = []
+    for c, asli in zip(columns, df.columns):
+        if c in exclude:
+            continue
+        if is_numeric_like(df[asli]):
+            jenis_cols.append(c)
+
+    if not jenis_cols:
+        raise SchemaError(
+            "Format wide terdeteksi tetapi tidak ditemukan kolom jenis numeric. "
+            "Pastikan kolom jenis seperti Fisik/Psikis/Seksual exist."
+        )
+
+    return {
+        "format": "wide",
+        "kolom": columns,
+        "Provinsi": prov_col,
+        "Tahun": tahun_col,
+        "jenis_cols": jenis_cols,
+    }
+
+
+def to_long(df, schema):
+    """Ubah df mentah ke bentuk long kanonik sesuai hasil detect_schema()."""
+    df = df.rename(columns=lambda c: c.strip())
+
+    if schema["format"] in ("long", "kasus"):
+        rename = {schema[k]: k for k in ["Provinsi", "Jenis", "Jumlah", "Tahun"] if schema[k]}
+        df_long = df[list(rename)].rename(columns=rename)
+        if schema["format"] == "kasus":
+            df_long["Jumlah"] = 1
+    else:
+        prov_col = schema["Provinsi"]
+        tahun_col = schema["Tahun"]
+        id_vars = [c for c in [prov_col, tahun_col] if c]
+        df_long = df.melt(id_vars=id_vars, value_vars=schema["jenis_cols"], var_name="Jenis", value_name="Jumlah")
+        df_long = df_long.rename(columns={prov_col: "Provinsi", tahun_col: "Tahun"})
+
+    if "Tahun" not in df_long.columns:
+        df_long["Tahun"] = TAHUN_DEFAULT
+    df_long["Jumlah"] = to_number(df_long["Jumlah"])
+    df_long["Tahun"] = pd.to_numeric(df_long["Tahun"], errors="coerce")
+    # buang baris total nasional ('INDONESIA' dan aliasnya) lewat registry wilayah
+    df_long = df_long[REGISTRY.encode(df_long["Provinsi"]) != KODE_NASIONAL]
+    return df_long[KOLOM_KANONIK].reset_index(drop=True)
+
+
+def build_long(path, digest):
+    """IngestResult tanpa cache streamlit: artefak kolumnar kalau masih segar,
+    kalau tidak parse file sumber lalu tulis artefak baru."""
+    cached = artifacts.load(path, digest)
+    if cached is not None:
+        data, extra = cached
+        report_unmatched(data, "Provinsi", sumber=os.path.basename(path))
+        return IngestResult(digest, data, extra["schema"])
+
+    raw = read_table(path, digest)
+    schema = detect_schema(raw)
+    data = artifacts.compact(to_long(raw, schema), category_cols=["Provinsi", "Jenis"], int_cols=["Jumlah", "Tahun"])
+    data = with_codes(data, "Provinsi", sumber=os.path.basename(path))
+    artifacts.save(data, path, digest, {"schema": schema})
+    return IngestResult(digest, data, schema)
@@ -0,0 +1,99 @@
+# utils/loader.py
+# Loader bersama untuk file tabel (CSV / Excel).
+#
+# Format ditebak dari magic bytes + beberapa KB pertama, bukan dengan mencoba
+# read_csv lalu read_excel setelah gagal (file rusak jadi di-parse dua kali),
+# dan bukan dengan sep=None yang memaksa parser pure-Python pandas. Dialek yang
+# terdeteksi di-cache per hash isi file; BOM UTF-8 (ada di
+# data_sebaran_kasus.csv) ditangani lewat encoding "utf-8-sig".
+import csv
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+try:
+    import python_calamine  # noqa: F401  (reader xlsx / xls berbasis Rust, jauh lebih cepat dari openpyxl)
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None  # biarkan pandas memilih (openpyxl / xlrd)
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+SAMPLE_BYTES = 64 * 1024
+DELIMITERS = ",;\t|"
+
+MAGIC = [
+    (b"PK\x03\x04", "xlsx"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "xls"),
+]
+BOM_UTF8 = b"\xef\xbb\xbf"
+
+Dialect = namedtuple("Dialect", ["format", "sep", "encoding"])
+
+_dialects = {}
+_lock = threading.Lock()
+
+
+def _sniff_sep(text):
+    try:
+        return csv.Sniffer().sniff(text, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # fallback: delimiter yang paling sering muncul di baris header
+        header = text.splitlines()[0] if text else ""
+        return max(DELIMITERS, key=header.count) if any(d in header for d in DELIMITERS) else ","
+
+
+def sniff_bytes(head):
+    """Tebak Dialect dari potongan awal isi file."""
+    for magic, fmt in MAGIC:
+        if head.startswith(magic):
+            return Dialect(fmt, None, None)
+
+    encoding = "utf-8"
+    if head.startswith(BOM_UTF8):
+        encoding = "utf-8-sig"
+        head = head[len(BOM_UTF8):]
+    try:
+        head[:-4].decode("utf-8")  # 4 byte terakhir bisa potongan karakter multibyte
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+    text = head.decode("latin-1" if encoding == "latin-1" else "utf-8", errors="ignore")
+
+    # buang baris terakhir yang mungkin terpotong
+    lines = text.splitlines()
+    if len(lines) > 1 and len(head) >= SAMPLE_BYTES:
+        lines = lines[:-1]
+    return Dialect("csv", _sniff_sep("\n".join(lines)), encoding)
+
+
+def sniff(path, digest=None):
+    """Dialect file `path`; di-cache per `digest` (hash isi file) kalau diberikan."""
+    if digest is not None:
+        with _lock:
+            d = _dialects.get(digest)
+        if d is not None:
+            return d
+
+    with open(path, "rb") as fh:
+        d = sniff_bytes(fh.read(SAMPLE_BYTES))
+
+    if digest is not None:
+        with _lock:
+            _dialects[digest] = d
+    return d
+
+
+def read_table(path, digest=None):
+    """Baca CSV / Excel ke DataFrame dengan engine cepat sesuai hasil sniff."""
+    d = sniff(path, digest)
+    if d.format in ("xlsx", "xls"):
+        # calamine membaca xlsx dan xls lama; tanpa calamine pandas memilih openpyxl / xlrd
+        return pd.read_excel(path, engine=EXCEL_ENGINE)
+    df = pd.read_csv(path, sep=d.sep, encoding=d.encoding, engine=CSV_ENGINE)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
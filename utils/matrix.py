@@ -0,0 +1,64 @@
+# utils/matrix.py
+# Representasi padat tabel provinsi x jenis kekerasan: matriks int32
+# (mis. 38 x 7) + peta indeks nama baris / kolom.
+#
+# Total baris, total kolom dan grand total dihitung dengan reduksi NumPy saat
+# dibangun, begitu juga urutan top-N; tidak ada melt ke frame string lalu
+# groupby lagi. Ukurannya n_baris * n_kolom * 4 byte, jadi tetap kecil walau
+# baris jadi 514 kabupaten atau jenis bertambah.
+import numpy as np
+import pandas as pd
+
+
+def _codes(s):
+    """(kode int, label) untuk kolom kategori / teks, urutan label stabil."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), list(s.cat.categories)
+    codes, labels = pd.factorize(s, sort=True)
+    return codes, list(labels)
+
+
+class CaseMatrix:
+    def __init__(self, values, rows, cols, row_name="Provinsi", col_name="Jenis", value_name="Jumlah", n_entri=None):
+        self.values = np.ascontiguousarray(values, dtype=np.int32)
+        self.rows = list(rows)
+        self.cols = list(cols)
+        self.row_name = row_name
+        self.col_name = col_name
+        self.value_name = value_name
+
+        # akumulasi di int64 supaya total nasional tidak overflow
+        self.row_totals = self.values.sum(axis=1, dtype=np.int64)
+        self.col_totals = self.values.sum(axis=0, dtype=np.int64)
+        self.grand_total = int(self.row_totals.sum())
+        self.n_entri = int(self.values.size if n_entri is None else n_entri)
+
+        # urutan menurun (stabil) untuk top-N
+        self._row_order = np.argsort(-self.row_totals, kind="stable")
+        self._col_order = np.argsort(-self.col_totals, kind="stable")
+
+    @classmethod
+    def from_long(cls, df, row_col="Provinsi", col_col="Jenis", value_col="Jumlah", count_col=None):
+        """Dari frame long: akumulasi per sel dengan satu np.bincount."""
+        ri, rows = _codes(df[row_col])
+        ci, cols = _codes(df[col_col])
+        ok = (ri >= 0) & (ci >= 0)
+        flat = ri[ok].astype(np.int64) * len(cols) + ci[ok]
+        weights = df[value_col].fillna(0).to_numpy(dtype=np.float64)[ok]
+        values = np.bincount(flat, weights=weights, minlength=len(rows) * len(cols)).reshape(len(rows), len(cols))
+        n_entri = int(df[count_col].sum()) if count_col else len(df)
+        return cls(values.round().astype(np.int32), rows, cols, row_name=row_col, col_name=col_col, value_name=value_col, n_entri=n_entri)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def top_rows(self, n=None):
+        """Series total per baris, urut menurun (n=None: semua)."""
+        idx = self._row_order[:n]
+        return pd.Series(self.row_totals[idx], index=pd.Index([self.rows[i] for i in idx], name=self.row_name), name=self.value_name)
+
+    def top_cols(self, n=None):
+        """Series total per kolom, urut menurun (n=None: semua)."""
+        idx = self._col_order[:n]
+        return pd.Series(self.col_totals[idx], index=pd.Index([self.cols[j] for j in idx], name=self.col_name), name=self.value_name)
@@ -0,0 +1,101 @@
+# utils/numeric.py
+# Normalisasi kolom angka yang dipakai bersama semua halaman.
+#
+# - Kolom yang sudah numerik (int64/float64 hasil parser) dikembalikan apa
+#   adanya, tanpa bolak-balik ke string.
+# - Kolom teks dibersihkan dengan operasi string vektor (Arrow compute):
+#   format Indonesia "1.234" / "1.234,5", format Inggris "1,234" / "1,234.5",
+#   dan sisa teks seperti "12 kasus" (ambil angka pertama).
+#
+# Benchmark 1 juta baris:  python -m utils.numeric
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_RIBUAN_ID = r"-?\d{1,3}(?:\.\d{3})+(?:,\d+)?"  # 1.234 / 1.234.567 / 1.234,5
+_RIBUAN_EN = r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?"  # 1,234 / 1,234,567 / 1,234.5
+_DESIMAL_KOMA = r"-?\d+,\d+"  # 12,5 (tanpa pemisah ribuan)
+_ANGKA = r"-?\d+(?:\.\d+)?"
+
+
+def _match(arr, pola):
+    return pc.match_substring_regex(arr, f"^(?:{pola})$")
+
+
+def _as_arrow_string(s):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    try:
+        return pa.array(s, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # kolom object campuran (mis. int dan str): paksa ke str, NaN tetap null
+        return pa.array(s.astype(str), type=pa.string(), mask=s.isna().to_numpy())
+
+
+def to_number(s, ambil_angka=True):
+    """Series angka (int64 / float64) dari Series apa pun; nilai yang gagal jadi NaN.
+
+    ambil_angka=False: teks campuran seperti "12 kasus" tidak diambil angkanya (jadi NaN).
+    """
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return s.astype(np.int8)
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s
+
+    arr = pc.utf8_trim_whitespace(_as_arrow_string(s))
+    # urutan penting: pola Inggris "1,234" lebih dulu supaya tidak terbaca desimal koma
+    arr = pc.if_else(_match(arr, _RIBUAN_EN), pc.replace_substring(arr, ",", ""), arr)
+    id_ = pc.or_(_match(arr, _RIBUAN_ID), _match(arr, _DESIMAL_KOMA))
+    arr = pc.if_else(id_, pc.replace_substring(pc.replace_substring(arr, ".", ""), ",", "."), arr)
+
+    valid = _match(arr, _ANGKA)
+    lain = pa.scalar(None, type=pa.string())
+    if ambil_angka and pc.any(pc.and_(pc.invert(valid), pc.is_valid(arr))).as_py():
+        # teks campuran ("12 kasus", "±30"): ambil deret angka pertama
+        lain = pc.struct_field(pc.extract_regex(arr, r"(?P<d>\d+)"), [0])
+    arr = pc.if_else(valid, arr, lain)
+
+    out = pc.cast(arr, pa.float64()).to_numpy(zero_copy_only=False)
+    if not np.isnan(out).any() and np.array_equal(out, np.floor(out)):
+        out = out.astype(np.int64)
+    return pd.Series(out, index=s.index, name=s.name)
+
+
+def is_numeric_like(s):
+    """True kalau semua nilai non-kosong di `s` bisa dibaca sebagai angka."""
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return True
+    s = s.dropna()
+    return bool(to_number(s, ambil_angka=False).notna().all())
+
+
+def _lama(s):
+    # cara lama di page1 / page4: selalu bolak-balik lewat string object
+    return pd.to_numeric(s.astype(str).str.replace(",", "").str.strip(), errors="coerce")
+
+
+def benchmark(n=1_000_000, ulang=3):
+    rng = np.random.default_rng(0)
+    angka = rng.integers(0, 2_000_000, n)
+    kasus = {
+        "int64 (sudah numerik)": pd.Series(angka),
+        "teks '1,234'": pd.Series([f"{v:,}" for v in angka]),
+        "teks '1.234' (format ID)": pd.Series([f"{v:,}".replace(",", ".") for v in angka]),
+    }
+    hasil = []
+    for nama, s in kasus.items():
+        for label, fn in [("lama", _lama), ("to_number", to_number)]:
+            terbaik = float("inf")
+            for _ in range(ulang):
+                t0 = time.perf_counter()
+                fn(s)
+                terbaik = min(terbaik, time.perf_counter() - t0)
+            hasil.append({"input": nama, "metode": label, "detik": round(terbaik, 4)})
+    return pd.DataFrame(hasil)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
@@ -0,0 +1,139 @@
+# utils/partitions.py
+# Store data kekerasan yang dipartisi per tahun (satu file Arrow per Tahun):
+#
+#   data_kekerasan_perempuan_partisi/
+#       _manifest.json            <- digest sumber, daftar tahun, schema
+#       _cube.arrow               <- sel Tahun x Provinsi x Jenis (lihat utils/cube.py)
+#       Tahun=2023/part-0.arrow
+#       Tahun=2024/part-0.arrow
+#
+# Layout hive ini juga bisa dibaca pyarrow.dataset. Menampilkan satu tahun
+# cukup membaca manifest + satu partisi (memory map); riwayat penuh hanya
+# dimaterialisasi sekali saat partisi dibangun dari file sumber.
+#
+# Build dikunci per digest sumber (lock()): sesi / thread yang meminta store
+# yang sama bersamaan menunggu build pertama selesai, lalu membaca manifest-nya.
+# Semua file (partisi, cube, manifest) ditulis lewat file sementara unik +
+# os.replace, jadi pembaca tidak pernah melihat file setengah jadi.
+import json
+import os
+import threading
+
+import pandas as pd
+
+from utils import artifacts, streaming
+from utils.ingest import KOLOM_KANONIK, build_long
+
+MANIFEST = "_manifest.json"
+CUBE = "_cube.arrow"
+DIM_CUBE = ["Tahun", "Provinsi", "Jenis"]
+MEASURE_CUBE = ["Jumlah", "Baris"]
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def lock(digest):
+    """RLock per digest sumber; dipegang selama store dibangun."""
+    with _locks_guard:
+        return _locks.setdefault(digest, threading.RLock())
+
+
+def store_dir(source_path):
+    return os.path.splitext(source_path)[0] + "_partisi"
+
+
+def partition_path(source_path, tahun):
+    return os.path.join(store_dir(source_path), f"Tahun={int(tahun)}", "part-0.arrow")
+
+
+def cube_path(source_path):
+    return os.path.join(store_dir(source_path), CUBE)
+
+
+def _cells(data):
+    # "Baris" = jumlah entri mentah per sel, supaya jumlah baris juga bisa di-lookup;
+    # data hasil streaming sudah teragregasi dan membawa kolom Baris sendiri
+    baris = ("Baris", "sum") if "Baris" in data.columns else ("Jumlah", "size")
+    return (
+        data.groupby(DIM_CUBE, observed=True)
+        .agg(Jumlah=("Jumlah", "sum"), Baris=baris)
+        .reset_index()
+    )
+
+
+def read_manifest(source_path, digest):
+    """Manifest store kalau ada dan masih sesuai digest sumber, atau None."""
+    path = os.path.join(store_dir(source_path), MANIFEST)
+    try:
+        with open(path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("digest") != digest or manifest.get("format_version") != artifacts.FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def build(source_path, digest, progress=None):
+    """Bangun ulang semua partisi dari file sumber, kembalikan manifest-nya.
+
+    File CSV besar dibaca bertahap (utils/streaming.py); `progress` diteruskan ke sana.
+    """
+    with lock(digest):
+        return _build(source_path, digest, progress)
+
+
+def _build(source_path, digest, progress):
+    if streaming.should_stream(source_path, digest):
+        hasil = streaming.build_long(source_path, digest, progress=progress)
+    else:
+        hasil = build_long(source_path, digest)
+    data = hasil.data.dropna(subset=["Tahun"])
+
+    years = []
+    for tahun, part in data.groupby("Tahun", sort=True):
+        artifacts.write(part.reset_index(drop=True), partition_path(source_path, tahun), digest)
+        years.append(int(tahun))
+    artifacts.write(_cells(data), cube_path(source_path), digest)
+
+    manifest = {"digest": digest, "format_version": artifacts.FORMAT_VERSION, "years": years, "schema": hasil.schema}
+    artifacts.write_json(manifest, os.path.join(store_dir(source_path), MANIFEST))
+    if progress is not None:
+        progress(1.0, None)
+    return manifest
+
+
+def manifest(source_path, digest, progress=None):
+    """Manifest store; dibangun dulu kalau belum ada (sekali, walau diminta bersamaan)."""
+    with lock(digest):
+        return read_manifest(source_path, digest) or build(source_path, digest, progress=progress)
+
+
+def load_year(source_path, digest, tahun):
+    """DataFrame long untuk satu tahun saja (kosong kalau tahun tidak ada)."""
+    m = manifest(source_path, digest)
+    if int(tahun) not in m["years"]:
+        return pd.DataFrame(columns=KOLOM_KANONIK)
+
+    part = artifacts.read(partition_path(source_path, tahun), digest)
+    if part is None:
+        # partisi hilang / tidak bisa ditulis: bangun ulang sekali
+        build(source_path, digest)
+        part = artifacts.read(partition_path(source_path, tahun), digest)
+        if part is None:
+            data = build_long(source_path, digest).data
+            return data[data["Tahun"] == int(tahun)].reset_index(drop=True)
+    return part[0]
+
+
+def load_cells(source_path, digest):
+    """Sel cube (sudah teragregasi) untuk semua tahun; jauh lebih kecil dari data mentah."""
+    manifest(source_path, digest)
+    cells = artifacts.read(cube_path(source_path), digest)
+    if cells is None:
+        build(source_path, digest)
+        cells = artifacts.read(cube_path(source_path), digest)
+        if cells is None:
+            return _cells(build_long(source_path, digest).data.dropna(subset=["Tahun"]))
+    return cells[0]
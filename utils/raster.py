@@ -0,0 +1,179 @@
+# utils/raster.py
+# Mode hemat data: peta choropleth dan grafik dirender jadi gambar di server
+# (matplotlib lewat Figure langsung, bukan pyplot, supaya aman dipakai banyak
+# thread sesi sekaligus) dan dikirim sebagai gambar statis WebP / PNG,
+# bukan payload interaktif Vega / Leaflet.
+#
+# Gambar di-cache per (versi data, jenis, metrik, tahun, ukuran, format) di
+# cache LRU milik proses (dipakai bersama semua sesi); entri paling lama tidak
+# dipakai dibuang kalau jumlah entri atau total byte melewati batas.
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import LinearSegmentedColormap, Normalize, to_rgba
+from matplotlib.figure import Figure
+from PIL import Image, features
+
+from utils import topology
+from utils.geo import _per_feature
+
+KEY_HEMAT = "hemat_data"  # di session_state, bertahan antar halaman
+MAX_GAMBAR = 64
+MAX_BYTES = 32 * 1024 * 1024
+DPI = 100
+FORMAT = "webp" if features.check("webp") else "png"
+LEVEL_PETA = "sedang"  # level TopoJSON untuk peta statis (cukup untuk ~1000 px)
+
+# ukuran (lebar, tinggi) dalam piksel
+UKURAN = {
+    "kecil": (640, 360),
+    "sedang": (960, 480),
+    "besar": (1280, 640),
+}
+
+WARNA_PETA = LinearSegmentedColormap.from_list("kekerasan", ["#fde4ea", "#e68aa3", "#a3234a"])
+
+
+class ImageCache:
+    """Cache LRU bytes gambar, aman dipakai dari banyak thread."""
+
+    def __init__(self, max_entries=MAX_GAMBAR, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        # render di luar lock supaya sesi lain tidak menunggu
+        data = render()
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = data
+                self._bytes += len(data)
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, lama = self._data.popitem(last=False)
+                self._bytes -= len(lama)
+        return data
+
+
+@st.cache_resource
+def image_cache():
+    return ImageCache()
+
+
+def low_bandwidth_toggle():
+    """Toggle sidebar "Mode hemat data"; pilihan bertahan saat pindah halaman."""
+    nilai = st.sidebar.toggle(
+        "📶 Mode hemat data",
+        value=st.session_state.get(KEY_HEMAT, False),
+        key="_toggle_hemat",
+        help="Peta dan grafik dikirim sebagai gambar statis (WebP/PNG) yang dirender di server.",
+    )
+    st.session_state[KEY_HEMAT] = nilai
+    return nilai
+
+
+def _simpan(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=DPI)
+    if FORMAT == "png":
+        return buf.getvalue()
+    buf.seek(0)
+    out = io.BytesIO()
+    Image.open(buf).save(out, format="WEBP", quality=85, method=4)
+    return out.getvalue()
+
+
+def _figure(ukuran):
+    w, h = UKURAN[ukuran]
+    return Figure(figsize=(w / DPI, h / DPI), dpi=DPI)
+
+
+# ---------- render ----------
+
+def _render_bar(labels, values, title, color, ukuran, horizontal):
+    fig = _figure(ukuran)
+    ax = fig.add_subplot()
+    if horizontal:
+        ax.barh(labels[::-1], values[::-1], color=color)
+        ax.set_xlabel(title)
+    else:
+        ax.bar(labels, values, color=color)
+        ax.set_ylabel(title)
+        ax.tick_params(axis="x", labelrotation=90, labelsize=7)
+    ax.spines[["top", "right"]].set_visible(False)
+    fig.tight_layout()
+    return _simpan(fig)
+
+
+def _render_pie(labels, values, ukuran):
+    fig = _figure(ukuran)
+    ax = fig.add_subplot()
+    ax.pie(values, labels=labels, textprops={"fontsize": 7}, wedgeprops={"width": 0.5})
+    ax.set_aspect("equal")
+    fig.tight_layout()
+    return _simpan(fig)
+
+
+def _render_choropleth(geo_path, geo_digest, nilai, caption, ukuran):
+    topo = topology.load_level(geo_path, LEVEL_PETA, geo_digest)
+    poligon, idx = [], []
+    for i, (_, polys) in enumerate(topology.features(topo)):
+        for poly in polys:
+            poligon.append(poly[0])  # lubang diabaikan: tidak terlihat di ukuran ini
+            idx.append(i)
+    v = nilai[np.asarray(idx)]
+
+    ada = np.isfinite(nilai)
+    norm = Normalize(vmin=np.nanmin(nilai) if ada.any() else 0, vmax=np.nanmax(nilai) if ada.any() else 1)
+    warna = np.where(np.isfinite(v)[:, None], WARNA_PETA(norm(np.nan_to_num(v))), to_rgba("#cccccc"))
+
+    fig = _figure(ukuran)
+    ax = fig.add_subplot()
+    ax.add_collection(PolyCollection(poligon, facecolors=warna, edgecolors="white", linewidths=0.3))
+    ax.autoscale_view()
+    ax.set_aspect("equal")
+    ax.set_axis_off()
+    sm = ScalarMappable(norm=norm, cmap=WARNA_PETA)
+    fig.colorbar(sm, ax=ax, orientation="horizontal", fraction=0.04, pad=0.02, label=caption)
+    fig.tight_layout()
+    return _simpan(fig)
+
+
+# ---------- API (dengan cache) ----------
+
+def bar_image(data_versi, metric, tahun, series, title, color="#4c78a8", ukuran="sedang", horizontal=False):
+    """Bytes gambar bar chart dari Series (index = label)."""
+    key = ("bar", data_versi, metric, tahun, ukuran, horizontal, FORMAT)
+    labels = [str(x) for x in series.index]
+    values = series.to_numpy()
+    return image_cache().get_or_render(key, lambda: _render_bar(labels, values, title, color, ukuran, horizontal))
+
+
+def pie_image(data_versi, metric, tahun, series, ukuran="kecil"):
+    """Bytes gambar donut chart dari Series (index = label)."""
+    key = ("pie", data_versi, metric, tahun, ukuran, FORMAT)
+    labels = [str(x) for x in series.index]
+    values = series.to_numpy()
+    return image_cache().get_or_render(key, lambda: _render_pie(labels, values, ukuran))
+
+
+def choropleth_image(geo, data_versi, metric, tahun, codes, values, caption, ukuran="besar"):
+    """Bytes gambar peta choropleth provinsi (join lewat kode wilayah, lihat utils/geo.py)."""
+    key = ("peta", geo.digest, data_versi, metric, tahun, ukuran, FORMAT)
+
+    def render():
+        nilai = _per_feature(geo, codes, values)
+        return _render_choropleth(geo.path, geo.digest, nilai, caption, ukuran)
+
+    return image_cache().get_or_render(key, render)
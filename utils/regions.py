@@ -0,0 +1,157 @@
+# utils/regions.py
+# Registry wilayah kanonik: kode BPS, nama baku, alias, dan level hierarki.
+#
+# Semua dataset diberi kolom "Kode" (int) saat dimuat, jadi join antar data
+# (CSV <-> CSV, CSV <-> GeoJSON) adalah operasi integer tervektor, bukan
+# pencocokan string tiap render. Pencocokan nama hanya dilakukan sekali per
+# nilai unik (kolom kategori: sekali per kategori). Nama yang tidak dikenal
+# dicatat sekali per (sumber, nama) ke log dan bisa dibaca lewat unmatched();
+# data yang dimuat dari artefak (tanpa with_codes) melapor lewat report_unmatched().
+#
+# Catatan: KODE_PROV di indonesia-provinsi.json belum memisahkan provinsi
+# pemekaran Papua (semua 91 / 92); kode di sini mengikuti BPS (93-96).
+import logging
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+KODE_NASIONAL = 0
+KODE_TIDAK_DIKENAL = -1
+LEVEL_NEGARA = "negara"
+LEVEL_PROVINSI = "provinsi"
+
+Region = namedtuple("Region", ["kode", "nama", "level", "induk", "alias"])
+
+# (kode BPS, nama baku, alias)
+_PROVINSI = [
+    (11, "ACEH", ["NANGGROE ACEH DARUSSALAM", "NAD"]),
+    (12, "SUMATERA UTARA", ["SUMUT"]),
+    (13, "SUMATERA BARAT", ["SUMBAR"]),
+    (14, "RIAU", []),
+    (15, "JAMBI", []),
+    (16, "SUMATERA SELATAN", ["SUMSEL"]),
+    (17, "BENGKULU", []),
+    (18, "LAMPUNG", []),
+    (19, "KEPULAUAN BANGKA BELITUNG", ["BANGKA BELITUNG", "KEP BANGKA BELITUNG", "BABEL"]),
+    (21, "KEPULAUAN RIAU", ["KEP RIAU", "KEPRI"]),
+    (31, "DKI JAKARTA", ["DAERAH KHUSUS IBUKOTA JAKARTA", "JAKARTA"]),
+    (32, "JAWA BARAT", ["JABAR"]),
+    (33, "JAWA TENGAH", ["JATENG"]),
+    (34, "DI YOGYAKARTA", ["DAERAH ISTIMEWA YOGYAKARTA", "YOGYAKARTA", "DIY"]),
+    (35, "JAWA TIMUR", ["JATIM"]),
+    (36, "BANTEN", []),
+    (51, "BALI", []),
+    (52, "NUSA TENGGARA BARAT", ["NTB"]),
+    (53, "NUSA TENGGARA TIMUR", ["NTT"]),
+    (61, "KALIMANTAN BARAT", ["KALBAR"]),
+    (62, "KALIMANTAN TENGAH", ["KALTENG"]),
+    (63, "KALIMANTAN SELATAN", ["KALSEL"]),
+    (64, "KALIMANTAN TIMUR", ["KALTIM"]),
+    (65, "KALIMANTAN UTARA", ["KALTARA"]),
+    (71, "SULAWESI UTARA", ["SULUT"]),
+    (72, "SULAWESI TENGAH", ["SULTENG"]),
+    (73, "SULAWESI SELATAN", ["SULSEL"]),
+    (74, "SULAWESI TENGGARA", ["SULTRA"]),
+    (75, "GORONTALO", []),
+    (76, "SULAWESI BARAT", ["SULBAR"]),
+    (81, "MALUKU", []),
+    (82, "MALUKU UTARA", ["MALUT"]),
+    (91, "PAPUA", []),
+    (92, "PAPUA BARAT", []),
+    (93, "PAPUA SELATAN", []),
+    (94, "PAPUA TENGAH", []),
+    (95, "PAPUA PEGUNUNGAN", []),
+    (96, "PAPUA BARAT DAYA", []),
+]
+
+
+def normalize_name(name):
+    """Kunci pencocokan nama wilayah: huruf besar, titik dibuang, spasi dirapikan."""
+    return " ".join(str(name).upper().replace(".", " ").split())
+
+
+class RegionRegistry:
+    def __init__(self, regions):
+        self.regions = {r.kode: r for r in regions}
+        self._kunci = {}
+        for r in regions:
+            for n in [r.nama, *r.alias]:
+                self._kunci[normalize_name(n)] = r.kode
+        # lookup kode -> posisi di tabel nama (untuk names() tervektor)
+        kode = np.array(sorted(self.regions), dtype=np.int64)
+        self._nama = np.array([self.regions[k].nama for k in kode], dtype=object)
+        self._pos = np.full(kode.max() + 1, -1, dtype=np.int64)
+        self._pos[kode] = np.arange(len(kode))
+        self._tidak_cocok = {}
+        self._lock = threading.Lock()
+
+    def code(self, name):
+        """Kode wilayah untuk satu nama, KODE_TIDAK_DIKENAL kalau tidak ada di registry."""
+        return self._kunci.get(normalize_name(name), KODE_TIDAK_DIKENAL)
+
+    def encode(self, s, sumber=None):
+        """Array kode (int16) untuk Series nama; nama dicocokkan sekali per nilai unik."""
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+        else:
+            codes, uniques = pd.factorize(s)
+        # posisi terakhir = nilai kosong (kode -1 dari factorize / cat.codes)
+        per_unik = np.array([self.code(n) for n in uniques] + [KODE_TIDAK_DIKENAL], dtype=np.int16)
+        self._laporkan([n for n, k in zip(uniques, per_unik) if k == KODE_TIDAK_DIKENAL], sumber)
+        return per_unik[codes]
+
+    def _laporkan(self, names, sumber):
+        if not names:
+            return
+        with self._lock:
+            sudah = self._tidak_cocok.setdefault(sumber, set())
+            baru = [n for n in names if n not in sudah]
+            sudah.update(baru)
+        if baru:
+            logger.warning("Nama wilayah tidak dikenal%s: %s", f" di {sumber}" if sumber else "", ", ".join(map(str, baru)))
+
+    def unmatched(self, sumber=None):
+        """Nama tak dikenal yang pernah ditemui (per sumber, atau semua)."""
+        with self._lock:
+            if sumber is not None:
+                return sorted(map(str, self._tidak_cocok.get(sumber, ())))
+            return sorted({str(n) for s in self._tidak_cocok.values() for n in s})
+
+    def names(self, codes):
+        """Nama baku untuk array kode (None untuk kode tak dikenal)."""
+        codes = np.asarray(codes, dtype=np.int64)
+        ok = (codes >= 0) & (codes < len(self._pos))
+        pos = np.where(ok, self._pos[np.where(ok, codes, 0)], -1)
+        return np.where(pos >= 0, self._nama[np.maximum(pos, 0)], None)
+
+    def level(self, kode):
+        r = self.regions.get(int(kode))
+        return None if r is None else r.level
+
+    def provinces(self):
+        """Kode semua provinsi (urut)."""
+        return sorted(k for k, r in self.regions.items() if r.level == LEVEL_PROVINSI)
+
+
+REGISTRY = RegionRegistry(
+    [Region(KODE_NASIONAL, "INDONESIA", LEVEL_NEGARA, None, ["NASIONAL", "TOTAL"])]
+    + [Region(k, nama, LEVEL_PROVINSI, KODE_NASIONAL, alias) for k, nama, alias in _PROVINSI]
+)
+
+
+def with_codes(df, col, sumber=None, drop_nasional=True):
+    """df + kolom "Kode" (int16) dari kolom nama `col`; baris total nasional dibuang."""
+    kode = REGISTRY.encode(df[col], sumber)
+    df = df.assign(Kode=kode)
+    if drop_nasional:
+        df = df[kode != KODE_NASIONAL].reset_index(drop=True)
+    return df
+
+
+def report_unmatched(df, col, sumber=None):
+    """Catat nama tak dikenal (Kode = KODE_TIDAK_DIKENAL) dari df yang sudah berkode, mis. artefak cache."""
+    REGISTRY._laporkan(list(df.loc[df["Kode"] == KODE_TIDAK_DIKENAL, col].unique()), sumber)
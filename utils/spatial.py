@@ -0,0 +1,225 @@
+# utils/spatial.py
+# Indeks spasial batas wilayah: klik -> provinsi, dan filter viewport.
+#
+# Dibangun SEKALI per versi GeoJSON (st.cache_resource):
+# - STR-tree (Sort-Tile-Recursive) atas bbox tiap polygon (pulau), bukan bbox
+#   MultiPolygon provinsi yang bisa sangat lebar dan saling tumpang tindih.
+# - Ring disimpan sebagai array numpy, jadi uji titik-dalam-polygon (ray
+#   casting) hanya dijalankan untuk kandidat hasil STR-tree, tervektorisasi.
+# - Centroid (berbobot luas) dan titik label (selalu di dalam polygon
+#   terbesar) per feature.
+#
+# Benchmark:  python -m utils.spatial
+import time
+
+import numpy as np
+import streamlit as st
+
+from utils.ingest import file_hash
+
+KAPASITAS = 16  # jumlah anak per node STR-tree
+
+
+def _area_centroid(r):
+    x, y = r[:, 0], r[:, 1]
+    x1, y1 = np.roll(x, -1), np.roll(y, -1)
+    c = x * y1 - x1 * y
+    a = c.sum() / 2.0
+    if a == 0:
+        return 0.0, r.mean(axis=0)
+    return a, np.array([((x + x1) * c).sum(), ((y + y1) * c).sum()]) / (6.0 * a)
+
+
+def _inside(ring, x, y):
+    # ray casting satu titik terhadap satu ring (vektor atas semua sisi)
+    xi, yi = ring[:, 0], ring[:, 1]
+    xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+    lintas = (yi > y) != (yj > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xc = (xj - xi) * (y - yi) / (yj - yi) + xi
+    return bool(np.count_nonzero(lintas & (x < xc)) % 2)
+
+
+def _label_point(rings):
+    """Titik di dalam polygon: centroid kalau di dalam, kalau tidak tengah ruas terlebar pada garis y-centroid."""
+    luar = rings[0]
+    _, c = _area_centroid(luar)
+    if _inside(luar, c[0], c[1]) and not any(_inside(h, c[0], c[1]) for h in rings[1:]):
+        return c
+    y = c[1]
+    xs = []
+    for r in rings:
+        xi, yi = r[:, 0], r[:, 1]
+        xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+        m = (yi > y) != (yj > y)
+        xs.append((xj[m] - xi[m]) * (y - yi[m]) / (yj[m] - yi[m]) + xi[m])
+    xs = np.sort(np.concatenate(xs))
+    if len(xs) < 2:
+        return luar.mean(axis=0)
+    lebar = xs[1::2] - xs[0::2][: len(xs) // 2]
+    k = int(np.argmax(lebar))
+    return np.array([(xs[2 * k] + xs[2 * k + 1]) / 2.0, y])
+
+
+class _STRTree:
+    """STR-tree statis atas bbox (n,4) = (minx, miny, maxx, maxy)."""
+
+    def __init__(self, boxes, kapasitas=KAPASITAS):
+        urut = self._pack(boxes, kapasitas)
+        self.leaf_ids = urut
+        self.leaf_boxes = boxes[urut]
+        # tiap level (dari akar ke daun): bbox node, dan rentang [awal, akhir) anaknya di level bawah
+        self.levels = []
+        anak = self.leaf_boxes
+        while True:
+            awal = np.arange(0, len(anak), kapasitas)
+            akhir = np.minimum(awal + kapasitas, len(anak))
+            node = np.column_stack([
+                np.minimum.reduceat(anak[:, 0], awal),
+                np.minimum.reduceat(anak[:, 1], awal),
+                np.maximum.reduceat(anak[:, 2], awal),
+                np.maximum.reduceat(anak[:, 3], awal),
+            ])
+            if len(node) > 1:
+                # node di level ini juga di-pack STR sebelum dikelompokkan lagi
+                u = self._pack(node, kapasitas)
+                node, awal, akhir = node[u], awal[u], akhir[u]
+            self.levels.insert(0, (node, awal, akhir))
+            if len(node) == 1:
+                break
+            anak = node
+
+    @staticmethod
+    def _pack(boxes, kapasitas):
+        # Sort-Tile-Recursive: urut x, potong jadi S irisan vertikal, tiap irisan urut y
+        n = len(boxes)
+        cx = (boxes[:, 0] + boxes[:, 2]) / 2
+        cy = (boxes[:, 1] + boxes[:, 3]) / 2
+        s = max(1, int(np.ceil(np.sqrt(np.ceil(n / kapasitas)))))
+        per_irisan = s * kapasitas
+        by_x = np.argsort(cx, kind="stable")
+        hasil = [by_x[a:a + per_irisan] for a in range(0, n, per_irisan)]
+        return np.concatenate([i[np.argsort(cy[i], kind="stable")] for i in hasil])
+
+    @staticmethod
+    def _kena(b, minx, miny, maxx, maxy):
+        return (b[:, 0] <= maxx) & (b[:, 2] >= minx) & (b[:, 1] <= maxy) & (b[:, 3] >= miny)
+
+    def query(self, minx, miny, maxx, maxy):
+        """Id bbox (urutan asli) yang beririsan dengan kotak query."""
+        aktif = np.arange(len(self.levels[0][0]))
+        for node, awal, akhir in self.levels:
+            kena = aktif[self._kena(node[aktif], minx, miny, maxx, maxy)]
+            if len(kena) == 0:
+                return np.empty(0, dtype=np.int64)
+            aktif = np.concatenate([np.arange(awal[i], akhir[i]) for i in kena])
+        return self.leaf_ids[aktif[self._kena(self.leaf_boxes[aktif], minx, miny, maxx, maxy)]]
+
+
+class SpatialIndex:
+    """Indeks spasial feature GeoJSON: lookup titik, filter viewport, centroid, titik label."""
+
+    def __init__(self, geojson, keys=None, key="KODE_PROV"):
+        self.properties = [f["properties"] for f in geojson["features"]]
+        if keys is None:
+            keys = [int(p[key]) for p in self.properties]
+        self.keys = np.asarray(keys, dtype=np.int64)
+
+        self._rings = []  # per polygon: [ring (n,2) ...], ring pertama = batas luar
+        part_feature = []
+        centroid = np.zeros((len(self.properties), 2))
+        label = np.zeros((len(self.properties), 2))
+        for i, f in enumerate(geojson["features"]):
+            g = f["geometry"]
+            polys = g["coordinates"] if g["type"] == "MultiPolygon" else [g["coordinates"]]
+            luas_total, momen, terbesar = 0.0, np.zeros(2), (-1.0, None)
+            for poly in polys:
+                rings = [np.asarray(r, dtype=np.float64)[:, :2] for r in poly]
+                self._rings.append(rings)
+                part_feature.append(i)
+                a, c = _area_centroid(rings[0])
+                luas_total += abs(a)
+                momen += abs(a) * c
+                if abs(a) > terbesar[0]:
+                    terbesar = (abs(a), rings)
+            centroid[i] = momen / luas_total if luas_total else terbesar[1][0].mean(axis=0)
+            label[i] = _label_point(terbesar[1])
+
+        self.part_feature = np.asarray(part_feature, dtype=np.int64)
+        self.part_boxes = np.array([
+            [r[0][:, 0].min(), r[0][:, 1].min(), r[0][:, 0].max(), r[0][:, 1].max()] for r in self._rings
+        ])
+        self.feature_boxes = np.array([
+            np.r_[self.part_boxes[self.part_feature == i, :2].min(axis=0), self.part_boxes[self.part_feature == i, 2:].max(axis=0)]
+            for i in range(len(self.properties))
+        ])
+        self.centroids = centroid
+        self.label_points = label
+        self._tree = _STRTree(self.part_boxes)
+
+    def lookup(self, lon, lat):
+        """Posisi feature yang memuat titik (lon, lat), -1 kalau tidak ada."""
+        for part in self._tree.query(lon, lat, lon, lat):
+            rings = self._rings[part]
+            if _inside(rings[0], lon, lat) and not any(_inside(h, lon, lat) for h in rings[1:]):
+                return int(self.part_feature[part])
+        return -1
+
+    def key_at(self, lon, lat):
+        """Kode wilayah di titik (lon, lat), None kalau di luar semua wilayah."""
+        i = self.lookup(lon, lat)
+        return None if i < 0 else int(self.keys[i])
+
+    def in_view(self, west, south, east, north):
+        """Posisi feature (urut, unik) yang punya polygon di dalam viewport."""
+        return np.unique(self.part_feature[self._tree.query(west, south, east, north)])
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _index(digest, _geojson, _codes):
+    return SpatialIndex(_geojson, _codes)
+
+
+def index(geo):
+    """SpatialIndex untuk ProvinceGeo (utils/geo.py) dengan kode wilayah kanonik, dibangun sekali per versi GeoJSON."""
+    return _index(geo.digest, geo.geojson, geo.codes)
+
+
+def benchmark(path=None, n=10_000, seed=0):
+    import json
+
+    from utils.geo import GEOJSON
+
+    path = path or GEOJSON
+    with open(path, encoding="utf-8") as fh:
+        geojson = json.load(fh)
+    t0 = time.perf_counter()
+    idx = SpatialIndex(geojson)
+    t_build = time.perf_counter() - t0
+
+    rng = np.random.default_rng(seed)
+    titik = np.column_stack([rng.uniform(95, 141, n), rng.uniform(-11, 6, n)])
+    t0 = time.perf_counter()
+    hasil = [idx.lookup(x, y) for x, y in titik]
+    t_lookup = (time.perf_counter() - t0) / n
+
+    # pembanding: uji semua polygon tanpa indeks
+    t0 = time.perf_counter()
+    for x, y in titik[:500]:
+        for part, rings in enumerate(idx._rings):
+            if _inside(rings[0], x, y):
+                break
+    t_naif = (time.perf_counter() - t0) / 500
+
+    return {
+        "polygon": len(idx._rings),
+        "build (ms)": round(t_build * 1000, 1),
+        "lookup STR-tree (ms)": round(t_lookup * 1000, 4),
+        "lookup tanpa indeks (ms)": round(t_naif * 1000, 3),
+        "titik di darat": int(np.count_nonzero(np.asarray(hasil) >= 0)),
+        "file": file_hash(path)[:12],
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
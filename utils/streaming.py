@@ -0,0 +1,101 @@
+# utils/streaming.py
+# Ingestion bertahap (chunked) untuk file CSV besar, mis. ekspor nasional
+# level kasus berukuran beberapa GB.
+#
+# File dibaca per CHUNK_ROWS baris; tiap chunk diubah ke bentuk long lalu
+# langsung diagregasi ke RunningAggregate (total, per provinsi, sel
+# Tahun x Provinsi x Jenis beserta jumlah baris mentah per sel). Memori
+# dibatasi oleh jumlah sel unik, bukan ukuran file. Progres (fraksi byte
+# terbaca) dilaporkan lewat callback.
+import os
+
+import pandas as pd
+
+from utils import artifacts
+from utils.ingest import KOLOM_KANONIK, IngestResult, detect_schema, to_long
+from utils.loader import sniff
+from utils.regions import report_unmatched, with_codes
+
+# file CSV >= ukuran ini dibaca bertahap
+STREAM_THRESHOLD = 64 * 1024 * 1024
+CHUNK_ROWS = 250_000
+
+
+class RunningAggregate:
+    def __init__(self):
+        self.total = 0
+        self.n_baris = 0
+        self.cells = None
+        self.per_provinsi = pd.Series(dtype="float64")
+
+    def update(self, chunk_long):
+        """Tambahkan satu chunk bentuk long kanonik ke agregat berjalan."""
+        c = chunk_long.groupby(["Tahun", "Provinsi", "Jenis"]).agg(Jumlah=("Jumlah", "sum"), Baris=("Jumlah", "size"))
+        self.cells = c if self.cells is None else self.cells.add(c, fill_value=0)
+        jumlah = c["Jumlah"]
+        self.per_provinsi = self.per_provinsi.add(jumlah.groupby(level="Provinsi").sum(), fill_value=0)
+        self.total += int(jumlah.sum())
+        self.n_baris += len(chunk_long)
+
+    def top_provinsi(self, n=10):
+        return self.per_provinsi.sort_values(ascending=False).head(n)
+
+    def summary(self, n=3):
+        """Teks progres: total sejauh ini + n provinsi teratas sementara."""
+        teks = f"{self.total:,} kasus dari {self.n_baris:,} baris"
+        top = self.top_provinsi(n)
+        if not top.empty:
+            teks += " · teratas: " + ", ".join(f"{p} ({int(v):,})" for p, v in top.items())
+        return teks
+
+    def to_long(self):
+        """Sel agregat sebagai frame long kanonik + "Baris" (jumlah baris mentah per sel)."""
+        if self.cells is None:
+            return pd.DataFrame(columns=KOLOM_KANONIK + ["Baris"])
+        return self.cells.reset_index()[KOLOM_KANONIK + ["Baris"]]
+
+
+def should_stream(path, digest=None):
+    return os.path.getsize(path) >= STREAM_THRESHOLD and sniff(path, digest).format == "csv"
+
+
+def stream_aggregate(path, digest=None, chunksize=None, progress=None):
+    """Baca CSV per chunk dan kembalikan (RunningAggregate, schema).
+
+    `progress(fraksi, agregat)` dipanggil setelah tiap chunk.
+    """
+    d = sniff(path, digest)
+    size = max(os.path.getsize(path), 1)
+    agg = RunningAggregate()
+    schema = None
+    with open(path, "rb") as fh:
+        # engine "c": engine pyarrow belum mendukung chunksize
+        for chunk in pd.read_csv(fh, sep=d.sep, encoding=d.encoding, chunksize=chunksize or CHUNK_ROWS, engine="c"):
+            chunk.columns = [str(c).strip() for c in chunk.columns]
+            if schema is None:
+                schema = detect_schema(chunk)
+            agg.update(to_long(chunk, schema))
+            if progress is not None:
+                progress(min(fh.tell() / size, 1.0), agg)
+    if schema is None:
+        raise ValueError(f"File kosong: {path}")
+    return agg, schema
+
+
+def build_long(path, digest, progress=None):
+    """Seperti ingest.build_long, tapi file sumber dibaca bertahap.
+
+    Frame long yang dihasilkan sudah teragregasi per (Tahun, Provinsi, Jenis);
+    kolom "Baris" menyimpan berapa baris mentah yang masuk ke tiap sel.
+    """
+    cached = artifacts.load(path, digest)
+    if cached is not None:
+        data, extra = cached
+        report_unmatched(data, "Provinsi", sumber=os.path.basename(path))
+        return IngestResult(digest, data, extra["schema"])
+
+    agg, schema = stream_aggregate(path, digest, progress=progress)
+    data = artifacts.compact(agg.to_long(), category_cols=["Provinsi", "Jenis"], int_cols=["Jumlah", "Tahun", "Baris"])
+    data = with_codes(data, "Provinsi", sumber=os.path.basename(path))
+    artifacts.save(data, path, digest, {"schema": schema})
+    return IngestResult(digest, data, schema)
@@ -0,0 +1,206 @@
+# utils/synthetic.py
+# Generator data mikro sintetis: kasus dengan satu korban dan satu pelaku
+# yang saling terhubung (kolom "ID Kasus").
+#
+# - Memakai np.random.Generator milik sendiri (bukan np.random.seed global),
+#   jadi halaman lain / thread lain tidak saling mengganggu state RNG.
+# - Dibuat per batch BATCH baris secara tervektor; tiap batch punya seed anak
+#   sendiri dari SeedSequence(seed).spawn(), jadi hasil (seed, n) selalu sama.
+# - Bobot provinsi diambil dari total kasus per provinsi di
+#   data_kekerasan_perempuan.csv (semua tahun).
+# - Relasi pelaku dari sisi korban = status pelaku dari sisi pelaku; usia
+#   pelaku dibangkitkan relatif terhadap usia korban; "Suami" hanya untuk
+#   korban >= USIA_MENIKAH dan selalu laki-laki.
+# - Kolom atribut disimpan sebagai Categorical (kode int8) dengan kamus
+#   (CategoricalDtype) bersama: "Relasi Pelaku" korban dan "Status" pelaku
+#   memakai kamus yang sama, jadi kodenya bisa dibandingkan langsung. Usia
+#   disimpan sebagai uint8. Lihat utils/codes.py untuk hitungan & laporan memori.
+# - Hasil di-cache per (seed, n, parameter, versi data) di proses, jadi
+#   halaman profil korban & pelaku serta benchmark memakai generator yang sama.
+#
+# Benchmark:  python -m utils.synthetic
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import matrix, source_path, years
+from utils.ingest import file_hash
+from utils.regions import REGISTRY
+
+BATCH = 1_000_000
+N_DEFAULT = 300
+SEED_DEFAULT = 42
+UKURAN_N = [300, 10_000, 100_000, 1_000_000]
+KEY_N = "sintetis_n"  # di session_state, bertahan antar halaman
+KEY_SEED = "sintetis_seed"
+
+PENDIDIKAN = ("SD", "SMP", "SMA", "D3/S1", "Tidak Sekolah")
+PEKERJAAN_KORBAN = ("Pelajar", "Ibu Rumah Tangga", "Pekerja Formal", "Buruh", "Tidak Bekerja")
+RELASI = ("Keluarga", "Teman", "Pacar", "Suami", "Tetangga", "Orang Asing")
+JENIS_KELAMIN = ("Laki-laki", "Perempuan")
+PEKERJAAN_PELAKU = ("Pengangguran", "Buruh", "Pegawai", "Wiraswasta", "Pelajar")
+USIA_MENIKAH = 16
+
+# kamus bersama (kode int8) untuk kolom atribut
+DTYPE_PENDIDIKAN = pd.CategoricalDtype(PENDIDIKAN)
+DTYPE_PEKERJAAN_KORBAN = pd.CategoricalDtype(PEKERJAAN_KORBAN)
+DTYPE_RELASI = pd.CategoricalDtype(RELASI)  # "Relasi Pelaku" (korban) = "Status" (pelaku)
+DTYPE_JENIS_KELAMIN = pd.CategoricalDtype(JENIS_KELAMIN)
+DTYPE_PEKERJAAN_PELAKU = pd.CategoricalDtype(PEKERJAAN_PELAKU)
+
+# usia: rentang [min, max) korban & pelaku; selisih usia pelaku - korban ~ Normal(rata, sd)
+Params = namedtuple(
+    "Params",
+    ["usia_korban", "usia_pelaku", "selisih_usia", "p_laki", "p_relasi"],
+    defaults=[(5, 70), (15, 70), (5.0, 12.0), 0.9, None],
+)
+
+Synthetic = namedtuple("Synthetic", ["korban", "pelaku"])
+
+
+def province_weights(path=None):
+    """(nama provinsi, bobot) dari total kasus per provinsi data kekerasan, semua tahun.
+
+    Tanpa file data: semua provinsi registry dengan bobot sama.
+    """
+    if path is None and source_path("kekerasan") is None:
+        nama = list(REGISTRY.names(REGISTRY.provinces()))
+        return nama, np.full(len(nama), 1.0 / len(nama))
+    total = {}
+    for tahun in years(path):
+        mtx = matrix(tahun, path)
+        for nama, jumlah in zip(mtx.rows, mtx.row_totals):
+            total[nama] = total.get(nama, 0) + int(jumlah)
+    nama = list(total)
+    bobot = np.array([total[n] for n in nama], dtype=np.float64)
+    if bobot.sum() <= 0:
+        bobot = np.ones(len(nama))
+    return nama, bobot / bobot.sum()
+
+
+def _pilih(rng, k, n, p=None):
+    # indeks kategori dengan peluang p (tanpa p = seragam); dtype terkecil yang
+    # memuat k kategori (uint8 s.d. 256, lebih dari itu uint16 / uint32)
+    dtype = np.min_scalar_type(max(k - 1, 0))
+    if p is None:
+        return rng.integers(0, k, n, dtype=dtype)
+    return np.searchsorted(np.cumsum(p), rng.random(n) * np.sum(p), side="right").clip(0, k - 1).astype(dtype)
+
+
+def _batch(rng, n, params, bobot_prov):
+    lo, hi = params.usia_korban
+    usia_k = rng.integers(lo, hi, n)
+    relasi = _pilih(rng, len(RELASI), n, params.p_relasi)
+    suami = RELASI.index("Suami")
+    # korban di bawah umur tidak dipasangkan dengan "Suami"
+    relasi[(relasi == suami) & (usia_k < USIA_MENIKAH)] = RELASI.index("Keluarga")
+
+    rata, sd = params.selisih_usia
+    lo_p, hi_p = params.usia_pelaku
+    usia_p = np.clip(np.rint(usia_k + rng.normal(rata, sd, n)), lo_p, hi_p - 1).astype(np.uint8)
+    laki = (rng.random(n) < params.p_laki) | (relasi == suami)
+    prov = _pilih(rng, len(bobot_prov), n, bobot_prov)
+
+    return {
+        "prov": prov.astype(np.promote_types(prov.dtype, np.int16)),  # kode wilayah: minimal int16
+        "usia_k": usia_k.astype(np.uint8),
+        "pendidikan": _pilih(rng, len(PENDIDIKAN), n),
+        "pekerjaan_k": _pilih(rng, len(PEKERJAAN_KORBAN), n),
+        "relasi": relasi,
+        "usia_p": usia_p,
+        "jk": np.where(laki, 0, 1).astype(np.uint8),
+        "pekerjaan_p": _pilih(rng, len(PEKERJAAN_PELAKU), n),
+    }
+
+
+def generate(n, seed=SEED_DEFAULT, params=Params(), provinsi=None):
+    """Synthetic(korban, pelaku): n kasus sintetis, dibangkitkan per batch tervektor.
+
+    `provinsi` = (nama, bobot); default province_weights() dari data kekerasan.
+    """
+    nama_prov, bobot_prov = provinsi if provinsi is not None else province_weights()
+    n_batch = max(1, -(-n // BATCH))
+    anak = np.random.SeedSequence(seed).spawn(n_batch)
+    bagian = []
+    for i, ss in enumerate(anak):
+        ukuran = min(BATCH, n - i * BATCH)
+        bagian.append(_batch(np.random.Generator(np.random.PCG64(ss)), max(ukuran, 0), params, bobot_prov))
+    kol = {k: np.concatenate([b[k] for b in bagian]) for k in bagian[0]}
+
+    def kategori(codes, dtype):
+        return pd.Categorical.from_codes(codes, dtype=dtype)
+
+    id_kasus = np.arange(1, n + 1, dtype=np.int32)
+    provinsi = kategori(kol["prov"], pd.CategoricalDtype(nama_prov))
+    korban = pd.DataFrame({
+        "ID Kasus": id_kasus,
+        "Provinsi": provinsi,
+        "Kode": REGISTRY.encode(pd.Series(provinsi), sumber="sintetis"),
+        "Usia": kol["usia_k"],
+        "Pendidikan": kategori(kol["pendidikan"], DTYPE_PENDIDIKAN),
+        "Pekerjaan": kategori(kol["pekerjaan_k"], DTYPE_PEKERJAAN_KORBAN),
+        "Relasi Pelaku": kategori(kol["relasi"], DTYPE_RELASI),
+    })
+    pelaku = pd.DataFrame({
+        "ID Kasus": id_kasus,
+        "Usia": kol["usia_p"],
+        "Jenis Kelamin": kategori(kol["jk"], DTYPE_JENIS_KELAMIN),
+        "Status": kategori(kol["relasi"], DTYPE_RELASI),
+        "Pekerjaan": kategori(kol["pekerjaan_p"], DTYPE_PEKERJAAN_PELAKU),
+    })
+    return Synthetic(korban, pelaku)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Membangkitkan data sintetis…")
+def _dataset(seed, n, params, digest):
+    return generate(n, seed, params, province_weights(source_path("kekerasan")))
+
+
+def controls():
+    """Kontrol sidebar (jumlah kasus, seed); pilihan dipakai bersama halaman korban & pelaku."""
+    with st.sidebar.expander("🎲 Data sintetis"):
+        n = st.select_slider(
+            "Jumlah kasus",
+            options=UKURAN_N,
+            value=st.session_state.get(KEY_N, N_DEFAULT),
+            key="_sintetis_n",
+            format_func=lambda v: f"{v:,}",
+        )
+        seed = st.number_input("Seed", 0, 2**31 - 1, value=st.session_state.get(KEY_SEED, SEED_DEFAULT), key="_sintetis_seed")
+    st.session_state[KEY_N] = n
+    st.session_state[KEY_SEED] = seed
+    return n, seed
+
+
+def data_version():
+    """Versi data kekerasan yang dipakai untuk bobot provinsi (SHA-256 file, None tanpa file)."""
+    path = source_path("kekerasan")
+    return file_hash(path) if path else None
+
+
+def dataset(n=N_DEFAULT, seed=SEED_DEFAULT, params=Params()):
+    """Synthetic(korban, pelaku) yang di-cache per (seed, n, parameter, versi data kekerasan)."""
+    return _dataset(int(seed), int(n), params, data_version())
+
+
+def benchmark(ukuran=(100_000, 1_000_000, 5_000_000), seed=0):
+    provinsi = province_weights()
+    hasil = []
+    for n in ukuran:
+        t0 = time.perf_counter()
+        data = generate(n, seed, provinsi=provinsi)
+        detik = time.perf_counter() - t0
+        hasil.append({
+            "n kasus": n,
+            "detik": round(detik, 3),
+            "kasus/detik": int(n / detik),
+            "MB (korban + pelaku)": round(sum(int(f.memory_usage(deep=True).sum()) for f in data) / 1e6, 1),
+        })
+    return pd.DataFrame(hasil)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
@@ -0,0 +1,297 @@
+# utils/tiles.py
+# Vector tile (Mapbox Vector Tile / .pbf) untuk batas wilayah.
+#
+# Build step: geometri TopoJSON (utils/topology.py, level sesuai zoom) dipotong
+# per tile Web Mercator z/x/y, di-encode sebagai MVT lalu disimpan sebagai file
+# static/tiles/<layer>/<versi>/<z>/<x>/<y>.pbf. Streamlit sendiri yang
+# menyajikannya (server.enableStaticServing, di /app/static/...), jadi tile
+# ikut origin halaman: jalan di browser jarak jauh, port forward, https, dan
+# tanpa port tambahan. Peta hanya mengambil tile yang sedang terlihat; versi
+# data ada di path & query URL, jadi tile aman di-cache lama oleh browser.
+# File batas lain (mis. kabupaten) cukup memakai url() dengan layer lain.
+#
+# Encoder MVT ditulis langsung (format protobuf-nya sederhana), tanpa
+# dependensi tambahan.  Build manual:  python -m utils.tiles
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import streamlit as st
+
+from utils import topology
+from utils.ingest import file_hash
+
+EXTENT = 4096
+BUFFER = 64  # piksel tile di luar batas yang ikut disimpan (hindari garis di tepi tile)
+MINZOOM = 3
+MAXZOOM = 8  # di atas ini klien memperbesar tile z8 (overzoom)
+STATIC_DIR = "static"  # folder static Streamlit (di sebelah app.py)
+TILES_DIR = os.path.join(STATIC_DIR, "tiles")
+META = "metadata.json"
+FORMAT_VERSION = "2"
+LAYER_PROVINSI = "provinsi"
+
+_build_lock = threading.Lock()
+
+
+# ---------- encoder MVT ----------
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _field(nomor, wire, isi):
+    if wire == 0:
+        return _varint(nomor << 3) + _varint(isi)
+    return _varint(nomor << 3 | 2) + _varint(len(isi)) + isi
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _packed(nilai):
+    return b"".join(_varint(v) for v in nilai)
+
+
+def _value(v):
+    if isinstance(v, (int, np.integer)) and v >= 0:
+        return _field(5, 0, int(v))  # uint_value
+    return _field(1, 2, str(v).encode())  # string_value
+
+
+def _geometry(rings):
+    """Perintah geometri MVT untuk ring (int (n,2), terbuka) yang sudah berorientasi benar."""
+    cmd = []
+    x = y = 0
+    for r in rings:
+        dx, dy = r[0, 0] - x, r[0, 1] - y
+        cmd += [1 | (1 << 3), _zigzag(int(dx)), _zigzag(int(dy))]  # MoveTo
+        d = np.diff(r, axis=0)
+        cmd.append(2 | (len(d) << 3))  # LineTo
+        for ddx, ddy in d.tolist():
+            cmd += [_zigzag(ddx), _zigzag(ddy)]
+        cmd.append(7 | (1 << 3))  # ClosePath
+        x, y = int(r[-1, 0]), int(r[-1, 1])
+    return cmd
+
+
+def encode_tile(layer, features):
+    """Bytes MVT satu layer; features: [(id, properties, [ring ...]), ...]."""
+    keys, values = {}, {}
+    isi = _field(15, 0, 2) + _field(1, 2, layer.encode())
+    for fid, props, rings in features:
+        tags = []
+        for k, v in props.items():
+            if v is None:
+                continue
+            tags += [keys.setdefault(k, len(keys)), values.setdefault((type(v).__name__, v), len(values))]
+        f = _field(1, 0, fid) + _field(2, 2, _packed(tags)) + _field(3, 0, 3) + _field(4, 2, _packed(_geometry(rings)))
+        isi += _field(2, 2, f)
+    isi += b"".join(_field(3, 2, k.encode()) for k in keys)
+    isi += b"".join(_field(4, 2, _value(v)) for _, v in values)
+    isi += _field(5, 0, EXTENT)
+    return _field(3, 2, isi)
+
+
+# ---------- pemotongan tile ----------
+
+def _mercator(lonlat, z):
+    """lon/lat -> koordinat tile pecahan pada zoom z."""
+    n = 2 ** z
+    lon, lat = lonlat[:, 0], np.clip(lonlat[:, 1], -85.0511, 85.0511)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - np.log(np.tan(np.radians(lat)) + 1 / np.cos(np.radians(lat))) / math.pi) / 2.0 * n
+    return np.column_stack([x, y])
+
+
+def _clip_edge(p, axis, batas, kurang):
+    # satu langkah Sutherland-Hodgman terhadap garis axis = batas (vektor)
+    if len(p) == 0:
+        return p
+    masuk = p[:, axis] <= batas if kurang else p[:, axis] >= batas
+    if masuk.all():
+        return p
+    q = np.roll(p, -1, axis=0)
+    silang = masuk != np.roll(masuk, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (batas - p[:, axis]) / (q[:, axis] - p[:, axis])
+        potong = p + t[:, None] * (q - p)
+    potong[:, axis] = batas
+    kandidat = np.stack([p, potong], axis=1).reshape(-1, 2)
+    pilih = np.stack([masuk, silang], axis=1).reshape(-1)
+    return kandidat[pilih]
+
+
+def _clip(p, lo, hi):
+    for axis in (0, 1):
+        p = _clip_edge(p, axis, lo, False)
+        p = _clip_edge(p, axis, hi, True)
+    return p
+
+
+def _area(r):
+    x, y = r[:, 0], r[:, 1]
+    return 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+
+def _tile_rings(polys, tx, ty):
+    """Ring polygon (koordinat tile pecahan) -> ring integer dalam satu tile, orientasi MVT."""
+    lo, hi = -BUFFER, EXTENT + BUFFER
+    hasil = []
+    for poly in polys:
+        ada_luar = False
+        for i, ring in enumerate(poly):
+            p = (ring[:-1] - (tx, ty)) * EXTENT
+            p = _clip(p, lo, hi)
+            if len(p) < 3:
+                continue
+            q = np.round(p).astype(np.int64)
+            keep = np.ones(len(q), dtype=bool)
+            keep[1:] = np.any(q[1:] != q[:-1], axis=1)
+            q = q[keep]
+            if len(q) > 1 and np.array_equal(q[0], q[-1]):
+                q = q[:-1]
+            a = _area(q) if len(q) >= 3 else 0.0
+            if a == 0:
+                continue
+            # MVT (y ke bawah): ring luar luas positif, lubang negatif
+            luar = i == 0
+            if not luar and not ada_luar:
+                continue
+            if (a > 0) != luar:
+                q = q[::-1]
+            ada_luar = ada_luar or luar
+            hasil.append(q)
+    return hasil
+
+
+def _cut_zoom(fitur, z):
+    """{(x, y): [(id, props, rings), ...]} untuk semua tile yang berisi geometri pada zoom z."""
+    tiles = {}
+    for fid, (props, polys) in enumerate(fitur):
+        proj = [[_mercator(r, z) for r in poly] for poly in polys]
+        per_tile = {}
+        for poly in proj:
+            lo = np.clip(np.floor(poly[0].min(axis=0) - BUFFER / EXTENT), 0, 2 ** z - 1).astype(int)
+            hi = np.clip(np.floor(poly[0].max(axis=0) + BUFFER / EXTENT), 0, 2 ** z - 1).astype(int)
+            for tx in range(lo[0], hi[0] + 1):
+                for ty in range(lo[1], hi[1] + 1):
+                    per_tile.setdefault((tx, ty), []).append(poly)
+        for (tx, ty), polys_tile in per_tile.items():
+            rings = _tile_rings(polys_tile, tx, ty)
+            if rings:
+                tiles.setdefault((tx, ty), []).append((fid, props, rings))
+    return tiles
+
+
+# ---------- file statis ----------
+
+def tile_dir(layer, digest):
+    """Folder tile satu versi data: static/tiles/<layer>/<digest>-v<format>/."""
+    return os.path.join(TILES_DIR, layer, f"{digest[:12]}-v{FORMAT_VERSION}")
+
+
+def tile_path(folder, z, x, y):
+    return os.path.join(folder, str(z), str(x), f"{y}.pbf")
+
+
+def build(source_path, digest=None, layer=LAYER_PROVINSI, minzoom=MINZOOM, maxzoom=MAXZOOM):
+    """Potong semua tile dari `source_path` (GeoJSON) ke folder tile_dir(); kembalikan ringkasan per zoom.
+
+    Tile ditulis ke folder sementara unik lalu di-rename sekaligus, jadi folder
+    versi data ini hanya terlihat kalau sudah lengkap.
+    """
+    digest = digest or file_hash(source_path)
+    final = tile_dir(layer, digest)
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=os.path.dirname(final), prefix=".build-")
+
+    ringkasan = []
+    try:
+        for z in range(minzoom, maxzoom + 1):
+            fitur = topology.features(topology.load_level(source_path, topology.level_for_zoom(z), digest))
+            tiles = _cut_zoom(fitur, z)
+            total = 0
+            for (x, y), isi in tiles.items():
+                data = encode_tile(layer, isi)
+                total += len(data)
+                path = tile_path(tmp, z, x, y)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as fh:
+                    fh.write(data)
+            ringkasan.append({"zoom": z, "tile": len(tiles), "KB": round(total / 1024, 1)})
+        meta = {"digest": digest, "format_version": FORMAT_VERSION, "layer": layer, "minzoom": minzoom, "maxzoom": maxzoom}
+        with open(os.path.join(tmp, META), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        try:
+            os.rename(tmp, final)
+        except OSError:
+            # proses lain sudah lebih dulu menyelesaikan folder yang sama
+            if not os.path.exists(os.path.join(final, META)):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    _prune(layer, final)
+    return ringkasan
+
+
+def _prune(layer, keep):
+    # hapus folder tile versi lama layer ini (build sementara milik proses lain dibiarkan)
+    folder = os.path.dirname(keep)
+    for nama in os.listdir(folder):
+        path = os.path.join(folder, nama)
+        if not nama.startswith(".") and path != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def ensure(source_path, digest=None, layer=LAYER_PROVINSI):
+    """Folder tile untuk `source_path`; dibangun dulu kalau belum ada (sekali per proses)."""
+    digest = digest or file_hash(source_path)
+    folder = tile_dir(layer, digest)
+    if not os.path.exists(os.path.join(folder, META)):
+        with _build_lock:
+            if not os.path.exists(os.path.join(folder, META)):
+                build(source_path, digest, layer)
+    return folder
+
+
+def read_tile(folder, z, x, y):
+    """Bytes tile atau None kalau tile itu kosong; y dalam skema XYZ."""
+    try:
+        with open(tile_path(folder, z, x, y), "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
+
+def url(layer, source_path):
+    """URL template tile untuk Leaflet, disajikan oleh server Streamlit sendiri.
+
+    Path-nya absolut terhadap origin halaman (mis. /app/static/tiles/...), jadi
+    ikut host, port dan https yang dipakai browser, juga dari dalam iframe peta.
+    """
+    digest = file_hash(source_path)
+    folder = ensure(source_path, digest, layer)
+    base = st.get_option("server.baseUrlPath").strip("/")
+    rel = os.path.relpath(folder, STATIC_DIR).replace(os.sep, "/")
+    return f"{'/' + base if base else ''}/app/static/{rel}/{{z}}/{{x}}/{{y}}.pbf?v={digest[:12]}"
+
+
+if __name__ == "__main__":
+    from utils.geo import GEOJSON
+
+    for baris in build(GEOJSON):
+        print(baris)
@@ -0,0 +1,359 @@
+# utils/topology.py
+# Build step: batas provinsi (GeoJSON) -> TopoJSON multi-resolusi.
+#
+# 1. Koordinat dikuantisasi ke grid integer (TopoJSON "transform").
+# 2. Titik junction (titik yang tetangganya berbeda antar ring) dicari,
+#    ring dipotong di junction jadi arc, dan arc yang sama (termasuk yang
+#    arahnya terbalik, mis. perbatasan dua provinsi) hanya disimpan sekali.
+# 3. Tiap arc disederhanakan dengan Douglas-Peucker; titik ujung (junction)
+#    selalu dipertahankan, jadi provinsi bertetangga tetap berbagi batas yang
+#    sama persis (topologi terjaga, tidak ada celah / tumpang tindih).
+# 4. Per level, pulau yang lebih kecil dari toleransi dibuang, koordinat
+#    dikuantisasi ulang ke grid yang lebih kasar dan di-delta-encode.
+#
+# Hasil ditulis ke <nama>_topo/<level>.topo.json (file sementara unik +
+# os.replace, build dikunci per proses), jadi pembaca tidak pernah melihat file
+# setengah jadi. Kalau disk read-only, level disimpan di memori proses saja.
+# Jalankan manual:
+#   python -m utils.topology
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils import artifacts
+from utils.ingest import file_hash
+
+OBJEK = "provinsi"
+Q_DASAR = 1_000_000  # jumlah langkah grid dasar sepanjang bbox (~5 m untuk Indonesia)
+
+# (nama level, toleransi dalam derajat); urut dari paling detail
+LEVELS = [
+    ("penuh", 0.0),
+    ("detail", 0.002),
+    ("sedang", 0.01),
+    ("kasar", 0.04),
+]
+
+_build_lock = threading.Lock()
+# level hasil build yang tidak bisa ditulis ke disk: {source_path: (digest, {level: topo})}
+_in_memory = {}
+
+
+def store_dir(source_path):
+    return os.path.splitext(source_path)[0] + "_topo"
+
+
+def level_path(source_path, level):
+    return os.path.join(store_dir(source_path), f"{level}.topo.json")
+
+
+def level_for_zoom(zoom):
+    """Level paling kasar yang kesalahannya masih < 1 piksel pada zoom Leaflet `zoom`."""
+    derajat_per_px = 360.0 / (256 * 2 ** zoom)
+    pilihan = LEVELS[0][0]
+    for nama, tol in LEVELS:
+        if tol <= derajat_per_px:
+            pilihan = nama
+    return pilihan
+
+
+# ---------- kuantisasi & arc ----------
+
+def _rings(geojson):
+    """[(feature, [polygon = [ring (n,2) float]]), ...] dari Polygon / MultiPolygon."""
+    hasil = []
+    for f in geojson["features"]:
+        g = f["geometry"]
+        polys = g["coordinates"] if g["type"] == "MultiPolygon" else [g["coordinates"]]
+        hasil.append([[np.asarray(r, dtype=np.float64)[:, :2] for r in poly] for poly in polys])
+    return hasil
+
+
+def _open_ring(q):
+    # buang titik berurutan yang sama (hasil kuantisasi) dan titik penutup
+    keep = np.ones(len(q), dtype=bool)
+    keep[1:] = np.any(q[1:] != q[:-1], axis=1)
+    q = q[keep]
+    if len(q) > 1 and np.array_equal(q[0], q[-1]):
+        q = q[:-1]
+    return q
+
+
+def _keys(q):
+    return (q[:, 0].astype(np.int64) << 32) | q[:, 1].astype(np.int64)
+
+
+def _junctions(rings):
+    """Set key titik junction dari semua ring terbuka."""
+    K, A, B = [], [], []
+    for q in rings:
+        if len(q) < 3:
+            continue
+        k = _keys(q)
+        prev, nxt = np.roll(k, 1), np.roll(k, -1)
+        K.append(k)
+        A.append(np.minimum(prev, nxt))
+        B.append(np.maximum(prev, nxt))
+    if not K:
+        return np.empty(0, dtype=np.int64)
+    trip = np.unique(np.stack([np.concatenate(K), np.concatenate(A), np.concatenate(B)], axis=1), axis=0)
+    keys, counts = np.unique(trip[:, 0], return_counts=True)
+    return keys[counts > 1]
+
+
+class _Arcs:
+    """Kumpulan arc unik; arc terbalik direferensikan sebagai ~indeks (konvensi TopoJSON)."""
+
+    def __init__(self):
+        self.arcs = []
+        self._index = {}
+
+    def add(self, q):
+        k = _keys(q)
+        fwd = k.tobytes()
+        if fwd in self._index:
+            return self._index[fwd]
+        rev = k[::-1].tobytes()
+        if rev in self._index:
+            return ~self._index[rev]
+        self._index[fwd] = len(self.arcs)
+        self.arcs.append(q)
+        return len(self.arcs) - 1
+
+
+def _cut(q, is_junction, arcs):
+    """Potong satu ring terbuka jadi arc; kembalikan daftar indeks arc."""
+    k = _keys(q)
+    pos = np.flatnonzero(is_junction(k))
+    if len(pos) == 0:
+        # ring tanpa junction (pulau): satu arc tertutup, mulai dari key terkecil
+        # supaya ring identik di dua feature (searah atau terbalik) dikenali sebagai arc yang sama
+        rot = np.roll(q, -int(np.argmin(k)), axis=0)
+        return [arcs.add(np.vstack([rot, rot[:1]]))]
+    rot = np.roll(q, -pos[0], axis=0)
+    pos = np.append(pos - pos[0], len(q))
+    closed = np.vstack([rot, rot[:1]])
+    return [arcs.add(closed[a:b + 1]) for a, b in zip(pos[:-1], pos[1:])]
+
+
+# ---------- penyederhanaan ----------
+
+def _douglas_peucker(p, tol):
+    """Mask titik yang dipertahankan (p: (n,2) float, ujung selalu dipertahankan)."""
+    n = len(p)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    if tol <= 0 or n <= 2:
+        keep[:] = True
+        return keep
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        seg = p[i + 1:j]
+        a, b = p[i], p[j]
+        ab = b - a
+        norm = np.hypot(ab[0], ab[1])
+        if norm == 0:
+            d = np.hypot(seg[:, 0] - a[0], seg[:, 1] - a[1])
+        else:
+            d = np.abs(ab[0] * (seg[:, 1] - a[1]) - ab[1] * (seg[:, 0] - a[0])) / norm
+        m = int(np.argmax(d))
+        if d[m] > tol:
+            keep[i + 1 + m] = True
+            stack.append((i, i + 1 + m))
+            stack.append((i + 1 + m, j))
+    if np.array_equal(p[0], p[-1]) and keep.sum() < 4:
+        # arc tertutup (pulau): pertahankan minimal segitiga supaya ring tetap valid
+        jauh = np.argsort(np.hypot(p[:, 0] - p[0, 0], p[:, 1] - p[0, 1]))[::-1]
+        for t in jauh:
+            if keep.sum() >= 4:
+                break
+            keep[t] = True
+    return keep
+
+
+# ---------- build ----------
+
+def build_topology(geojson):
+    """Topologi dasar: (transform, arcs [int (n,2)], geometri [[ [arc idx...] per ring ] per polygon] per feature)."""
+    polys = _rings(geojson)
+    semua = np.vstack([r for f in polys for poly in f for r in poly])
+    x0, y0 = semua.min(axis=0)
+    x1, y1 = semua.max(axis=0)
+    scale = np.array([(x1 - x0) / (Q_DASAR - 1), (y1 - y0) / (Q_DASAR - 1)])
+    translate = np.array([x0, y0])
+
+    quant = [[[_open_ring(np.round((r - translate) / scale).astype(np.int64)) for r in poly] for poly in f] for f in polys]
+    junction = _junctions([q for f in quant for poly in f for q in poly])
+    is_junction = lambda k: np.isin(k, junction)  # noqa: E731
+
+    arcs = _Arcs()
+    geoms = []
+    for f in quant:
+        geoms.append([[_cut(q, is_junction, arcs) for q in poly if len(q) >= 3] for poly in f])
+    return {"scale": scale, "translate": translate}, arcs.arcs, geoms
+
+
+def _level(transform, arcs, geoms, properties, tol):
+    scale, translate = transform["scale"], transform["translate"]
+
+    # sederhanakan tiap arc sekali (dalam satuan derajat)
+    simpl = []
+    for a in arcs:
+        p = a * scale + translate
+        simpl.append(a[_douglas_peucker(p, tol)])
+
+    def bbox_diag(ring):
+        pts = np.vstack([arcs[i if i >= 0 else ~i] for i in ring])
+        span = (pts.max(axis=0) - pts.min(axis=0)) * scale
+        return float(np.hypot(span[0], span[1]))
+
+    # grid level: cukup halus untuk toleransi, minimal grid dasar
+    faktor = max(1, int(tol / 2 / max(scale.min(), 1e-12))) if tol > 0 else 1
+    level_scale = scale * faktor
+
+    dipakai = {}
+    out_arcs = []
+    geometries = []
+    for g, props in zip(geoms, properties):
+        polys = [poly for poly in g if poly and (tol == 0 or bbox_diag(poly[0]) >= tol)]
+        if not polys:
+            # jangan sampai provinsi hilang: pertahankan polygon terbesarnya
+            polys = sorted((p for p in g if p), key=lambda p: bbox_diag(p[0]), reverse=True)[:1]
+        out_polys = []
+        for poly in polys:
+            out_rings = []
+            for ring in poly:
+                out_ring = []
+                for i in ring:
+                    j = i if i >= 0 else ~i
+                    if j not in dipakai:
+                        q = np.round(simpl[j] / faktor).astype(np.int64)
+                        keep = np.ones(len(q), dtype=bool)
+                        keep[1:] = np.any(q[1:] != q[:-1], axis=1)
+                        q = q[keep] if keep.sum() >= 2 else q[[0, -1]]
+                        delta = np.vstack([q[:1], np.diff(q, axis=0)])
+                        dipakai[j] = len(out_arcs)
+                        out_arcs.append(delta.tolist())
+                    k = dipakai[j]
+                    out_ring.append(k if i >= 0 else ~k)
+                out_rings.append(out_ring)
+            out_polys.append(out_rings)
+        geometries.append({"type": "MultiPolygon", "arcs": out_polys, "properties": props})
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": level_scale.tolist(), "translate": translate.tolist()},
+        "objects": {OBJEK: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": out_arcs,
+    }
+
+
+def _write(teks, path):
+    # True kalau tersimpan; gagal tulis (mis. disk read-only) tidak fatal
+    tmp = None
+    try:
+        tmp = artifacts.temp_path(path)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(teks)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+
+def _build(source_path, digest):
+    # dipanggil di bawah _build_lock; kembalikan (laporan, {level: topo})
+    with open(source_path, encoding="utf-8") as fh:
+        geojson = json.load(fh)
+    properties = [f["properties"] for f in geojson["features"]]
+
+    t0 = time.perf_counter()
+    transform, arcs, geoms = build_topology(geojson)
+    t_topo = time.perf_counter() - t0
+
+    laporan = []
+    levels = {}
+    tersimpan = True
+    for nama, tol in LEVELS:
+        t0 = time.perf_counter()
+        topo = _level(transform, arcs, geoms, properties, tol)
+        topo["digest"] = digest
+        teks = json.dumps(topo, separators=(",", ":"))
+        tersimpan = _write(teks, level_path(source_path, nama)) and tersimpan
+        levels[nama] = topo
+        laporan.append({
+            "level": nama,
+            "toleransi (derajat)": tol,
+            "arc": len(topo["arcs"]),
+            "titik": sum(len(a) for a in topo["arcs"]),
+            "bytes": len(teks.encode()),
+            "build (ms)": round((time.perf_counter() - t0 + t_topo) * 1000, 1),
+        })
+    _in_memory.pop(source_path, None)
+    if not tersimpan:
+        _in_memory[source_path] = (digest, levels)
+    return laporan, levels
+
+
+def build(source_path, digest=None):
+    """Bangun semua level dari GeoJSON `source_path`; kembalikan laporan per level."""
+    digest = digest or file_hash(source_path)
+    with _build_lock:
+        return _build(source_path, digest)[0]
+
+
+def features(topo):
+    """Decode TopoJSON: [(properties, [polygon = [ring (n,2) lon/lat]]), ...]."""
+    t = topo["transform"]
+    scale, translate = np.asarray(t["scale"]), np.asarray(t["translate"])
+    arcs = [np.cumsum(np.asarray(a, dtype=np.float64), axis=0) * scale + translate for a in topo["arcs"]]
+
+    def ring(idx):
+        bagian = [arcs[i] if i >= 0 else arcs[~i][::-1] for i in idx]
+        return np.vstack([bagian[0]] + [b[1:] for b in bagian[1:]])
+
+    return [
+        (g["properties"], [[ring(r) for r in poly] for poly in g["arcs"]])
+        for g in topo["objects"][OBJEK]["geometries"]
+    ]
+
+
+def _read(source_path, level, digest):
+    disimpan = _in_memory.get(source_path)
+    if disimpan is not None and disimpan[0] == digest:
+        return disimpan[1][level]
+    try:
+        with open(level_path(source_path, level), encoding="utf-8") as fh:
+            topo = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return topo if topo.get("digest") == digest else None
+
+
+def load_level(source_path, level, digest=None):
+    """Topologi satu level (dict); dibangun dulu kalau belum ada / basi."""
+    digest = digest or file_hash(source_path)
+    topo = _read(source_path, level, digest)
+    if topo is not None:
+        return topo
+    with _build_lock:
+        # sesi lain mungkin baru saja selesai membangun
+        topo = _read(source_path, level, digest)
+        if topo is not None:
+            return topo
+        return _build(source_path, digest)[1][level]
+
+
+if __name__ == "__main__":
+    from utils.geo import GEOJSON
+
+    for baris in build(GEOJSON):
+        print(baris)
@@ -0,0 +1,136 @@
+# utils/uploads.py
+# Upload file data oleh pengguna.
+#
+# Isi file di-hash (SHA-256) dan disimpan sekali di UPLOAD_DIR/<hash>.<ext>;
+# parsing (bangun store partisi, lihat utils/partitions.py) berjalan di thread
+# pool milik proses, bukan di thread script Streamlit, jadi sesi tetap
+# responsif. File yang sama yang di-upload banyak orang hanya di-parse sekali:
+# job-nya dipakai bersama berdasarkan hash.
+#
+# Job yang sudah selesai / gagal dan tidak diakses selama JOB_TTL detik, atau
+# yang paling lama tidak diakses kalau jumlah job melebihi MAX_JOBS, dibuang
+# bersama semua filenya (file upload, artefak .arrow, store partisi).
+import hashlib
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from utils import artifacts, partitions
+
+UPLOAD_DIR = ".uploads"
+MAX_UPLOAD_MB = 200  # samakan dengan server.maxUploadSize di .streamlit/config.toml
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+WORKERS = 2
+JOB_TTL = 6 * 3600
+MAX_JOBS = 16
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class Job:
+    def __init__(self, digest, name, path):
+        self.digest = digest
+        self.name = name
+        self.path = path
+        self.status = "antri"  # antri -> proses -> selesai / gagal
+        self.progress = 0.0
+        self.info = ""
+        self.error = None
+        self.last_used = time.monotonic()
+
+    @property
+    def done(self):
+        return self.status in ("selesai", "gagal")
+
+    def _lapor(self, fraksi, agg):
+        self.progress = fraksi
+        if agg is not None:
+            self.info = agg.summary()
+
+    def run(self):
+        self.status = "proses"
+        try:
+            partitions.manifest(self.path, self.digest, progress=self._lapor)
+        except Exception as e:  # ditampilkan ke pengguna, jangan matikan worker
+            self.error = str(e)
+            self.status = "gagal"
+            return
+        self.progress = 1.0
+        self.status = "selesai"
+
+    def remove_files(self):
+        """Hapus file upload beserta artefak & store partisi turunannya."""
+        for f in (self.path, artifacts.artifact_path(self.path)):
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(partitions.store_dir(self.path), ignore_errors=True)
+
+
+@st.cache_resource
+def _pool():
+    return ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="upload")
+
+
+@st.cache_resource
+def _jobs():
+    return {}, threading.Lock()
+
+
+def _evict(jobs, now):
+    # dipanggil di bawah lock; job yang masih antri / diproses tidak pernah dibuang
+    selesai = sorted((j for j in jobs.values() if j.done), key=lambda j: j.last_used)
+    lebih = max(len(jobs) - MAX_JOBS, 0)
+    for i, job in enumerate(selesai):
+        if i < lebih or now - job.last_used > JOB_TTL:
+            del jobs[job.digest]
+            job.remove_files()
+
+
+def submit(name, data):
+    """Simpan + jadwalkan parsing isi file `data` (bytes); kembalikan Job (dipakai bersama per hash)."""
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"Ukuran file {len(data) / 1024 / 1024:.1f} MB melebihi batas {MAX_UPLOAD_MB} MB.")
+
+    digest = hashlib.sha256(data).hexdigest()
+    jobs, lock = _jobs()
+    with lock:
+        now = time.monotonic()
+        job = jobs.get(digest)
+        if job is not None and job.status != "gagal":
+            job.last_used = now
+            return job
+
+        ext = os.path.splitext(name)[1].lower() or ".csv"
+        path = os.path.join(UPLOAD_DIR, digest + ext)
+        if not os.path.exists(path):
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+
+        job = Job(digest, name, path)
+        jobs[digest] = job
+        _evict(jobs, now)
+    _pool().submit(job.run)
+    return job
+
+
+def get(digest):
+    """Job untuk `digest`, atau None (belum pernah di-upload / sudah dibuang)."""
+    jobs, lock = _jobs()
+    with lock:
+        now = time.monotonic()
+        _evict(jobs, now)
+        job = jobs.get(digest)
+        if job is not None:
+            job.last_used = now
+        return job